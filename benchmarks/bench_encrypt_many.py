@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+""" Benchmark of CramerShoup.encrypt_many: ciphering many small records
+    with the same public key, online or with precalculated random values
+"""
+
+import random
+import sys
+from timeit import default_timer
+from src.CramerShoup import CramerShoup
+from src.CramerShoupKeys import CramerShoupPublicKey
+from src.GroupStore import named_group
+
+COUNT = 200
+
+def bench(name, function):
+    start = default_timer()
+    function()
+    print("%-42s %8.2f ms / message" % (name, (default_timer() - start) * 1000 / COUNT))
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    random.seed(0)
+    p, _, g1, g2 = named_group('modp1536')
+    x1, x2, y1, y2, w = [random.randrange(p) for _ in range(5)]
+    public_key = CramerShoupPublicKey(p, g1, g2, pow(g1, x1, p) * pow(g2, x2, p) % p,
+                                      pow(g1, y1, p) * pow(g2, y2, p) % p, pow(g1, w, p))
+    messages = [('record %d' % i).encode() for i in range(COUNT)]
+
+    print("1536 bits group, %d messages" % COUNT)
+    # build the fixed bases before measuring
+    public_key.fixed_bases()
+    bench("encrypt_many", lambda: CramerShoup.encrypt_many(messages, public_key=public_key))
+    bench("encrypt_many (%d workers)" % workers,
+          lambda: CramerShoup.encrypt_many(messages, workers, public_key=public_key))
+    bench("precompute (%d workers)" % workers, lambda: public_key.precompute(COUNT, workers))
+    bench("encrypt_many (precomputed)",
+          lambda: CramerShoup.encrypt_many(messages, public_key=public_key))
+
+if __name__ == '__main__':
+    main()
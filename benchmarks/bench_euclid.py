@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+""" Benchmark of the extended euclidean algorithm (gcd, inverse) against
+    the builtins math.gcd and pow(n, -1, mod), on 4096 bits operands
+"""
+
+import math
+import random
+from timeit import timeit
+from src._functions import gcd, inverse
+
+BITS = 4096
+NUMBER = 200
+
+def main():
+    random.seed(0)
+    mod = random.getrandbits(BITS) | (1 << (BITS-1)) | 1
+    values = []
+    while len(values) < NUMBER:
+        n = random.getrandbits(BITS)
+        if math.gcd(n, mod) == 1:
+            values.append(n)
+
+    timings = [
+        ("gcd", timeit(lambda: [gcd(n, mod) for n in values], number=1)),
+        ("math.gcd", timeit(lambda: [math.gcd(n, mod) for n in values], number=1)),
+        ("inverse", timeit(lambda: [inverse(n, mod) for n in values], number=1)),
+        ("pow(n, -1, mod)", timeit(lambda: [pow(n, -1, mod) for n in values], number=1)),
+    ]
+    print("%d operations on %d bits operands" % (NUMBER, BITS))
+    for name, timing in timings:
+        print("%-16s %10.3f ms/op" % (name, timing * 1000 / NUMBER))
+
+if __name__ == '__main__':
+    main()
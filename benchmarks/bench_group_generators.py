@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+
+""" Benchmark of find_group_generators, against the previous algorithm
+    (all the i^j mod n, for i, j < n), from n ~ 10^3 to n ~ 10^7
+"""
+
+from timeit import timeit
+from src._functions import find_group_generators, first_generator, are_coprime
+
+def previous_find_group_generators(n):
+    """ The previous algorithm: O(n^2) full-size exponentiations
+    """
+    coprimes = [k for k in range(1, n) if are_coprime(k, n)]
+    return [i for i in range(1, n) if len(set(i**j % n for j in range(1, n))) == len(coprimes)]
+
+def main():
+    print("%-10s %-10s %16s %16s %16s" % ("n", "generators", "previous (s)",
+                                          "all (s)", "first (s)"))
+    for n in (1009, 10007, 100003, 1000003, 10000019):
+        previous = "-"
+        if n < 2000:
+            previous = "%.3f" % timeit(lambda: previous_find_group_generators(n), number=1)
+        generators = find_group_generators(n)
+        timing = timeit(lambda: find_group_generators(n), number=1)
+        first = timeit(lambda: first_generator(n), number=1)
+        print("%-10d %-10d %16s %16.3f %16.6f" % (n, len(generators), previous, timing, first))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+""" Benchmark of CramerShoup.cipher_hybrid: ciphering a large message with
+    a Threefish key encapsulated in one block, against the block mode
+"""
+
+import random
+import sys
+from timeit import default_timer
+from src.CramerShoup import CramerShoup
+from src.CramerShoupKeys import CramerShoupPublicKey, CramerShoupPrivateKey
+from src.GroupStore import named_group
+
+def bench(name, function, size):
+    start = default_timer()
+    result = function()
+    elapsed = default_timer() - start
+    print("%-42s %8.2f ms %8.2f MB/s" % (name, elapsed * 1000, size / elapsed / 1e6))
+    return result
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 20
+    random.seed(0)
+    p, _, g1, g2 = named_group('modp1536')
+    x1, x2, y1, y2, w = [random.randrange(p) for _ in range(5)]
+    public_key = CramerShoupPublicKey(p, g1, g2, pow(g1, x1, p) * pow(g2, x2, p) % p,
+                                      pow(g1, y1, p) * pow(g2, y2, p) % p, pow(g1, w, p))
+    private_key = CramerShoupPrivateKey(p, x1, x2, y1, y2, w)
+    # a text: the block mode deciphers to a string
+    message = bytes(random.choice(b"abcdefghijklmnopqrstuvwxyz ") for _ in range(size))
+
+    print("1536 bits group, %d bytes" % size)
+    # build the fixed bases before measuring
+    public_key.fixed_bases()
+    ciphertext = bench("cipher (blocks)", lambda: CramerShoup.cipher(message, True, public_key),
+                       size)
+    bench("decipher (blocks)", lambda: CramerShoup.decipher(ciphertext, private_key=private_key),
+          size)
+    ciphertext = bench("cipher_hybrid", lambda: CramerShoup.cipher_hybrid(message, public_key),
+                       size)
+    bench("decipher (hybrid)", lambda: CramerShoup.decipher(ciphertext, private_key=private_key),
+          size)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+""" Benchmark of is_prime (small primes + deterministic Miller-Rabin)
+    on ranges of 64 bits and 1024 bits integers
+"""
+
+import random
+from timeit import timeit
+from src._functions import is_prime, miller_rabin_primality_test
+
+def bench(name, function, numbers):
+    """ Print the time per number of function on the numbers
+    """
+    timing = timeit(lambda: [function(n) for n in numbers], number=1)
+    print("%-36s %10.1f us/number" % (name, timing * 10**6 / len(numbers)))
+
+def main():
+    random.seed(0)
+    for bits, count in ((64, 100000), (1024, 2000)):
+        start = random.getrandbits(bits) | (1 << (bits-1))
+        numbers = range(start, start + count)
+        primes = [n for n in numbers if is_prime(n)]
+        print("%d bits: %d consecutive integers, %d primes" % (bits, count, len(primes)))
+        bench("is_prime (range)", is_prime, numbers)
+        bench("miller_rabin_primality_test k=128", lambda n: miller_rabin_primality_test(n, 128),
+              numbers)
+        bench("is_prime (primes only)", is_prime, primes)
+        print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+""" Benchmark of modexp (sliding window) and FixedBaseExp (precalculated
+    table) against the builtin pow, on 1025 bits operands
+"""
+
+import random
+from timeit import timeit
+from src._functions import modexp, fermat_primality_test
+from src.FixedBaseExp import FixedBaseExp
+
+BITS = 1025
+NUMBER = 200
+
+def main():
+    random.seed(0)
+    p = random.getrandbits(BITS) | (1 << (BITS-1)) | 1
+    g = random.getrandbits(BITS) % p
+    exponents = [random.getrandbits(BITS) % p for _ in range(NUMBER)]
+
+    setup = timeit(lambda: FixedBaseExp(g, p), number=1)
+    fixed_base = FixedBaseExp(g, p)
+    timings = [
+        ("pow", timeit(lambda: [pow(g, e, p) for e in exponents], number=1)),
+        ("modexp", timeit(lambda: [modexp(g, e, p) for e in exponents], number=1)),
+        ("FixedBaseExp.pow", timeit(lambda: [fixed_base.pow(e) for e in exponents], number=1)),
+    ]
+    print("%d exponentiations, %d bits operands" % (NUMBER, BITS))
+    for name, timing in timings:
+        print("%-20s %8.3f ms/op" % (name, timing * 1000 / NUMBER))
+    print("%-20s %8.3f ms (once per base)" % ("FixedBaseExp table", setup * 1000))
+    print("%-20s %8.3f ms (k=8, 2**1279-1)" % ("fermat_primality_test",
+                                               timeit(lambda: fermat_primality_test(2**1279 - 1, 8),
+                                                      number=1) * 1000))
+
+if __name__ == '__main__':
+    main()
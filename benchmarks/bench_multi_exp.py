@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+""" Benchmark of multi_exp (simultaneous exponentiation) on the
+    exponentiations of CramerShoup, against separate pow calls
+"""
+
+import random
+from timeit import timeit
+from src._functions import multi_exp
+from src.GroupStore import named_group
+
+NUMBER = 50
+
+def bench(name, previous, new):
+    previous = timeit(previous, number=NUMBER) * 1000 / NUMBER
+    new = timeit(new, number=NUMBER) * 1000 / NUMBER
+    print("%-42s %8.2f ms %8.2f ms %6.2fx" % (name, previous, new, previous / new))
+
+def main():
+    random.seed(0)
+    p, _, g1, g2 = named_group('modp1536')
+    x1, x2, y1, y2, b = [random.randrange(p) for _ in range(5)]
+    X = pow(g1, x1, p) * pow(g2, x2, p) % p
+    Y = pow(g1, y1, p) * pow(g2, y2, p) % p
+    b1, b2 = pow(g1, b, p), pow(g2, b, p)
+    beta = random.getrandbits(160)
+
+    print("%-42s %11s %11s %7s" % ("1536 bits group", "pow", "multi_exp", "speedup"))
+    bench("key: g1^x1 * g2^x2",
+          lambda: pow(g1, x1, p) * pow(g2, x2, p) % p,
+          lambda: multi_exp([g1, g2], [x1, x2], p))
+    bench("cipher: X^b * Y^(b*beta)",
+          lambda: pow(X, b, p) * pow(Y, b*beta, p) % p,
+          lambda: multi_exp([X, Y], [b, b*beta % (p-1)], p))
+    bench("decipher: b1^x1 b2^x2 (b1^y1 b2^y2)^beta",
+          lambda: pow(b1, x1, p) * pow(b2, x2, p) * pow(pow(b1, y1, p) * pow(b2, y2, p), beta, p) % p,
+          lambda: multi_exp([b1, b2], [(x1 + y1*beta) % (p-1), (x2 + y2*beta) % (p-1)], p))
+
+if __name__ == '__main__':
+    main()
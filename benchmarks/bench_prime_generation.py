@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+""" Benchmark of generate_prime_number and generate_safe_prime_number
+    (sieved intervals, base 2 pre-test, process pool) against the
+    previous algorithm (random candidates, 128 Miller-Rabin rounds each)
+"""
+
+import os
+from timeit import timeit
+from src._functions import (generate_prime_candidate, generate_prime_number,
+                            generate_safe_prime_number, miller_rabin_primality_test)
+
+RUNS = 3
+
+def previous_generate_prime_number(length):
+    p = 4
+    while not miller_rabin_primality_test(p, 128):
+        p = generate_prime_candidate(length)
+    return p
+
+def previous_generate_safe_prime_number(length):
+    # the previous algorithm only tested p: q is tested too, to compare
+    # with a real safe prime generation
+    q = p = 4
+    while not (miller_rabin_primality_test(p, 128) and miller_rabin_primality_test(q, 128)):
+        q = generate_prime_candidate(length - 1)
+        p = (q << 1) | 1
+    return p
+
+def bench(name, function):
+    print("%-40s %8.2f s" % (name, timeit(function, number=RUNS) / RUNS))
+
+def main():
+    workers = os.cpu_count() or 1
+    print("average of %d runs, %d workers" % (RUNS, workers))
+    bench("previous prime (1025 bits)", lambda: previous_generate_prime_number(1025))
+    bench("prime (1025 bits)", lambda: generate_prime_number(1025))
+    bench("previous safe prime (512 bits)", lambda: previous_generate_safe_prime_number(512))
+    bench("safe prime (512 bits)", lambda: generate_safe_prime_number(512))
+    bench("safe prime (1025 bits)", lambda: generate_safe_prime_number(1025))
+    bench("safe prime (1025 bits, workers)",
+          lambda: generate_safe_prime_number(1025, workers=workers))
+
+if __name__ == '__main__':
+    main()
@@ -3,9 +3,13 @@
 """ This module contains the A5/1 class
 """
 
-import src._utils as utils
+from src._bits import BitString
+from src._files import mapped, atomic_write
 from src.LFSR import LFSR
 
+# number of bytes of a .pgm image ciphered at once
+CHUNK_SIZE = 1 << 16
+
 class A51(object):
     """ A5/1 stream cipher implementation
 
@@ -99,10 +103,9 @@ class A51(object):
         self.init_lfsr()
         # use them to encrypt generate a sequence
         # and XOR the generated sequence with the message
-        binary_text = utils.utf8_to_binary(text)
-        binary_result = utils.binary_xor(binary_text,
-                                         self.gen_sequence(len(binary_text)))
-        return utils.binary_to_utf8(binary_result)
+        binary_text = BitString.from_text(text)
+        sequence = BitString.from_string(self.gen_sequence(len(binary_text)))
+        return (binary_text ^ sequence).to_text()
 
     def run_pgm(self, input_file, output_file):
         """ Encrypt/Decrypt a .pgm image
@@ -120,13 +123,14 @@ class A51(object):
         # init the 3 lfsr
         self.init_lfsr()
 
-        f_in = open(input_file, 'rb')
-        lines = f_in.readlines()
-
-        f_out = open(output_file, 'wb')
-        for i, line in enumerate(lines):
-            lines[i] = bytearray(line)
-            # cipher each byte
-            for j in range(len(lines[i])):
-                lines[i][j] ^= int(self.gen_sequence(8), 2)
-            f_out.write(lines[i])
+        def cipher_chunks(data):
+            for i in range(0, len(data), CHUNK_SIZE):
+                chunk = bytearray(data[i:i+CHUNK_SIZE])
+                # cipher each byte
+                for j in range(len(chunk)):
+                    chunk[j] ^= int(self.gen_sequence(8), 2)
+                yield chunk
+
+        # the input is memory-mapped, and the output is written chunk by chunk
+        with mapped(input_file) as data:
+            atomic_write(output_file, cipher_chunks(data))
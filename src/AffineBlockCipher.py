@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+""" This module contains the AffineBlockCipher class
+"""
+
+import string
+from functools import lru_cache
+from operator import add
+from src._functions import are_coprime, inverse
+
+# blocks of 2 letters => 26^2 possible blocks
+ALPHABET = string.ascii_uppercase
+MODULO = len(ALPHABET)**2
+
+@lru_cache(maxsize=128)
+def _digram_tables(a, b, inverse_a):
+    """ Build (once per key) the 676-entry digram tables of the cipher
+
+        Given Mi and M(i+1) = Mj
+        x = i * 26 + j
+        (a * x + b) mod 26^2 = Ci * 26 + Cj
+        and, given y = Ci * 26 + Cj
+        (a^-1 * (y - b)) mod 26^2 = x
+
+        Args:
+            a -- int -- linear coefficient
+            b -- int -- ordinate at origin
+            inverse_a -- int -- inverse of a modulo 26^2
+
+        return a tuple of dict (cipher table, decipher table)
+    """
+    digrams = [i + j for i in ALPHABET for j in ALPHABET]
+    cipher_table = {}
+    decipher_table = {}
+    for x, digram in enumerate(digrams):
+        cipher_table[digram] = digrams[(a * x + b) % MODULO]
+        decipher_table[digram] = digrams[(inverse_a * (x - b)) % MODULO]
+    return cipher_table, decipher_table
+
+class AffineBlockCipher(object):
+    """ Affine block cipher implementation, blocks of 2 uppercase letters
+
+        Each block is ciphered with a lookup in a precomputed digram table,
+        so the text is ciphered in linear time.
+
+        Attributes:
+            a -- int -- 'a' in 'ax+b', must be coprime with 676
+            b -- int -- 'b' in 'ax+b'
+            inverse_a -- int -- inverse of a modulo 676
+    """
+
+    def __init__(self, a, b):
+        if not are_coprime(a % MODULO, MODULO):
+            raise ValueError("'a' must be coprime with %d" % MODULO)
+        self.a = a % MODULO
+        self.b = b % MODULO
+        self.inverse_a = inverse(self.a, MODULO)
+        self._cipher_table, self._decipher_table = _digram_tables(self.a, self.b,
+                                                                     self.inverse_a)
+
+    @staticmethod
+    def _translate(text, table):
+        """ Translate the text, block per block, using the given table
+
+            Args:
+                text -- string -- the text to translate (even length)
+                table -- dict -- the digram table
+
+            return the translated text
+        """
+        # make sure the text has an even length (because blocks of 2)
+        if len(text) % 2 == 1:
+            raise ValueError("It's required that the text has an even length")
+        text = text.upper()
+        try:
+            # pair the letters of even and odd indexes to get the blocks
+            return ''.join(map(table.__getitem__, map(add, text[0::2], text[1::2])))
+        except KeyError as error:
+            raise ValueError("Block not in the alphabet: %s" % error.args[0])
+
+    def cipher(self, plaintext):
+        """ Cipher the plaintext
+
+            Args:
+                plaintext -- string -- the text to cipher
+
+            return the ciphertext
+        """
+        return self._translate(plaintext, self._cipher_table)
+
+    def decipher(self, ciphertext):
+        """ Decipher the ciphertext
+
+            Args:
+                ciphertext -- string -- the text to decipher
+
+            return the plaintext
+        """
+        return self._translate(ciphertext, self._decipher_table)
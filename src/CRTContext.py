@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+""" This module contains the CRTContext class
+"""
+
+from src._functions import gcd, inverse
+
+class CRTContext(object):
+    """ Chinese remainder theorem solver for many systems of congruences
+        sharing the same modulos:
+			x = a1 (mod m1)
+			x = a2 (mod m2)
+			...
+			x = an (mod mn)
+
+        Everything that only depends on the modulos is calculated once,
+        when the context is created.
+
+        Attributes:
+            modulos -- tuple -- m1, m2, ..., mn (pairwise coprimes)
+            M -- int -- the product of the modulos
+            coefficients -- tuple -- Mi * (Mi^-1 mod mi), where Mi = M / mi
+            garner_coefficients -- tuple -- (m1 * ... * m(i-1))^-1 mod mi
+    """
+
+    def __init__(self, modulos):
+        self.modulos = tuple(modulos)
+        if not self.modulos:
+            raise ValueError("At least one modulo is required")
+        for i, m in enumerate(self.modulos):
+            if m < 1:
+                raise ValueError("The modulos must be positive")
+            for other in self.modulos[i+1:]:
+                if gcd(m, other) != 1:
+                    raise ValueError("The modulos %d and %d are not coprime" % (m, other))
+
+        self.M = 1
+        for m in self.modulos:
+            self.M *= m
+        self.coefficients = tuple((self.M // m) * inverse(self.M // m, m) for m in self.modulos)
+
+        garner_coefficients = [None]
+        product = self.modulos[0]
+        for m in self.modulos[1:]:
+            garner_coefficients.append(inverse(product, m))
+            product *= m
+        self.garner_coefficients = tuple(garner_coefficients)
+
+    def solve(self, values):
+        """ Solve the system with the precalculated coefficients
+
+            Args:
+                values -- list -- contains a1, a2, ..., an
+
+            return x, in range [0, M-1]
+        """
+        if len(values) != len(self.modulos):
+            raise ValueError("Expected %d values" % len(self.modulos))
+        return sum(v * c for v, c in zip(values, self.coefficients)) % self.M
+
+    def solve_many(self, rows):
+        """ Solve many systems
+
+            Args:
+                rows -- iterable -- lists of values (a1, a2, ..., an)
+
+            return the list of the solutions
+        """
+        return [self.solve(values) for values in rows]
+
+    def garner(self, values):
+        """ Solve the system with Garner's algorithm: x is built in mixed
+            radix, x = x1 + m1 * (x2 + m2 * (x3 + ...)), so the intermediate
+            results stay lower than M, instead of n times M for solve
+
+            Args:
+                values -- list -- contains a1, a2, ..., an
+
+            return x, in range [0, M-1]
+        """
+        if len(values) != len(self.modulos):
+            raise ValueError("Expected %d values" % len(self.modulos))
+        x = values[0] % self.modulos[0]
+        product = self.modulos[0]
+        for i in range(1, len(self.modulos)):
+            m = self.modulos[i]
+            # next digit of x in mixed radix
+            digit = ((values[i] - x) % m) * self.garner_coefficients[i] % m
+            x += digit * product
+            product *= m
+        return x
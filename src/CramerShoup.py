@@ -3,56 +3,142 @@
 """ This module contains the CramerShoup class
 """
 
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
 from random import randint
 import sys
-from src._functions import (generate_safe_prime_number, find_safe_prime_generator)
-from src._utils import (write_file, list_to_string, read_file, add_padding)
+from src._functions import multi_exp
+from src._utils import (write_file, list_to_string, add_padding)
+from src._padding import strip_padding, ISO_10126, legacy_length_bytes
+from src.CramerShoupCiphertext import CramerShoupCiphertext, HYBRID
+from src.CramerShoupKeys import (CramerShoupPublicKey, CramerShoupPrivateKey,
+                                 shared_public_key)
+from src.GroupStore import GroupStore
 from src.SHA1 import SHA1
+from src.Threefish import Threefish
+from src.ThreefishEngine import ThreefishEngine
 
 FILE_NAME = 'cramer_shoup'
+# size of the plaintext blocks, in bytes
+BLOCK_SIZE = 128
+# hybrid mode: Threefish-512, the key is the key (64 bytes) and the tweaks (16 bytes)
+HYBRID_BLOCK_SIZE = 64
+HYBRID_KEY_SIZE = HYBRID_BLOCK_SIZE + 16
+# hybrid mode: size of the digest of the payload (SHA-256, hashlib)
+HYBRID_DIGEST_SIZE = 32
+
+def _unmask_blocks(arguments):
+    """ Decipher some blocks: multiply them by the inverse of the mask
+
+        Args:
+            arguments -- tuple -- (mask inverse, p, list of int -- the blocks)
+
+        return the deciphered bytes (BLOCK_SIZE bytes per block)
+    """
+    mask_inverse, p, blocks = arguments
+    return b''.join([(mask_inverse * block % p).to_bytes(BLOCK_SIZE, byteorder="big")
+                     for block in blocks])
+
+def _cipher_messages(arguments):
+    """ Cipher some messages (in a worker of CramerShoup.encrypt_many)
+
+        Args:
+            arguments -- tuple -- (the values of the public key, list of bytes, binary,
+                precalculated random values of the key for these messages)
+
+        return the list of the ciphertexts
+    """
+    values, messages, binary, randomness = arguments
+    public_key = shared_public_key(values)
+    public_key.add_precomputed(randomness)
+    return [CramerShoup.cipher(message, binary, public_key) for message in messages]
+
+class DecipherContext(object):
+    """ What is needed to decipher all the blocks of one message
+
+        Each block is c = W^b * m (mod p), with W^b = g1^(w*b) = b1^w, so
+        the inverse of the mask, b1^(p-1-w), is the same for all the blocks
+        of the message and is calculated only once.
+
+        Attributes:
+            p -- int -- the prime of the group
+            mask_inverse -- int -- b1^(p-1-w) mod p
+    """
+
+    def __init__(self, p, b1, w):
+        self.p = p
+        self.mask_inverse = pow(b1, p-1-w, p)
+
+    def decipher_blocks(self, blocks, executor=None, chunk_size=256):
+        """ Decipher the blocks
+
+            Args:
+                blocks -- list of int -- the ciphered blocks
+                executor -- concurrent.futures.Executor -- if not None, the
+                    blocks are deciphered by chunks in this pool (a process
+                    pool for a real speedup, big integers operations hold the GIL)
+                chunk_size -- int -- number of blocks per task of the pool
+
+            return the deciphered bytes
+        """
+        if executor is None:
+            return _unmask_blocks((self.mask_inverse, self.p, blocks))
+        chunks = [(self.mask_inverse, self.p, blocks[i:i+chunk_size])
+                  for i in range(0, len(blocks), chunk_size)]
+        return b''.join(executor.map(_unmask_blocks, chunks))
 
 class CramerShoup(object):
     """ CramerShoup implementation
     """
 
     @staticmethod
-    def key_generation():
+    def key_generation(group_name=None, store=None):
         """ Generate the keys, and save it into files
 
             To calculate:
-                p -- int -- a prime number
+                p -- int -- a safe prime number
                 g1, g2 -- int -- two distinct generators of p
                 x1, x2, y1, y2, w -- int -- randomly picked numbers in range [0:p]
-                X -- int -- result of g1**x1 + g2**x2
-                Y -- int -- result of g1**y1 + g2**y2
+                X -- int -- result of g1**x1 * g2**x2
+                Y -- int -- result of g1**y1 * g2**y2
                 W -- int -- result of g1**w
 
+            The group (p, g1, g2) comes from a GroupStore: a group is only
+            generated if the store is empty, and can be shared by many keys.
+
+            Args:
+                group_name -- string or None -- the name of a RFC 3526 group
+                    (see GroupStore.get), or None to use a group of the store
+                store -- GroupStore -- the store of the groups (default: 'outputs')
+
             To save in files:
                 public key: (p, g1, g2, X, Y, W)
                 private key: (x1, x2, y1, y2, w)
+
+            return the keys (CramerShoupPublicKey, CramerShoupPrivateKey)
         """
-        # start by generate randomly a prime number p
-        p = generate_safe_prime_number()
-        # pick 2 distinct generators randomly
-        g1 = find_safe_prime_generator(p, (p-1)//2)
-        g2 = g1
-        while g2 == g1:
-            g2 = find_safe_prime_generator(p, (p-1)//2)
+        if store is None:
+            store = GroupStore()
+        group = store.get(group_name)
+        p, _, g1, g2 = group
+        g1_exp, g2_exp = store.fixed_bases(group)
         # pick randomly 5 integers in range [0:P]
         x1 = randint(0, p-1)
         x2 = randint(0, p-1)
         y1 = randint(0, p-1)
         y2 = randint(0, p-1)
         w = randint(0, p-1)
-        # calculate X, Y and
-        X = (pow(g1, x1, p) * pow(g2, x2, p))
-        Y = (pow(g1, y1, p) * pow(g2, y2, p))
-        W = pow(g1, w, p)
+        # calculate X, Y and W
+        X = (g1_exp.pow(x1) * g2_exp.pow(x2)) % p
+        Y = (g1_exp.pow(y1) * g2_exp.pow(y2)) % p
+        W = g1_exp.pow(w)
 
         # save the public key
         write_file(FILE_NAME + '.pub', list_to_string([p, g1, g2, X, Y, W]))
         # save the private key
         write_file(FILE_NAME, list_to_string([x1, x2, y1, y2, w]))
+        return CramerShoupPublicKey(p, g1, g2, X, Y, W), CramerShoupPrivateKey(p, x1, x2, y1, y2, w)
 
     @staticmethod
     def _hash(b1, b2, c):
@@ -69,88 +155,229 @@ class CramerShoup(object):
         return SHA1().hash(str(b1) + str(b2) + str(c))
 
     @staticmethod
-    def cipher(steam):
+    def _encapsulate(public_key, blocks):
         """
-            Cipher the text with the public key
+            Cipher the blocks with the public key
 
             Args:
-                steam -- bytes -- the text to cipher
+                public_key -- CramerShoupPublicKey
+                blocks -- list of int -- the blocks, lower than p
 
-            write the cipher text in a file
-        """
-        # read the public key
-        p, g1, g2, X, Y, W = [int(v) for v in read_file(FILE_NAME + '.pub', 'outputs').split(',')]
-        # pad the input stream
-        m = add_padding(steam)
-        # Pick a random int, b, of Zp
-        b = randint(0, p-1)
-        # calculate b1 and b2
-        b1 = pow(g1, b, p)
-        b2 = pow(g2, b, p)
-        # cipher the text, block per block
-        c = []
-        for i in range(0, len(m), 128):
-            block_value = int.from_bytes(m[i:i+128], byteorder="big")
-            c.append((pow(W, b, p) * block_value) % p)
+            return a CramerShoupCiphertext
+        """
+        p = public_key.p
+        # a random int b of Zp, and b1 = g1^b, b2 = g2^b, W^b, X^b, Y^b
+        # (precalculated if possible, see CramerShoupPublicKey.precompute)
+        _, b1, b2, mask, X_b, Y_b = public_key.randomness()
+        # cipher the text, block per block (W^b is the same for all the blocks)
+        c = [(mask * block) % p for block in blocks]
         # calculate the verification
         x = c[0]
         for i in range(1, len(c)):
             x ^= c[i]
         beta = int(CramerShoup._hash(b1, b2, x), 16) % p
-        v = (pow(X, b, p) * pow(Y, b*beta, p)) % p
-
-        # from 128 to 129 bytes
-        for i, block in enumerate(c):
-            c[i] = hex(block)[2:]
-            # add leading 0 if needed, to create a block of 129 bytes (258 hex digits)
-            c[i] = '0'*(258 - len(c[i])) + c[i]
-
-        hex_c = ''.join(c)
-
-        # write the ciphertext
-        return hex(b1), hex(b2), hex_c, hex(v)
+        # v = X^b * Y^(b*beta) = X^b * (Y^b)^beta: beta has only 160 bits
+        v = X_b * pow(Y_b, beta, p) % p
+        return CramerShoupCiphertext.for_group(p, b1, b2, c, v)
 
     @staticmethod
-    def decipher(stream):
+    def _decapsulate(ciphertext, private_key, executor=None):
         """
-            Decipher the message with the private key
+            Check the ciphertext and decipher its blocks with the private key
 
             Args:
-                stream -- bytes -- the text to decipher
+                ciphertext -- CramerShoupCiphertext
+                private_key -- CramerShoupPrivateKey
+                executor -- concurrent.futures.Executor -- see DecipherContext.decipher_blocks
 
-            return the decipher message
+            return the deciphered blocks, as bytes (BLOCK_SIZE bytes per block)
         """
-        # read the private and public keys
-        p, _, _, _, _, _ = [int(v) for v in read_file(FILE_NAME + '.pub', 'outputs').split(',')]
-        x1, x2, y1, y2, w = [int(v) for v in read_file(FILE_NAME, 'outputs').split(',')]
-        # read the cipher stream
-        b1, b2, c, v = stream.split(',')
-        b1, b2, v = int(b1, 16), int(b2, 16), int(v, 16)
-        m = [int(c[i:i+258], 16) for i in range(0, len(c), 258)]
+        p = private_key.p
+        x1, x2, y1, y2, w = private_key.values()
+        b1, b2, m, v = ciphertext.b1, ciphertext.b2, list(ciphertext.blocks), ciphertext.v
         # verification step
         x = m[0]
         for i in range(1, len(m)):
             x ^= m[i]
         beta = int(CramerShoup._hash(b1, b2, x), 16) % p
-        v2 = (pow(b1, x1, p) * pow(b2, x2, p) * (pow(pow(b1, y1, p) * pow(b2, y2, p), beta, p))) % p
+        # v2 = b1^x1 * b2^x2 * (b1^y1 * b2^y2)^beta = b1^(x1 + y1*beta) * b2^(x2 + y2*beta)
+        v2 = multi_exp([b1, b2], [(x1 + y1*beta) % (p-1), (x2 + y2*beta) % (p-1)], p)
         if v != v2:
             # if the verification is false, throw error
             sys.exit("err: verification failed")
 
-        text = bytearray()
-        # decipher block per block
-        for block in m:
-            block = (pow(b1, (p-1-w), p) * int(block)) % p
-            # calculate the bytes of the original block
-            b = bytearray()
-            while block:
-                b.append(block & 0xff)
-                block >>= 8
-            text += b[::-1]
-
-        # remove padding
-        padding_size = int.from_bytes(text[-2:], byteorder="big")
-        text = text[:len(text) - padding_size]
+        # decipher all the blocks
+        return DecipherContext(p, b1, w).decipher_blocks(m, executor)
+
+    @staticmethod
+    def load_public_key():
+        """ Load the public key of the 'outputs' directory (cached until the file changes)
+
+            return a CramerShoupPublicKey
+        """
+        return CramerShoupPublicKey.load(os.path.join('outputs', FILE_NAME + '.pub'))
+
+    @staticmethod
+    def load_private_key():
+        """ Load the private key of the 'outputs' directory (cached until the file changes)
+
+            return a CramerShoupPrivateKey
+        """
+        return CramerShoupPrivateKey.load(os.path.join('outputs', FILE_NAME))
+
+    @staticmethod
+    def cipher(steam, binary=False, public_key=None):
+        """
+            Cipher the text with the public key
+
+            Args:
+                steam -- bytes -- the text to cipher
+                binary -- boolean -- if True, return the binary ciphertext
+                    (see CramerShoupCiphertext), else the legacy text format
+                public_key -- CramerShoupPublicKey -- default: the key of 'outputs'
+
+            return the tuple (b1, b2, c, v) of hexadecimal strings,
+                or bytes if binary is True
+        """
+        public_key = public_key or CramerShoup.load_public_key()
+        # pad the input stream (the blocks are read without copy)
+        m = memoryview(add_padding(steam))
+        blocks = [int.from_bytes(m[i:i+BLOCK_SIZE], byteorder="big")
+                  for i in range(0, len(m), BLOCK_SIZE)]
+        ciphertext = CramerShoup._encapsulate(public_key, blocks)
+        if binary:
+            return ciphertext.to_bytes()
+        return ciphertext.to_legacy()
+
+    @staticmethod
+    def encrypt_many(messages, workers=1, binary=False, public_key=None):
+        """
+            Cipher many messages with the same public key
+
+            The fixed bases of the key are calculated once (once per process
+            with workers), and the precalculated random values of the key
+            are used (see CramerShoupPublicKey.precompute): with workers,
+            they are sent with the messages.
+
+            Args:
+                messages -- list of bytes -- the messages to cipher
+                workers -- int -- the number of processes
+                binary -- boolean -- see cipher
+                public_key -- CramerShoupPublicKey -- default: the key of 'outputs'
+
+            return the list of the ciphertexts, in the order of the messages
+        """
+        public_key = public_key or CramerShoup.load_public_key()
+        if workers > 1:
+            values = tuple(public_key.values())
+            # a few chunks per worker, to balance the load
+            chunk_size = len(messages) // (4 * workers) + 1
+            chunks = [(values, messages[i:i+chunk_size], binary,
+                       public_key.take_precomputed(len(messages[i:i+chunk_size])))
+                      for i in range(0, len(messages), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return [ciphertext for ciphertexts in executor.map(_cipher_messages, chunks)
+                        for ciphertext in ciphertexts]
+        return [CramerShoup.cipher(message, binary, public_key) for message in messages]
+
+    @staticmethod
+    def cipher_hybrid(stream, public_key=None):
+        """
+            Cipher a large stream: a random Threefish key is ciphered with
+            the public key (one block), and the stream is ciphered with
+            Threefish in CTR mode. The cost of the public key operations
+            doesn't depend on the size of the stream.
+
+            The encapsulated block also contains the SHA-256 (hashlib) of
+            the ciphered payload, so the payload is verified with the block.
+
+            Args:
+                stream -- bytes -- the data to cipher
+                public_key -- CramerShoupPublicKey -- default: the key of 'outputs'
+
+            return the binary ciphertext (see CramerShoupCiphertext), as bytes
+        """
+        public_key = public_key or CramerShoup.load_public_key()
+        # a new key (and tweaks) for each message: the nonce can be null
+        key = os.urandom(HYBRID_KEY_SIZE)
+        payload = ThreefishEngine(Threefish(HYBRID_BLOCK_SIZE, key)).ctr(stream)
+        digest = hashlib.sha256(payload).digest()
+        ciphertext = CramerShoup._encapsulate(public_key, [int.from_bytes(key + digest, "big")])
+        ciphertext.payload = payload
+        return ciphertext.to_bytes()
+
+    @staticmethod
+    def _decipher_hybrid(ciphertext, private_key):
+        """
+            Decipher a ciphertext of cipher_hybrid
+
+            Args:
+                ciphertext -- CramerShoupCiphertext -- in HYBRID mode
+                private_key -- CramerShoupPrivateKey
+
+            return the deciphered data, as bytes
+        """
+        if len(ciphertext.blocks) != 1:
+            sys.exit("err: invalid hybrid ciphertext")
+        block = CramerShoup._decapsulate(ciphertext, private_key)
+        key = block[-HYBRID_KEY_SIZE-HYBRID_DIGEST_SIZE:-HYBRID_DIGEST_SIZE]
+        if hashlib.sha256(ciphertext.payload).digest() != block[-HYBRID_DIGEST_SIZE:]:
+            sys.exit("err: verification failed")
+        return ThreefishEngine(Threefish(HYBRID_BLOCK_SIZE, key)).ctr(ciphertext.payload)
+
+    @staticmethod
+    def decipher_hybrid(stream, private_key=None):
+        """
+            Decipher a ciphertext of cipher_hybrid, without decoding it
+
+            Args:
+                stream -- bytes -- the binary ciphertext, in hybrid mode
+                private_key -- CramerShoupPrivateKey -- default: the key of 'outputs'
+
+            return the deciphered data, as bytes (see decipher for a text)
+        """
+        private_key = private_key or CramerShoup.load_private_key()
+        if not CramerShoupCiphertext.is_hybrid(stream):
+            sys.exit("err: not a hybrid ciphertext")
+        ciphertext = CramerShoupCiphertext.from_bytes(stream)
+        if ciphertext.group_id != private_key.group_id:
+            sys.exit("err: the message was not ciphered with this key")
+        return CramerShoup._decipher_hybrid(ciphertext, private_key)
+
+    @staticmethod
+    def decipher(stream, executor=None, private_key=None):
+        """
+            Decipher the message with the private key
+
+            Args:
+                stream -- string or bytes -- the ciphertext, in the legacy text
+                    format ('b1,b2,c,v') or in the binary format (including
+                    the hybrid mode, see cipher_hybrid)
+                executor -- concurrent.futures.Executor -- pool used to decipher
+                    the blocks (see DecipherContext.decipher_blocks)
+                private_key -- CramerShoupPrivateKey -- default: the key of 'outputs'
+
+            return the decipher message, as a string (a hybrid ciphertext is
+            decoded as UTF-8: use decipher_hybrid for binary data)
+        """
+        private_key = private_key or CramerShoup.load_private_key()
+        p = private_key.p
+        # read the cipher stream
+        if CramerShoupCiphertext.is_binary(stream):
+            ciphertext = CramerShoupCiphertext.from_bytes(stream)
+            if ciphertext.group_id != private_key.group_id:
+                sys.exit("err: the message was not ciphered with this key")
+            if ciphertext.mode == HYBRID:
+                return str(CramerShoup._decipher_hybrid(ciphertext, private_key), 'utf-8')
+        else:
+            if not isinstance(stream, str):
+                stream = bytes(stream).decode('ascii')
+            ciphertext = CramerShoupCiphertext.from_legacy(stream, p)
+
+        text = CramerShoup._decapsulate(ciphertext, private_key, executor)
+
+        # check and remove padding (add_padding: ISO 10126, blocks of 1024 bits)
+        text = strip_padding(text, BLOCK_SIZE, ISO_10126, legacy_length_bytes(BLOCK_SIZE*8))
 
         # return the decipher text
-        return text.decode('utf-8')
+        return str(text, 'utf-8')
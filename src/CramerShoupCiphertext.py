@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+""" This module contains the CramerShoupCiphertext class
+"""
+
+import struct
+from functools import lru_cache
+from src.SHA1 import SHA1
+
+# binary format (big-endian):
+#   header: magic, version, mode, size of the group elements (bytes), group id
+#   b1, b2, v: one group element each
+#   the number of blocks, then the blocks (one group element each)
+#   in HYBRID mode, the payload (ciphered with Threefish) until the end
+MAGIC = b'CSCT'
+VERSION = 1
+HEADER = struct.Struct('>4sBBH8s')
+# the blocks are the message
+BLOCKS = 0
+# the block is a Threefish key, which ciphers the payload
+HYBRID = 1
+BLOCK_COUNT = struct.Struct('>Q')
+# number of blocks read at once when streaming a file
+CHUNK_BLOCKS = 256
+
+@lru_cache(maxsize=64)
+def group_id(p):
+    """ Identifier of the group of p: the first 8 bytes of SHA1(p)
+
+        Args:
+            p -- int -- the prime of the group
+
+        return 8 bytes
+    """
+    digest = SHA1().hash(p.to_bytes((p.bit_length() + 7) // 8, byteorder="big"))
+    return bytes.fromhex(digest)[:8]
+
+class CramerShoupCiphertext(object):
+    """ Ciphertext of CramerShoup, and its binary serialisation
+
+        Every number is written in big-endian with the size of p, so the
+        binary form is half the size of the legacy hexadecimal text
+        ('b1,b2,c,v') and can be parsed with slices, without conversion.
+
+        Attributes:
+            group_id -- bytes -- the identifier of the group (see group_id)
+            size -- int -- the size of the group elements, in bytes
+            b1, b2, v -- int -- the elements of the ciphertext
+            blocks -- list of int (or iterator, if streamed) -- the ciphered blocks
+            payload -- bytes-like or None -- the payload of the HYBRID mode
+    """
+
+    def __init__(self, group_id, size, b1, b2, blocks, v, payload=None):
+        self.group_id = group_id
+        self.size = size
+        self.b1 = b1
+        self.b2 = b2
+        self.blocks = blocks
+        self.v = v
+        self.payload = payload
+
+    @staticmethod
+    def for_group(p, b1, b2, blocks, v, payload=None):
+        """ Build the ciphertext of a message ciphered in the group of p
+
+            return a CramerShoupCiphertext
+        """
+        return CramerShoupCiphertext(group_id(p), (p.bit_length() + 7) // 8,
+                                     b1, b2, blocks, v, payload)
+
+    @property
+    def mode(self):
+        """ BLOCKS or HYBRID (if there is a payload)
+        """
+        return BLOCKS if self.payload is None else HYBRID
+
+    def _header(self):
+        """ The bytes before the blocks: header, b1, b2, v and the number of blocks
+        """
+        return b''.join([HEADER.pack(MAGIC, VERSION, self.mode, self.size, self.group_id),
+                         self.b1.to_bytes(self.size, byteorder="big"),
+                         self.b2.to_bytes(self.size, byteorder="big"),
+                         self.v.to_bytes(self.size, byteorder="big"),
+                         BLOCK_COUNT.pack(len(self.blocks))])
+
+    def to_bytes(self):
+        """ Serialise the ciphertext
+
+            return bytes
+        """
+        return self._header() + b''.join([block.to_bytes(self.size, byteorder="big")
+                                          for block in self.blocks] + [self.payload or b''])
+
+    def write(self, f):
+        """ Write the ciphertext in a binary file
+
+            Args:
+                f -- file -- opened in binary mode
+        """
+        f.write(self._header())
+        for i in range(0, len(self.blocks), CHUNK_BLOCKS):
+            f.write(b''.join([block.to_bytes(self.size, byteorder="big")
+                              for block in self.blocks[i:i+CHUNK_BLOCKS]]))
+        if self.payload is not None:
+            f.write(self.payload)
+
+    @staticmethod
+    def _parse_header(data):
+        """ Parse the bytes before the blocks
+
+            Args:
+                data -- bytes-like -- starting with a serialised ciphertext
+
+            return (CramerShoupCiphertext without blocks, number of blocks, offset of the blocks)
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("Truncated ciphertext")
+        magic, version, mode, size, gid = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a CramerShoup ciphertext")
+        if version != VERSION:
+            raise ValueError("Unsupported ciphertext version: %d" % version)
+        if mode not in (BLOCKS, HYBRID):
+            raise ValueError("Unknown ciphertext mode: %d" % mode)
+        offset = HEADER.size
+        if len(data) < offset + 3*size + BLOCK_COUNT.size:
+            raise ValueError("Truncated ciphertext")
+        b1, b2, v = [int.from_bytes(data[offset + i*size:offset + (i+1)*size], byteorder="big")
+                     for i in range(3)]
+        offset += 3*size
+        count, = BLOCK_COUNT.unpack_from(data, offset)
+        # the payload is set by the caller, an empty one marks the mode
+        ciphertext = CramerShoupCiphertext(gid, size, b1, b2, None, v,
+                                           b'' if mode == HYBRID else None)
+        return ciphertext, count, offset + BLOCK_COUNT.size
+
+    @staticmethod
+    def from_bytes(data):
+        """ Parse a serialised ciphertext
+
+            Args:
+                data -- bytes-like -- the ciphertext (see to_bytes)
+
+            return a CramerShoupCiphertext, its payload is a memoryview of data
+        """
+        data = memoryview(data)
+        ciphertext, count, offset = CramerShoupCiphertext._parse_header(data)
+        size = ciphertext.size
+        end = offset + count*size
+        if len(data) < end or (ciphertext.mode == BLOCKS and len(data) != end):
+            raise ValueError("Invalid ciphertext length")
+        ciphertext.blocks = [int.from_bytes(data[i:i+size], byteorder="big")
+                             for i in range(offset, end, size)]
+        if ciphertext.mode == HYBRID:
+            ciphertext.payload = data[end:]
+        return ciphertext
+
+    @staticmethod
+    def read(f):
+        """ Read a ciphertext from a binary file, the blocks are read lazily
+
+            Args:
+                f -- file -- opened in binary mode
+
+            return a CramerShoupCiphertext whose blocks are an iterator
+                (in HYBRID mode, the payload is left in the file, after the blocks)
+        """
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError("Truncated ciphertext")
+        size = HEADER.unpack(header)[3]
+        header += f.read(3*size + BLOCK_COUNT.size)
+        ciphertext, count, _ = CramerShoupCiphertext._parse_header(header)
+        ciphertext.blocks = CramerShoupCiphertext._iter_blocks(f, size, count)
+        return ciphertext
+
+    @staticmethod
+    def _iter_blocks(f, size, count):
+        """ Read the blocks from the file, CHUNK_BLOCKS at once
+
+            return a generator of int
+        """
+        while count:
+            n = min(count, CHUNK_BLOCKS)
+            chunk = memoryview(f.read(n * size))
+            if len(chunk) != n * size:
+                raise ValueError("Truncated ciphertext")
+            for i in range(0, len(chunk), size):
+                yield int.from_bytes(chunk[i:i+size], byteorder="big")
+            count -= n
+
+    @staticmethod
+    def is_binary(data):
+        """ Check if the data is a binary ciphertext (or the legacy text format)
+
+            return True if it starts with the magic bytes
+        """
+        return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:4]) == MAGIC
+
+    @staticmethod
+    def is_hybrid(data):
+        """ Check if the data is a binary ciphertext in HYBRID mode
+
+            return True if it starts with the magic bytes and the HYBRID mode
+        """
+        return CramerShoupCiphertext.is_binary(data) and len(data) >= HEADER.size \
+            and HEADER.unpack_from(data)[2] == HYBRID
+
+    @staticmethod
+    def from_legacy(text, p):
+        """ Convert the legacy text format: 'b1,b2,c,v' in hexadecimal,
+            c being the blocks, each one written with 2 digits per byte of p
+
+            Args:
+                text -- string -- the legacy ciphertext
+                p -- int -- the prime of the group
+
+            return a CramerShoupCiphertext
+        """
+        b1, b2, c, v = text.strip().split(',')
+        size = (p.bit_length() + 7) // 8
+        blocks = [int(c[i:i+2*size], 16) for i in range(0, len(c), 2*size)]
+        return CramerShoupCiphertext.for_group(p, int(b1, 16), int(b2, 16), blocks, int(v, 16))
+
+    def to_legacy(self):
+        """ Convert the ciphertext to the legacy text format
+
+            return the tuple (b1, b2, c, v) of hexadecimal strings
+        """
+        c = ''.join([block.to_bytes(self.size, byteorder="big").hex() for block in self.blocks])
+        return hex(self.b1), hex(self.b2), c, hex(self.v)
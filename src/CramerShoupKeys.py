@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+
+""" This module contains the CramerShoupPublicKey and CramerShoupPrivateKey
+    classes
+"""
+
+import os
+import struct
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from random import randint
+from src._files import atomic_write
+from src.CramerShoupCiphertext import group_id
+from src.FixedBaseExp import FixedBaseExp
+
+# binary format (big-endian): magic, version, size of the numbers (bytes),
+# then the numbers of the key, with this size
+PUBLIC_MAGIC = b'CSPK'
+PRIVATE_MAGIC = b'CSSK'
+VERSION = 1
+HEADER = struct.Struct('>4sBxH')
+
+# keys loaded from files: {(class, path): ((inode, size, mtime), key)}
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+def _pack(magic, size, values):
+    """ Serialise the numbers of a key
+
+        Args:
+            magic -- bytes -- the magic of the key type
+            size -- int -- the size of each number, in bytes
+            values -- list of int -- the numbers
+
+        return bytes
+    """
+    return HEADER.pack(magic, VERSION, size) \
+        + b''.join([value.to_bytes(size, byteorder="big") for value in values])
+
+def _unpack(data, magic, count):
+    """ Parse the numbers of a serialised key
+
+        Args:
+            data -- bytes-like -- the serialised key
+            magic -- bytes -- the expected magic
+            count -- int -- the number of numbers in the key
+
+        return the list of the numbers
+    """
+    data = memoryview(data)
+    if len(data) < HEADER.size:
+        raise ValueError("Truncated key")
+    key_magic, version, size = HEADER.unpack_from(data)
+    if key_magic != magic:
+        raise ValueError("Not a CramerShoup key of this type")
+    if version != VERSION:
+        raise ValueError("Unsupported key version: %d" % version)
+    if len(data) != HEADER.size + count*size:
+        raise ValueError("Invalid key length")
+    return [int.from_bytes(data[i:i+size], byteorder="big")
+            for i in range(HEADER.size, len(data), size)]
+
+def _load(cls, path, parse):
+    """ Load a key from a file, or get it from the cache if the file
+        didn't change: same inode (the keys are saved atomically, in a new
+        file), size and modification time (which can be coarse)
+
+        Args:
+            cls -- class -- the class of the key
+            path -- string -- the file of the key
+            parse -- function -- build the key from the content of the file (bytes)
+
+        return the key
+    """
+    path = os.path.abspath(path)
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with _CACHE_LOCK:
+            cached = _CACHE.get((cls, path))
+        if cached and cached[0] == stamp:
+            return cached[1]
+        key = parse(f.read())
+    with _CACHE_LOCK:
+        _CACHE[(cls, path)] = (stamp, key)
+    return key
+
+def _save(path, data):
+    """ Write a key in a file (atomically: a key is never read partially written)
+    """
+    atomic_write(path, data)
+
+@lru_cache(maxsize=8)
+def shared_public_key(values):
+    """ The public key of these values, built once per process (the
+        workers of a process pool build the fixed bases only once)
+
+        Args:
+            values -- tuple -- (p, g1, g2, X, Y, W)
+
+        return a CramerShoupPublicKey
+    """
+    return CramerShoupPublicKey(*values)
+
+def _precompute_randomness(arguments):
+    """ Calculate the random values of some encryptions (in a worker)
+
+        Args:
+            arguments -- tuple -- (the values of the public key, count)
+
+        return a list of (b, g1^b, g2^b, W^b, X^b, Y^b)
+    """
+    values, count = arguments
+    public_key = shared_public_key(values)
+    return [public_key.new_randomness() for _ in range(count)]
+
+def clear_cache():
+    """ Forget the keys loaded from files
+    """
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+class CramerShoupPublicKey(object):
+    """ Public key of CramerShoup
+
+        The precalculated exponentiations of the bases of the key (see
+        fixed_bases) are built once, and kept with the key.
+
+        The random values of the encryptions (see randomness) don't depend
+        on the message: they can be calculated in advance (see precompute),
+        then an encryption only needs a few multiplications.
+
+        Attributes:
+            p -- int -- the safe prime of the group
+            g1, g2 -- int -- the generators of the group
+            X, Y, W -- int -- the public values
+    """
+
+    def __init__(self, p, g1, g2, X, Y, W):
+        self.p = p
+        self.g1 = g1
+        self.g2 = g2
+        self.X = X
+        self.Y = Y
+        self.W = W
+        self._fixed_bases = None
+        self._precomputed = deque()
+
+    @property
+    def size(self):
+        """ The size of p, in bytes
+        """
+        return (self.p.bit_length() + 7) // 8
+
+    @property
+    def group_id(self):
+        """ The identifier of the group (see CramerShoupCiphertext.group_id)
+        """
+        return group_id(self.p)
+
+    def values(self):
+        """ return the list [p, g1, g2, X, Y, W]
+        """
+        return [self.p, self.g1, self.g2, self.X, self.Y, self.W]
+
+    def fixed_bases(self):
+        """ Get the precalculated exponentiations of g1, g2, W, X and Y
+            (the exponents are reduced modulo p-1)
+
+            return a tuple of FixedBaseExp (g1, g2, W, X, Y)
+        """
+        if self._fixed_bases is None:
+            self._fixed_bases = tuple(FixedBaseExp(base, self.p, window=4, order=self.p-1)
+                                      for base in (self.g1, self.g2, self.W, self.X, self.Y))
+        return self._fixed_bases
+
+    def new_randomness(self):
+        """ Pick the random b of an encryption, and calculate its powers
+
+            return (b, g1^b, g2^b, W^b, X^b, Y^b)
+        """
+        g1_exp, g2_exp, W_exp, X_exp, Y_exp = self.fixed_bases()
+        b = randint(0, self.p-1)
+        return b, g1_exp.pow(b), g2_exp.pow(b), W_exp.pow(b), X_exp.pow(b), Y_exp.pow(b)
+
+    def randomness(self):
+        """ Get the random values of one encryption: a precalculated one
+            if there is one left (each one is used only once), or a new one
+
+            return (b, g1^b, g2^b, W^b, X^b, Y^b)
+        """
+        try:
+            return self._precomputed.popleft()
+        except IndexError:
+            return self.new_randomness()
+
+    def take_precomputed(self, count):
+        """ Take (and remove) at most 'count' precalculated random values,
+            to use them in another process (see add_precomputed)
+
+            return a list of (b, g1^b, g2^b, W^b, X^b, Y^b)
+        """
+        return [self._precomputed.popleft() for _ in range(min(count, len(self._precomputed)))]
+
+    def add_precomputed(self, randomness):
+        """ Add random values calculated in advance (see take_precomputed)
+
+            Args:
+                randomness -- list of (b, g1^b, g2^b, W^b, X^b, Y^b)
+        """
+        self._precomputed.extend(randomness)
+
+    def precompute(self, count, workers=1):
+        """ Calculate the random values of 'count' encryptions in advance
+
+            Args:
+                count -- int -- the number of encryptions
+                workers -- int -- the number of processes
+        """
+        if workers > 1:
+            values = tuple(self.values())
+            chunks = [(values, count // workers + (i < count % workers)) for i in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for randomness in executor.map(_precompute_randomness, chunks):
+                    self._precomputed.extend(randomness)
+        else:
+            for _ in range(count):
+                self._precomputed.append(self.new_randomness())
+
+    def precompute_in_background(self, count, workers=1):
+        """ Calculate the random values of 'count' encryptions in a background
+            thread (see precompute), the values can be used as soon as they are ready
+
+            return the thread, already started
+        """
+        thread = threading.Thread(target=self.precompute, args=(count, workers), daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def precomputed(self):
+        """ The number of precalculated random values left
+        """
+        return len(self._precomputed)
+
+    def to_bytes(self):
+        """ Serialise the key in the binary format
+
+            return bytes
+        """
+        return _pack(PUBLIC_MAGIC, self.size, self.values())
+
+    @staticmethod
+    def from_bytes(data):
+        """ Parse a key serialised with to_bytes, or in the text format
+            ('p,g1,g2,X,Y,W' in decimal)
+
+            Args:
+                data -- bytes-like or string -- the serialised key
+
+            return a CramerShoupPublicKey
+        """
+        if isinstance(data, str) or bytes(data[:4]) != PUBLIC_MAGIC:
+            if not isinstance(data, str):
+                data = bytes(data).decode('ascii')
+            return CramerShoupPublicKey(*[int(v) for v in data.split(',')])
+        return CramerShoupPublicKey(*_unpack(data, PUBLIC_MAGIC, 6))
+
+    def save(self, path):
+        """ Write the key (binary format) in a file
+
+            Args:
+                path -- string -- the file
+        """
+        _save(path, self.to_bytes())
+
+    @staticmethod
+    def load(path):
+        """ Load a key from a file (binary or text format), the key is
+            cached until the file is modified
+
+            Args:
+                path -- string -- the file
+
+            return a CramerShoupPublicKey
+        """
+        return _load(CramerShoupPublicKey, path, CramerShoupPublicKey.from_bytes)
+
+class CramerShoupPrivateKey(object):
+    """ Private key of CramerShoup
+
+        Attributes:
+            p -- int -- the safe prime of the group
+            x1, x2, y1, y2, w -- int -- the private values
+    """
+
+    def __init__(self, p, x1, x2, y1, y2, w):
+        self.p = p
+        self.x1 = x1
+        self.x2 = x2
+        self.y1 = y1
+        self.y2 = y2
+        self.w = w
+
+    @property
+    def size(self):
+        """ The size of p, in bytes
+        """
+        return (self.p.bit_length() + 7) // 8
+
+    @property
+    def group_id(self):
+        """ The identifier of the group (see CramerShoupCiphertext.group_id)
+        """
+        return group_id(self.p)
+
+    def values(self):
+        """ return the list [x1, x2, y1, y2, w] (without p, as in the text format)
+        """
+        return [self.x1, self.x2, self.y1, self.y2, self.w]
+
+    def to_bytes(self):
+        """ Serialise the key in the binary format (p is included)
+
+            return bytes
+        """
+        return _pack(PRIVATE_MAGIC, self.size, [self.p] + self.values())
+
+    @staticmethod
+    def from_bytes(data, p=None):
+        """ Parse a key serialised with to_bytes, or in the text format
+            ('x1,x2,y1,y2,w' in decimal)
+
+            Args:
+                data -- bytes-like or string -- the serialised key
+                p -- int -- the prime of the group, needed for the text format
+                    (it's not in the file)
+
+            return a CramerShoupPrivateKey
+        """
+        if isinstance(data, str) or bytes(data[:4]) != PRIVATE_MAGIC:
+            if p is None:
+                raise ValueError("The text format of the private key needs p")
+            if not isinstance(data, str):
+                data = bytes(data).decode('ascii')
+            return CramerShoupPrivateKey(p, *[int(v) for v in data.split(',')])
+        return CramerShoupPrivateKey(*_unpack(data, PRIVATE_MAGIC, 6))
+
+    def save(self, path):
+        """ Write the key (binary format) in a file
+
+            Args:
+                path -- string -- the file
+        """
+        _save(path, self.to_bytes())
+
+    @staticmethod
+    def load(path, public_path=None):
+        """ Load a key from a file (binary or text format), the key is
+            cached until the file is modified
+
+            Args:
+                path -- string -- the file
+                public_path -- string -- the file of the public key, to get p
+                    if the key is in the text format (default: path + '.pub')
+
+            return a CramerShoupPrivateKey
+        """
+        def parse(data):
+            if data[:4] == PRIVATE_MAGIC:
+                return CramerShoupPrivateKey.from_bytes(data)
+            public_key = CramerShoupPublicKey.load(public_path or path + '.pub')
+            return CramerShoupPrivateKey.from_bytes(data, public_key.p)
+        return _load(CramerShoupPrivateKey, path, parse)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+
+""" This module contains the Cryptanalysis class
+"""
+
+import math
+import random
+import string
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import add
+
+# frequencies of the letters in an english text
+ENGLISH_FREQUENCIES = {
+    'A': 0.08167, 'B': 0.01492, 'C': 0.02782, 'D': 0.04253, 'E': 0.12702,
+    'F': 0.02228, 'G': 0.02015, 'H': 0.06094, 'I': 0.06966, 'J': 0.00153,
+    'K': 0.00772, 'L': 0.04025, 'M': 0.02406, 'N': 0.06749, 'O': 0.07507,
+    'P': 0.01929, 'Q': 0.00095, 'R': 0.05987, 'S': 0.06327, 'T': 0.09056,
+    'U': 0.02758, 'V': 0.00978, 'W': 0.02360, 'X': 0.00150, 'Y': 0.01974,
+    'Z': 0.00074
+}
+
+ALPHABET = string.ascii_uppercase
+
+class Cryptanalysis(object):
+    """ Frequency analysis and automated key recovery for the classical ciphers
+        (Caesar, Affine and the monoalphabetic substitution cipher)
+
+        The ciphertext is read only once, to count its n-grams. Then every
+        candidate key is scored from these counts, without deciphering the
+        text, so the cost of a key doesn't depend on the length of the text.
+
+        The candidates can be evaluated in a process pool, with the 'workers'
+        argument of the break functions.
+    """
+
+    @staticmethod
+    def ngram_counts(text, n=1):
+        """ Count the n-grams of the text
+
+            Args:
+                text -- string -- the text to analyse
+                n -- int -- the size of the n-grams
+
+            return a Counter of the n-grams
+        """
+        if n == 1:
+            return Counter(text)
+        # zip the text with itself shifted to build the n-grams
+        return Counter(map(''.join, zip(*[text[i:] for i in range(n)])))
+
+    @staticmethod
+    def chi_squared(observed, total, expected=None):
+        """ Chi-squared statistic between the observed letters and the
+            expected frequencies
+
+            Args:
+                observed -- dict -- number of occurrences of each (uppercase) letter
+                total -- int -- the length of the text
+                expected -- dict -- the expected frequency of each letter
+
+            return the statistic: the lower, the closer to the expected frequencies
+                (0 for an empty text)
+        """
+        if not total:
+            return 0.0
+        expected = expected or ENGLISH_FREQUENCIES
+        result = 0
+        for letter, frequency in expected.items():
+            expected_count = frequency * total
+            result += (observed.get(letter, 0) - expected_count)**2 / expected_count
+        return result
+
+    @staticmethod
+    def _map(function, arguments, workers):
+        """ Apply the function to each argument, in a process pool if workers > 1
+
+            Args:
+                function -- function -- a picklable function
+                arguments -- list -- the arguments
+                workers -- int -- the number of processes
+
+            return a list of the results
+        """
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(function, arguments))
+        return list(map(function, arguments))
+
+    @staticmethod
+    def _score_affine_keys(arguments):
+        """ Score some keys of the affine cipher (on 256 code points)
+
+            Args:
+                arguments -- tuple -- (counts, total, list of a, list of b)
+
+            return the best (score, a, b) among the keys
+        """
+        counts, total, a_values, b_values = arguments
+        best = None
+        for a in a_values:
+            # the code points of the ciphered letters, before adding b
+            lower = [a * ord(letter.lower()) for letter in ALPHABET]
+            upper = [a * ord(letter) for letter in ALPHABET]
+            for b in b_values:
+                observed = {}
+                for i, letter in enumerate(ALPHABET):
+                    observed[letter] = counts.get(chr((lower[i] + b) & 0xFF), 0) \
+                                     + counts.get(chr((upper[i] + b) & 0xFF), 0)
+                score = Cryptanalysis.chi_squared(observed, total)
+                if best is None or score < best[0]:
+                    best = (score, a, b)
+        return best
+
+    @staticmethod
+    def break_caesar(ciphertext, workers=1):
+        """ Find the shift of a Caesar ciphertext, trying the 256 shifts
+
+            Args:
+                ciphertext -- string -- the text to break
+                workers -- int -- the number of processes
+
+            return the most probable shift (0 for an empty text)
+        """
+        if not ciphertext:
+            return 0
+        # no more processes than shifts: each one gets some keys
+        workers = max(1, min(workers, 256))
+        counts = dict(Cryptanalysis.ngram_counts(ciphertext))
+        # a Caesar cipher is an affine cipher with a = 1
+        chunks = [(counts, len(ciphertext), [1], range(i, 256, workers))
+                  for i in range(workers)]
+        results = Cryptanalysis._map(Cryptanalysis._score_affine_keys, chunks, workers)
+        return min(results)[2]
+
+    @staticmethod
+    def break_affine(ciphertext, workers=1):
+        """ Find the key of an Affine ciphertext, trying all the valid (a, b)
+
+            Args:
+                ciphertext -- string -- the text to break
+                workers -- int -- the number of processes
+
+            return the most probable (a, b) ((1, 0) for an empty text)
+        """
+        if not ciphertext:
+            return 1, 0
+        counts = dict(Cryptanalysis.ngram_counts(ciphertext))
+        # 'a' must be invertible modulo 256 => odd
+        a_values = list(range(1, 256, 2))
+        # no more processes than values of 'a': each one gets some keys
+        workers = max(1, min(workers, len(a_values)))
+        chunks = [(counts, len(ciphertext), a_values[i::workers], range(256))
+                  for i in range(workers)]
+        results = Cryptanalysis._map(Cryptanalysis._score_affine_keys, chunks, workers)
+        _, a, b = min(results)
+        return a, b
+
+    @staticmethod
+    def _letter_bigrams(text):
+        """ Count the bigrams of uppercase letters of the text
+
+            Args:
+                text -- string -- the text to analyse
+
+            return a dict {(i, j): count} where i, j are indexes in the alphabet
+        """
+        counts = Cryptanalysis.ngram_counts(text.upper(), 2)
+        index = {letter: i for i, letter in enumerate(ALPHABET)}
+        return {(index[bigram[0]], index[bigram[1]]): count for bigram, count in counts.items()
+                if bigram[0] in index and bigram[1] in index}
+
+    @staticmethod
+    def _bigram_log_probabilities(reference):
+        """ Build the bigram model of a reference text
+
+            Args:
+                reference -- string -- a text in the expected language
+
+            return a list of 676 log probabilities (index: i * 26 + j)
+        """
+        counts = Cryptanalysis._letter_bigrams(reference)
+        total = sum(counts.values())
+        if not total:
+            raise ValueError("The reference text doesn't contain any bigram")
+        # unknown bigrams are very unlikely, but not impossible
+        floor = math.log(0.01 / total)
+        log_probabilities = [floor] * 676
+        for (i, j), count in counts.items():
+            log_probabilities[i*26 + j] = math.log(count / total)
+        return log_probabilities
+
+    @staticmethod
+    def _bigram_score(bigrams, log_probabilities, key):
+        """ Log likelihood of the text deciphered with the key
+
+            Args:
+                bigrams -- list -- (i, j, count) of the ciphertext
+                log_probabilities -- list -- the bigram model
+                key -- list -- key[cipher letter index] = plain letter index
+
+            return the score: the higher, the better
+        """
+        return sum(count * log_probabilities[key[i]*26 + key[j]] for i, j, count in bigrams)
+
+    @staticmethod
+    def _hill_climbing(arguments):
+        """ Improve a substitution key by swapping 2 letters while the
+            score increases
+
+            Args:
+                arguments -- tuple -- (bigrams, log_probabilities, key, seed)
+                    if seed is not None, the key is shuffled before climbing
+
+            return the best (score, key) found
+        """
+        bigrams, log_probabilities, key, seed = arguments
+        key = list(key)
+        if seed is not None:
+            random.Random(seed).shuffle(key)
+        score = Cryptanalysis._bigram_score(bigrams, log_probabilities, key)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(26):
+                for j in range(i+1, 26):
+                    key[i], key[j] = key[j], key[i]
+                    new_score = Cryptanalysis._bigram_score(bigrams, log_probabilities, key)
+                    if new_score > score:
+                        score = new_score
+                        improved = True
+                    else:
+                        key[i], key[j] = key[j], key[i]
+        return score, key
+
+    @staticmethod
+    def break_substitution(ciphertext, reference, restarts=4, workers=1):
+        """ Find the key of a monoalphabetic substitution ciphertext (uppercase
+            letters), by hill climbing on the bigram statistics
+
+            Args:
+                ciphertext -- string -- the text to break
+                reference -- string -- a text in the same language as the
+                    plaintext, used to build the bigram model
+                restarts -- int -- the number of random restarts
+                workers -- int -- the number of processes
+
+            return the ciphertext alphabet, to use with string.ascii_uppercase
+                as plaintext alphabet
+        """
+        bigrams = [(i, j, count) for (i, j), count in
+                   Cryptanalysis._letter_bigrams(ciphertext).items()]
+        log_probabilities = Cryptanalysis._bigram_log_probabilities(reference)
+
+        # start with the key matching the letter frequencies
+        cipher_counts = Counter(ciphertext.upper())
+        reference_counts = Counter(reference.upper())
+        cipher_order = sorted(ALPHABET, key=lambda c: -cipher_counts[c])
+        reference_order = sorted(ALPHABET, key=lambda c: -reference_counts[c])
+        key = [0] * 26
+        for cipher_letter, plain_letter in zip(cipher_order, reference_order):
+            key[ALPHABET.index(cipher_letter)] = ALPHABET.index(plain_letter)
+
+        # the first climb starts from the frequency key, the others are random
+        climbs = [(bigrams, log_probabilities, key, None if i == 0 else i)
+                  for i in range(restarts)]
+        _, key = max(Cryptanalysis._map(Cryptanalysis._hill_climbing, climbs, workers))
+
+        # key[cipher letter] = plain letter => invert it
+        ciphertext_alphabet = [None] * 26
+        for cipher_index, plain_index in enumerate(key):
+            ciphertext_alphabet[plain_index] = ALPHABET[cipher_index]
+        return ''.join(ciphertext_alphabet)
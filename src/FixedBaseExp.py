@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+""" This module contains the FixedBaseExp class
+"""
+
+from src._functions import modexp
+
+class FixedBaseExp(object):
+    """ Modular exponentiation of a base used many times (a generator, a
+        public key, ..), with a precalculated table:
+            table[i][d] = g^(d * 2^(window*i)) mod p
+
+        The exponent is cut in digits of 'window' bits, and g^exp is the
+        product of one value of the table per digit: no squaring at all.
+
+        Attributes:
+            g -- int -- the base
+            mod -- int -- the modulo
+            order -- int or None -- the exponents are reduced modulo order
+                (for example p-1, or q for an element of a subgroup of order q)
+            window -- int -- the number of bits of a digit
+            table -- list of lists -- the precalculated powers
+    """
+
+    def __init__(self, g, mod, exponent_bits=None, window=8, order=None):
+        """
+            Args:
+                exponent_bits -- int -- the maximum size of the exponents, in bits
+                    (default: the size of order, or of mod)
+        """
+        self.g = g % mod
+        self.mod = mod
+        self.order = order
+        self.window = window
+        exponent_bits = exponent_bits or (order or mod).bit_length()
+
+        self.table = []
+        base = self.g
+        for _ in range((exponent_bits + window - 1) // window):
+            powers = [1]
+            for _ in range((1 << window) - 1):
+                powers.append(powers[-1] * base % mod)
+            self.table.append(powers)
+            # next base: g^(2^(window*(i+1)))
+            base = powers[-1] * base % mod
+
+    def pow(self, exp):
+        """ Calculate g^exp mod p
+
+            Args:
+                exp -- int -- the exponent
+
+            return g**exp % mod
+        """
+        if self.order and (exp < 0 or exp.bit_length() > len(self.table) * self.window):
+            exp %= self.order
+        if exp < 0 or exp.bit_length() > len(self.table) * self.window:
+            # out of the table
+            return modexp(self.g, exp, self.mod)
+
+        if self.window == 8:
+            digits = exp.to_bytes(len(self.table), 'little')
+        else:
+            mask = (1 << self.window) - 1
+            digits = [(exp >> (self.window * i)) & mask for i in range(len(self.table))]
+
+        result = 1
+        mod = self.mod
+        for powers, digit in zip(self.table, digits):
+            if digit:
+                result = result * powers[digit] % mod
+        return result
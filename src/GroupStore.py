@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+""" This module contains the GroupStore class, which keeps the cyclic groups
+    (p, q, g1, g2) used by CramerShoup
+"""
+
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from src._functions import (generate_safe_prime_number, find_safe_prime_generator,
+                            is_prime)
+from src._utils import list_to_string
+from src.FixedBaseExp import FixedBaseExp
+
+FILE_NAME = 'cramer_shoup.groups'
+
+def _hex_to_int(text):
+    """ Convert an hexadecimal number written in blocks (as in the RFC) to int
+    """
+    return int(''.join(text.split()), 16)
+
+# safe primes of the MODP groups of RFC 3526
+MODP_PRIMES = {
+    'modp1536': _hex_to_int("""
+        FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+        020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+        4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+        EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+        98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+        9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA237327 FFFFFFFF FFFFFFFF
+    """),
+    'modp2048': _hex_to_int("""
+        FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+        020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+        4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+        EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+        98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+        9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+        E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+        3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AACAA68 FFFFFFFF FFFFFFFF
+    """),
+    'modp3072': _hex_to_int("""
+        FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+        020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+        4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+        EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+        98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+        9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+        E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+        3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AAAC42D AD33170D 04507A33
+        A85521AB DF1CBA64 ECFB8504 58DBEF0A 8AEA7157 5D060C7D B3970F85 A6E1E4C7
+        ABF5AE8C DB0933D7 1E8C94E0 4A25619D CEE3D226 1AD2EE6B F12FFA06 D98A0864
+        D8760273 3EC86A64 521F2B18 177B200C BBE11757 7A615D6C 770988C0 BAD946E2
+        08E24FA0 74E5AB31 43DB5BFC E0FD108E 4B82D120 A93AD2CA FFFFFFFF FFFFFFFF
+    """),
+    'modp4096': _hex_to_int("""
+        FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+        020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+        4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+        EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+        98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+        9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+        E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+        3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AAAC42D AD33170D 04507A33
+        A85521AB DF1CBA64 ECFB8504 58DBEF0A 8AEA7157 5D060C7D B3970F85 A6E1E4C7
+        ABF5AE8C DB0933D7 1E8C94E0 4A25619D CEE3D226 1AD2EE6B F12FFA06 D98A0864
+        D8760273 3EC86A64 521F2B18 177B200C BBE11757 7A615D6C 770988C0 BAD946E2
+        08E24FA0 74E5AB31 43DB5BFC E0FD108E 4B82D120 A9210801 1A723C12 A787E6D7
+        88719A10 BDBA5B26 99C32718 6AF4E23C 1A946834 B6150BDA 2583E9CA 2AD44CE8
+        DBBBC2DB 04DE8EF9 2E8EFC14 1FBECAA6 287C5947 4E6BC05D 99B2964F A090C3A2
+        233BA186 515BE7ED 1F612970 CEE2D7AF B81BDD76 2170481C D0069127 D5B05AA9
+        93B4EA98 8D8FDDC1 86FFB7DC 90A6C08F 4DF435C9 34063199 FFFFFFFF FFFFFFFF
+    """),}
+
+def generate_group(length=1025):
+    """ Generate a new group: a safe prime p = 2q + 1 and 2 distinct
+        generators picked randomly
+
+        Args:
+            length -- int -- the size of p, in bits
+
+        return the group (p, q, g1, g2)
+    """
+    p = generate_safe_prime_number(length)
+    q = (p - 1) // 2
+    g1 = find_safe_prime_generator(p, q)
+    g2 = g1
+    while g2 == g1:
+        g2 = find_safe_prime_generator(p, q)
+    return p, q, g1, g2
+
+@lru_cache(maxsize=None)
+def named_group(name):
+    """ Build the group of a RFC 3526 safe prime, the generators are the 2
+        lowest generators of the group (so the group is always the same)
+
+        Args:
+            name -- string -- a key of MODP_PRIMES
+
+        return the group (p, q, g1, g2)
+    """
+    p = MODP_PRIMES[name]
+    q = (p - 1) // 2
+    generators = []
+    a = 2
+    while len(generators) < 2:
+        if pow(a, 2, p) != 1 and pow(a, q, p) != 1:
+            generators.append(a)
+        a += 1
+    return (p, q) + tuple(generators)
+
+def is_valid_group(group, check_primes=True):
+    """ Check that the group is well-formed: p = 2q + 1 is a safe prime,
+        g1 and g2 are distinct generators of the group
+
+        Args:
+            group -- tuple -- (p, q, g1, g2)
+            check_primes -- boolean -- if False, the primality of p and q
+                is not checked (the slowest part)
+
+        return True if the group is valid
+    """
+    p, q, g1, g2 = group
+    if p != 2*q + 1 or g1 == g2:
+        return False
+    for g in (g1, g2):
+        if not 1 < g < p or pow(g, 2, p) == 1 or pow(g, q, p) == 1:
+            return False
+    return not check_primes or (is_prime(q) and is_prime(p))
+
+class GroupStore(object):
+    """ Store of the groups used by CramerShoup
+
+        Generating a safe prime is by far the slowest part of the key
+        generation, but a group can be shared by many key pairs: the
+        generated groups are saved in a file (one 'p,q,g1,g2' per line)
+        and reused. Groups can be generated in advance, in the background.
+        The MODP groups of RFC 3526 can also be used, by name.
+
+        Attributes:
+            path -- string -- the file where the groups are saved
+            groups -- list of tuple -- the groups (p, q, g1, g2) of the store
+    """
+
+    def __init__(self, path=None):
+        """
+            Args:
+                path -- string -- the file of the store (default: 'outputs/cramer_shoup.groups')
+        """
+        self.path = path or os.path.join('outputs', FILE_NAME)
+        self.groups = []
+        self._lock = threading.Lock()
+        self._fixed_bases = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    if line.strip():
+                        group = tuple(int(v) for v in line.split(','))
+                        # the primes were checked before the group was saved
+                        if is_valid_group(group, check_primes=False):
+                            self.groups.append(group)
+
+    def add(self, group):
+        """ Check the group, and add it to the store (and to its file)
+
+            Args:
+                group -- tuple -- (p, q, g1, g2)
+        """
+        if not is_valid_group(group):
+            raise ValueError("Invalid group")
+        with self._lock:
+            self.groups.append(tuple(group))
+            with open(self.path, 'a') as f:
+                f.write(list_to_string(group) + '\n')
+
+    def generate(self, count=1, length=1025, workers=1):
+        """ Generate new groups and add them to the store
+
+            Args:
+                count -- int -- the number of groups to generate
+                length -- int -- the size of p, in bits
+                workers -- int -- the number of processes generating the groups
+        """
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for group in executor.map(generate_group, [length] * count):
+                    self.add(group)
+        else:
+            for _ in range(count):
+                self.add(generate_group(length))
+
+    def generate_in_background(self, count=1, length=1025, workers=1):
+        """ Generate new groups in a background thread (see generate)
+
+            return the thread, already started
+        """
+        thread = threading.Thread(target=self.generate, args=(count, length, workers),
+                                  daemon=True)
+        thread.start()
+        return thread
+
+    def get(self, name=None, length=1025):
+        """ Get a group
+
+            Args:
+                name -- string or None -- the name of a MODP group (see MODP_PRIMES)
+                    if None, a group of the store is picked randomly
+                    (and one is generated if the store is empty)
+                length -- int -- the size of p, if a group has to be generated
+
+            return a group (p, q, g1, g2)
+        """
+        if name:
+            if name not in MODP_PRIMES:
+                raise ValueError("Unknown group: %s" % name)
+            return named_group(name)
+        if not self.groups:
+            self.generate(1, length)
+        return random.choice(self.groups)
+
+    def fixed_bases(self, group):
+        """ Get the precalculated exponentiations of the generators of the
+            group (calculated once per group)
+
+            Args:
+                group -- tuple -- (p, q, g1, g2)
+
+            return a tuple of FixedBaseExp (g1, g2)
+        """
+        p, _, g1, g2 = group
+        if group not in self._fixed_bases:
+            self._fixed_bases[group] = (FixedBaseExp(g1, p, window=4, order=p-1),
+                                        FixedBaseExp(g2, p, window=4, order=p-1))
+        return self._fixed_bases[group]
+
+    def __len__(self):
+        return len(self.groups)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+""" This module contains the PrimeTable class
+"""
+
+import os
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from src._files import atomic_open
+from src._functions import iter_primes
+
+# file format: header (magic, limit), then the primes as native 32 bits integers
+MAGIC = b'PRIM'
+HEADER = struct.Struct('=4s4xQ')
+# number of primes written at once when building a table
+CHUNK_SIZE = 1 << 20
+
+class PrimeTable(object):
+    """ Table of all the primes lower or equals to a limit, stored in a file
+
+        The file is memory-mapped (read-only), so the table is loaded
+        instantly and its pages are shared by all the processes using it.
+
+        Attributes:
+            path -- string -- the file of the table
+            limit -- int -- all the primes <= limit are in the table
+    """
+
+    def __init__(self, path):
+        """
+            Args:
+                path -- string -- the file of the table, created with PrimeTable.build
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.limit = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError("'%s' is not a prime table" % path)
+        self._primes = memoryview(self._mmap)[HEADER.size:].cast('I')
+
+    @staticmethod
+    def build(path, limit):
+        """ Sieve the primes lower or equals to limit and save them in a file
+
+            The file is written atomically (see src._files.atomic_open): a
+            file mapped by other processes is replaced, never rewritten.
+
+            Args:
+                path -- string -- the file to create
+                limit -- int -- lower than 2**32
+
+            return the PrimeTable
+        """
+        if limit >= 2**32:
+            raise ValueError("The limit must be lower than 2**32")
+        with atomic_open(path) as f:
+            f.write(HEADER.pack(MAGIC, limit))
+            chunk = array('I')
+            for p in iter_primes(limit):
+                chunk.append(p)
+                if len(chunk) == CHUNK_SIZE:
+                    chunk.tofile(f)
+                    chunk = array('I')
+            chunk.tofile(f)
+        return PrimeTable(path)
+
+    @staticmethod
+    def load_or_build(path, limit):
+        """ Load the table from the file, or build it if the file doesn't
+            exist or doesn't go up to limit
+
+            Args:
+                path -- string -- the file of the table
+                limit -- int -- the minimum limit of the table
+
+            return the PrimeTable
+        """
+        if os.path.exists(path):
+            table = PrimeTable(path)
+            if table.limit >= limit:
+                return table
+            table.close()
+        return PrimeTable.build(path, limit)
+
+    def primes_between(self, start, end):
+        """ Get the primes in range [start, end] (without copy)
+
+            Args:
+                start -- int
+                end -- int -- lower or equals to the limit
+
+            return a memoryview of the primes
+        """
+        return self._primes[bisect_left(self._primes, start):bisect_right(self._primes, end)]
+
+    def close(self):
+        """ Release the memory-mapped file
+        """
+        self._primes.release()
+        self._mmap.close()
+
+    def __contains__(self, n):
+        i = bisect_left(self._primes, n)
+        return i < len(self._primes) and self._primes[i] == n
+
+    def __getitem__(self, i):
+        return self._primes[i]
+
+    def __len__(self):
+        return len(self._primes)
+
+    def __iter__(self):
+        return iter(self._primes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -3,7 +3,16 @@
 """ This module contains the SHA1 class
 """
 
-from src._functions import rotl
+from src._words import (numpy, DTYPES, make_rotl, words_from_bytes, words_to_bytes,
+                         rotl_words)
+
+# rotations of the words (32 bits)
+ROTL1 = make_rotl(1)
+ROTL5 = make_rotl(5)
+ROTL30 = make_rotl(30)
+
+# number of messages hashed at once by hash_many (bounds the memory of the vectors)
+CHUNK_MESSAGES = 1 << 14
 
 class SHA1(object):
     """ SHA 1 hash algorithm implementation
@@ -61,21 +70,8 @@ class SHA1(object):
 
             return a list of blocks
         """
-        blocks = []
-        nb_blocks = len(stream) // 64
-
-        for i in range(nb_blocks):
-            temp = []
-            for j in range(16):
-                # Calculate the value of the word and append it
-                value = 0
-                for k in range(4):
-                    value <<= 8
-                    value += stream[i*64 + j*4 + k]
-                temp.append(value)
-            blocks.append(temp)
-
-        return blocks
+        words = words_from_bytes(stream[:len(stream) - len(stream) % 64])
+        return [words[i:i+16].tolist() for i in range(0, len(words), 16)]
 
     def hash(self, stream):
         """
@@ -96,6 +92,87 @@ class SHA1(object):
 
         return self.produce_digest()
 
+    @staticmethod
+    def hash_many(streams, vector=None):
+        """
+            Hash many streams at once: the messages with the same number of
+            blocks are hashed in lockstep, the k-th blocks of M messages are
+            a (M, 16) array and each step of the rounds is one vector
+            operation on all the messages
+
+            Args:
+                streams -- list of string or bytes-like -- the texts to hash
+                vector -- boolean or None -- use NumPy (default: if installed)
+
+            return the list of the digests (the same as hash)
+        """
+        if vector is None:
+            vector = numpy is not None
+        # copy the streams (the padding would extend a bytearray in place)
+        streams = [bytes(stream, 'utf-8') if isinstance(stream, str) else bytes(stream)
+                   for stream in streams]
+        if not vector:
+            return [SHA1().hash(stream) for stream in streams]
+        if numpy is None:
+            raise ImportError("NumPy is not installed")
+
+        # group the messages by number of blocks (after the padding)
+        groups = {}
+        for index, stream in enumerate(streams):
+            stream = SHA1._padding(stream)
+            groups.setdefault(len(stream) // 64, []).append((index, stream))
+
+        digests = [None] * len(streams)
+        for count, group in groups.items():
+            for i in range(0, len(group), CHUNK_MESSAGES):
+                chunk = group[i:i + CHUNK_MESSAGES]
+                words = words_from_bytes(b''.join(stream for _, stream in chunk), 32, True)
+                H = SHA1._process_blocks(words.reshape(len(chunk), count, 16))
+                # the 5 words of each message, big-endian
+                data = words_to_bytes(H.T).hex()
+                for j, (index, _) in enumerate(chunk):
+                    digests[index] = data[40*j:40*(j + 1)]
+        return digests
+
+    @staticmethod
+    def _process_blocks(blocks):
+        """
+            Hash the blocks of M messages, in lockstep (see _process_block)
+
+            Args:
+                blocks -- numpy array -- (M, number of blocks, 16) uint32
+
+            return the hash variables, a (5, M) uint32 array
+        """
+        # the constants of the rounds (20 rounds each)
+        K = numpy.array([0x5a827999, 0x6ed9eba1, 0x8f1bbcdc, 0xca62c1d6], dtype=DTYPES[32])
+        H = numpy.empty((5, blocks.shape[0]), dtype=DTYPES[32])
+        H.T[:] = SHA1()._H
+        w = numpy.empty((80, blocks.shape[0]), dtype=DTYPES[32])
+        for k in range(blocks.shape[1]):
+            # => extend the k-th blocks from 16 to 80 words
+            w[:16] = blocks[:, k, :].T
+            for i in range(16, 80):
+                w[i] = rotl_words(w[i-3] ^ w[i-8] ^ w[i-14] ^ w[i-16], 1)
+
+            a, b, c, d, e = H
+            for i in range(80):
+                if i <= 19:
+                    f = (b & c) ^ (~b & d)
+                elif i <= 39 or i >= 60:
+                    f = b ^ c ^ d
+                else:
+                    f = (b & c) ^ (b & d) ^ (c & d)
+                # the unsigned integers of NumPy wrap around (mod 2**32)
+                T = rotl_words(a, 5) + f + e + K[i // 20] + w[i]
+                e = d
+                d = c
+                c = rotl_words(b, 30)
+                b = a
+                a = T
+
+            H = H + numpy.array([a, b, c, d, e])
+        return H
 
     def _process_block(self, block):
         """
@@ -107,7 +184,7 @@ class SHA1(object):
         # => extend the block from 16 to 80 words
         w = block[:]
         for i in range(16, 80):
-            w.append(rotl(w[i-3] ^ w[i-8] ^ w[i-14] ^ w[i-16]) & self.mask)
+            w.append(ROTL1(w[i-3] ^ w[i-8] ^ w[i-14] ^ w[i-16]))
 
         # initialize hash value for this block
         a, b, c, d, e = self._H[:]
@@ -127,10 +204,10 @@ class SHA1(object):
                 f = b ^ c ^ d
                 k = 0xca62c1d6
 
-            T = ((rotl(a, 5) + f + e + k + w[i]) & self.mask)
+            T = ((ROTL5(a) + f + e + k + w[i]) & self.mask)
             e = d
             d = c
-            c = rotl(b, 30) & self.mask
+            c = ROTL30(b)
             b = a
             a = T
 
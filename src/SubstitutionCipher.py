@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+""" This module contains the SubstitutionCipher class
+"""
+
+from functools import lru_cache
+
+@lru_cache(maxsize=128)
+def _translate_tables(plaintext_alphabet, ciphertext_alphabet):
+    """ Build (once per key) the translate tables of the cipher
+
+        Args:
+            plaintext_alphabet -- string -- message's alphabet
+            ciphertext_alphabet -- string -- alphabet to cipher the message
+
+        return a tuple (cipher table, decipher table)
+    """
+    return (str.maketrans(plaintext_alphabet, ciphertext_alphabet),
+            str.maketrans(ciphertext_alphabet, plaintext_alphabet))
+
+class SubstitutionCipher(object):
+    """ Monoalphabetic substitution cipher implementation
+
+        The substitution is done with str.translate, using translate tables
+        computed once per key, so the text is ciphered in linear time.
+
+        Attributes:
+            plaintext_alphabet -- string -- message's alphabet
+            ciphertext_alphabet -- string -- alphabet to cipher the message
+    """
+
+    def __init__(self, plaintext_alphabet, ciphertext_alphabet):
+        if len(plaintext_alphabet) != len(ciphertext_alphabet):
+            raise ValueError("The two alphabets must have the same length")
+        if len(set(plaintext_alphabet)) != len(plaintext_alphabet) \
+                or len(set(ciphertext_alphabet)) != len(ciphertext_alphabet):
+            raise ValueError("An alphabet can't contain the same letter twice")
+        self.plaintext_alphabet = plaintext_alphabet
+        self.ciphertext_alphabet = ciphertext_alphabet
+        self._cipher_table, self._decipher_table = _translate_tables(plaintext_alphabet,
+                                                                     ciphertext_alphabet)
+
+    @staticmethod
+    def _check_alphabet(text, alphabet):
+        """ Make sure that every letter of the text is in the alphabet
+
+            Args:
+                text -- string -- the text to check
+                alphabet -- string -- the allowed letters
+        """
+        unknown = set(text).difference(alphabet)
+        if unknown:
+            raise ValueError("Letters not in the alphabet: %s" % ''.join(sorted(unknown)))
+
+    def cipher(self, message):
+        """ Cipher the message (uppercase letters)
+
+            Args:
+                message -- string -- the message to cipher
+
+            return the ciphertext
+        """
+        message = message.upper()
+        self._check_alphabet(message, self.plaintext_alphabet)
+        return message.translate(self._cipher_table)
+
+    def decipher(self, ciphertext):
+        """ Decipher the ciphertext (uppercase letters)
+
+            Args:
+                ciphertext -- string -- the text to decipher
+
+            return the message
+        """
+        ciphertext = ciphertext.upper()
+        self._check_alphabet(ciphertext, self.ciphertext_alphabet)
+        return ciphertext.translate(self._decipher_table)
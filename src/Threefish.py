@@ -4,7 +4,12 @@
 """
 
 from src._utils import (bytearray_to_int, add_padding)
-from src._functions import rotl, rotr
+from src._padding import strip_padding, ISO_10126, legacy_length_bytes
+from src._words import make_rotl, make_rotr
+
+# rotations of the mix function (64 bits words, Threefish.NB_ROTATIONS bits)
+ROTL_MIX = make_rotl(49, 64)
+ROTR_MIX = make_rotr(49, 64)
 
 class Threefish(object):
     """ Threefish implementation
@@ -17,6 +22,8 @@ class Threefish(object):
             P -- tuple of int -- permutation table for the permutation function
             NB_ROUNDS -- integer -- the number of rounds
             NB_ROTATIONS -- integer -- the number of rotations to do in the mix function
+            CTR_CHUNK_BLOCKS -- integer -- the number of blocks of keystream generated
+                at once in CTR mode
 
         Attributes:
             block_size -- integer -- 32, 64 or 128 -- the size of a block, in bytes
@@ -27,6 +34,7 @@ class Threefish(object):
     C = bytearray.fromhex("1bd11bdaa9fc1a22")
     W_LEN = 8
     MASK = 0xffffffffffffffff
+    CTR_CHUNK_BLOCKS = 1 << 10
     P = (1, 0, 3, 2, 5, 4, 7, 6, 9, 8, 11, 10, 13, 12, 15, 14)
     NB_ROUNDS = 76
     NB_ROTATIONS = 49
@@ -48,13 +56,16 @@ class Threefish(object):
         # generate the third tweak
         self.tweaks[2] = self.tweaks[0] + self.tweaks[1]
         self.rounds_keys = None
+        # the rounds keys as int, used by the fixed width functions (encrypt_words)
+        self.rounds_keys_words = None
 
     def key_schedule(self):
         """ Generate the 20 keys used in the rounds
         """
         # cut the key in words and generate the last word of the key
         key_words = []
-        next_word = self.C
+        # copy the constant, it must not be modified by the xor
+        next_word = bytearray(self.C)
         for i in range(0, self.block_size // self.W_LEN):
             key_words.append(self.key[i*self.W_LEN:(i+1)*self.W_LEN])
             for j in range(self.W_LEN):
@@ -86,6 +97,7 @@ class Threefish(object):
 
             self.rounds_keys.append(round_keys)
 
+        self.rounds_keys_words = [list(round_keys) for round_keys in self.rounds_keys]
         # cast every keys in bytes
         for j in range(len(self.rounds_keys)):
             for k in range(len(self.rounds_keys[j])):
@@ -105,7 +117,7 @@ class Threefish(object):
         new_m1 = (int.from_bytes(m1, 'big') + int.from_bytes(m2, 'big')) & Threefish.MASK
 
         # Make the rotation in int
-        new_rot = rotl(int.from_bytes(m2, byteorder='big'), rotations=Threefish.NB_ROTATIONS, w=Threefish.W_LEN*8)
+        new_rot = ROTL_MIX(int.from_bytes(m2, byteorder='big'))
 
         # Xor new_m1 with new_rot
         new_m2 = new_m1 ^ new_rot
@@ -129,7 +141,7 @@ class Threefish(object):
         temp_m2 = int.from_bytes(m1, 'big') ^ int.from_bytes(m2, 'big')
 
         # Make the rotr to cancel rotl
-        new_rot = rotr(temp_m2, rotations=Threefish.NB_ROTATIONS, w=Threefish.W_LEN*8)
+        new_rot = ROTR_MIX(temp_m2)
 
         # Retrieve m1 by substracting m2
         new_m1 = ((int.from_bytes(m1, 'big')) - new_rot) & Threefish.MASK
@@ -238,6 +250,119 @@ class Threefish(object):
             block[j] = temp_to_cipher.to_bytes((temp_to_cipher.bit_length() + 7) // 8, 'big')
         return block
 
+    def encrypt_words(self, words):
+        """ Cipher one block, given as words (int), with the same rounds as cipher
+
+            Args:
+                words -- list of int -- the 64 bits words of the block
+
+            return the list of the ciphered words
+        """
+        keys = self.rounds_keys_words
+        mask = Threefish.MASK
+        permutation = Threefish.P[:len(words)]
+        rotation = Threefish.NB_ROTATIONS
+        for j in range(Threefish.NB_ROUNDS):
+            # apply one of the subkey every 4 rounds, and the last one before the last round
+            if j == Threefish.NB_ROUNDS - 1:
+                words = [word ^ key for word, key in zip(words, keys[-1])]
+            elif j % 4 == 0:
+                words = [word ^ key for word, key in zip(words, keys[j//4])]
+            # substitution (mix) and permutation
+            for i in range(0, len(words), 2):
+                m1, m2 = words[i], words[i+1]
+                m1 = (m1 + m2) & mask
+                words[i] = m1
+                # rotation inlined (see ROTL_MIX): a function call per mix is slower
+                words[i+1] = m1 ^ (((m2 << rotation) & mask) | (m2 >> (64 - rotation)))
+            words = [words[i] for i in permutation]
+        return words
+
+    def decrypt_words(self, words):
+        """ Decipher one block, given as words (int), the reverse of encrypt_words
+
+            Args:
+                words -- list of int -- the 64 bits words of the ciphered block
+
+            return the list of the deciphered words
+        """
+        keys = self.rounds_keys_words
+        mask = Threefish.MASK
+        permutation = Threefish.P[:len(words)]
+        inverse = sorted(range(len(permutation)), key=permutation.__getitem__)
+        rotation = Threefish.NB_ROTATIONS
+        for j in range(Threefish.NB_ROUNDS - 1, -1, -1):
+            # inverted permutation and substitution
+            words = [words[i] for i in inverse]
+            for i in range(0, len(words), 2):
+                m1, m2 = words[i], words[i+1]
+                m2 ^= m1
+                m2 = (m2 >> rotation) | ((m2 << (64 - rotation)) & mask)
+                words[i] = (m1 - m2) & mask
+                words[i+1] = m2
+            # remove the subkey of the round
+            if j == Threefish.NB_ROUNDS - 1:
+                words = [word ^ key for word, key in zip(words, keys[-1])]
+            elif j % 4 == 0:
+                words = [word ^ key for word, key in zip(words, keys[j//4])]
+        return words
+
+    def encrypt_block(self, block):
+        """ Cipher one block (without padding), the words keep their 8 bytes
+
+            Args:
+                block -- bytes -- block_size bytes
+
+            return the ciphered block, as bytes
+        """
+        words = [int.from_bytes(block[i:i+self.W_LEN], 'big')
+                 for i in range(0, self.block_size, self.W_LEN)]
+        return b''.join([word.to_bytes(self.W_LEN, 'big') for word in self.encrypt_words(words)])
+
+    def ctr(self, data, nonce=None, counter=0):
+        """ Cipher (or decipher, it's the same operation) the data in
+            counter (CTR) mode: the data is xored with the ciphered blocks
+            nonce + counter, nonce + counter + 1, ...
+
+            No padding is needed, and a long stream can be processed by chunks
+            (of a multiple of block_size bytes) by increasing the counter
+            (see ctr_chunks).
+
+            Args:
+                data -- bytes -- the data to cipher or decipher
+                nonce -- bytes -- block_size bytes, never used twice with the
+                    same key (default: null bytes, for a key used once)
+                counter -- int -- the counter of the first block
+
+            return the ciphered (or deciphered) data, as bytes
+        """
+        return b''.join(self.ctr_chunks(data, nonce, counter))
+
+    def ctr_chunks(self, data, nonce=None, counter=0):
+        """ Cipher (or decipher) the data in CTR mode, chunk by chunk: the
+            keystream of CTR_CHUNK_BLOCKS blocks is generated and xored at
+            once, and only one chunk is in memory (see ctr)
+
+            yield the ciphered (or deciphered) chunks, as bytes
+        """
+        data = memoryview(data)
+        nonce = nonce or bytes(self.block_size)
+        nonce_words = [int.from_bytes(nonce[i:i+self.W_LEN], 'big')
+                       for i in range(0, self.block_size, self.W_LEN)]
+        chunk_size = Threefish.CTR_CHUNK_BLOCKS * self.block_size
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start:start + chunk_size]
+            first = counter + start // self.block_size
+            keystream = []
+            for i in range(first, first + (len(chunk) + self.block_size - 1) // self.block_size):
+                words = list(nonce_words)
+                words[-1] = (words[-1] + i) & Threefish.MASK
+                keystream += self.encrypt_words(words)
+            keystream = b''.join([word.to_bytes(self.W_LEN, 'big') for word in keystream])
+            # xor the chunk at once, as big integers
+            yield (int.from_bytes(chunk, 'big') ^ int.from_bytes(keystream[:len(chunk)], 'big')) \
+                .to_bytes(len(chunk), 'big')
+
     def cipher(self, plaintext, IV=None):
         """
             Cipher the given.
@@ -252,7 +377,7 @@ class Threefish(object):
             return the ciphered text as bytes
         """
         # add padding to the plaintext
-        plaintext = bytes(add_padding(plaintext, block_size=self.block_size*8))
+        plaintext = add_padding(plaintext, block_size=self.block_size*8)
         # cut the plaintext in blocks
         blocks = self.blockify(plaintext, self.block_size)
         # cut the IV in blocks
@@ -281,12 +406,9 @@ class Threefish(object):
             ciphered_blocks.append(block)
             blocks[i] = block
 
-        # join all the words
-        ciphertext = b''
-        for i in range(len(ciphered_blocks)):
-            for j in range(len(ciphered_blocks[i])):
-                ciphertext += ciphered_blocks[i][j]
-        return ciphertext
+        # join all the words (on 8 bytes, with their leading null bytes)
+        return b''.join([int.from_bytes(word, 'big').to_bytes(self.W_LEN, 'big')
+                         for block in ciphered_blocks for word in block])
 
     def decipher(self, ciphertext, IV=None):
         """
@@ -328,17 +450,13 @@ class Threefish(object):
             ciphered_blocks[i] = ciphered_block
             blocks[i] = ciphered_blocks[i]
 
-        # join all words
-        plaintext = b''
-        for i in range(len(blocks)):
-            for j in range(len(blocks[i])):
-                plaintext += blocks[i][j]
-
-        # remove padding
-        padding_size = int.from_bytes(plaintext[-2:], byteorder="big")
-        plaintext = plaintext[:len(plaintext) - padding_size]
+        # join all words (on 8 bytes, with their leading null bytes)
+        plaintext = b''.join([int.from_bytes(word, 'big').to_bytes(self.W_LEN, 'big')
+                              for block in blocks for word in block])
 
-        return plaintext
+        # check and remove padding
+        return bytes(strip_padding(plaintext, self.block_size, ISO_10126,
+                                   legacy_length_bytes(self.block_size*8)))
 """
 from _functions import (generate_random_unicode_string)
 
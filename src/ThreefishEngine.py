@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+""" This module contains the ThreefishEngine class
+"""
+
+from src._padding import strip_padding, ISO_10126, legacy_length_bytes
+from src._utils import add_padding
+from src._words import (numpy, DTYPES, words_from_bytes, words_to_bytes,
+                        add_words, sub_words, xor_words, rotl_words, rotr_words)
+from src.Threefish import Threefish
+
+# number of blocks processed at once (bounds the memory of the vectors)
+CHUNK_BLOCKS = 1 << 14
+
+class ThreefishEngine(object):
+    """ Cipher many blocks of a Threefish key at once
+
+        With NumPy, N blocks are a (N, words) uint64 array: each step of a
+        round (the mix of the words, the permutation, the subkey) is one
+        vector operation on all the blocks. Without NumPy, the blocks are
+        ciphered one by one (Threefish.encrypt_words).
+
+        The results are the same as Threefish: ECB and CBC (cipher,
+        decipher) and CTR (ctr). The CBC encryption is sequential (each
+        block depends on the previous one), so it always uses
+        Threefish.encrypt_words; the CBC decryption is vectorised.
+
+        Attributes:
+            threefish -- Threefish -- the key (key_schedule is called if needed)
+            vector -- boolean -- True if the blocks are ciphered with NumPy
+    """
+
+    def __init__(self, threefish, vector=None):
+        """
+            Args:
+                vector -- boolean or None -- use NumPy (default: if installed)
+        """
+        if threefish.rounds_keys_words is None:
+            threefish.key_schedule()
+        self.threefish = threefish
+        self.vector = numpy is not None if vector is None else vector
+        if self.vector:
+            if numpy is None:
+                raise ImportError("NumPy is not installed")
+            words = threefish.block_size // Threefish.W_LEN
+            self._keys = numpy.array(threefish.rounds_keys_words, dtype=DTYPES[64])
+            self._permutation = numpy.array(Threefish.P[:words])
+            self._inverse = numpy.argsort(self._permutation)
+
+    def _encrypt_vector(self, blocks):
+        """ Cipher the blocks (NumPy)
+
+            Args:
+                blocks -- numpy array -- (N, words) uint64
+
+            return the ciphered blocks
+        """
+        keys = self._keys
+        for j in range(Threefish.NB_ROUNDS):
+            # apply one of the subkey every 4 rounds, and the last one before the last round
+            if j == Threefish.NB_ROUNDS - 1:
+                blocks = xor_words(blocks, keys[-1])
+            elif j % 4 == 0:
+                blocks = xor_words(blocks, keys[j//4])
+            # mix the pairs of words of all the blocks, then permute
+            m1 = add_words(blocks[:, 0::2], blocks[:, 1::2], 64)
+            blocks[:, 1::2] = xor_words(m1, rotl_words(blocks[:, 1::2], Threefish.NB_ROTATIONS, 64))
+            blocks[:, 0::2] = m1
+            blocks = blocks[:, self._permutation]
+        return blocks
+
+    def _decrypt_vector(self, blocks):
+        """ Decipher the blocks (NumPy), the reverse of _encrypt_vector
+        """
+        keys = self._keys
+        for j in range(Threefish.NB_ROUNDS - 1, -1, -1):
+            blocks = blocks[:, self._inverse]
+            m2 = rotr_words(xor_words(blocks[:, 0::2], blocks[:, 1::2]), Threefish.NB_ROTATIONS, 64)
+            blocks[:, 0::2] = sub_words(blocks[:, 0::2], m2, 64)
+            blocks[:, 1::2] = m2
+            if j == Threefish.NB_ROUNDS - 1:
+                blocks = xor_words(blocks, keys[-1])
+            elif j % 4 == 0:
+                blocks = xor_words(blocks, keys[j//4])
+        return blocks
+
+    def _process(self, data, decrypt):
+        """ Cipher (or decipher) the blocks of the data, in ECB mode
+
+            Args:
+                data -- bytes-like -- its length is a multiple of the block size
+                decrypt -- boolean -- decipher if True
+
+            return bytes
+        """
+        block_size = self.threefish.block_size
+        if len(data) % block_size:
+            raise ValueError("The length of the data must be a multiple of the block size")
+        data = memoryview(data)
+        words = block_size // Threefish.W_LEN
+        result = []
+        if self.vector:
+            process = self._decrypt_vector if decrypt else self._encrypt_vector
+            for i in range(0, len(data), CHUNK_BLOCKS * block_size):
+                blocks = words_from_bytes(data[i:i + CHUNK_BLOCKS*block_size], 64, True)
+                result.append(words_to_bytes(process(blocks.reshape(-1, words)), 64))
+        else:
+            process = self.threefish.decrypt_words if decrypt else self.threefish.encrypt_words
+            for i in range(0, len(data), block_size):
+                block = words_from_bytes(data[i:i + block_size], 64).tolist()
+                result.append(words_to_bytes(process(block), 64))
+        return b''.join(result)
+
+    def encrypt_blocks(self, data):
+        """ Cipher the blocks of the data (ECB, without padding)
+
+            Args:
+                data -- bytes-like -- its length is a multiple of the block size
+
+            return the ciphered blocks, as bytes
+        """
+        return self._process(data, False)
+
+    def decrypt_blocks(self, data):
+        """ Decipher the blocks of the data (ECB, without padding)
+
+            Args:
+                data -- bytes-like -- its length is a multiple of the block size
+
+            return the deciphered blocks, as bytes
+        """
+        return self._process(data, True)
+
+    def ctr(self, data, nonce=None, counter=0):
+        """ Cipher (or decipher) the data in CTR mode (see Threefish.ctr)
+
+            return the ciphered (or deciphered) data, as bytes
+        """
+        return b''.join(self.ctr_chunks(data, nonce, counter))
+
+    def ctr_chunks(self, data, nonce=None, counter=0):
+        """ Cipher (or decipher) the data in CTR mode, CHUNK_BLOCKS blocks
+            at once (see Threefish.ctr_chunks)
+
+            yield the ciphered (or deciphered) chunks, as bytes
+        """
+        if not self.vector:
+            yield from self.threefish.ctr_chunks(data, nonce, counter)
+            return
+        data = memoryview(data)
+        block_size = self.threefish.block_size
+        words = block_size // Threefish.W_LEN
+        nonce = words_from_bytes(nonce or bytes(block_size), 64, True)
+        for i in range(0, len(data), CHUNK_BLOCKS * block_size):
+            chunk = numpy.frombuffer(data[i:i + CHUNK_BLOCKS*block_size], dtype='uint8')
+            count = (len(chunk) + block_size - 1) // block_size
+            # the blocks nonce + counter (the last word of the nonce is the counter)
+            blocks = numpy.tile(nonce, (count, 1))
+            # any counter, modulo 2^64 (as Threefish.ctr): the uint64 sums wrap around
+            first = numpy.uint64((counter + i // block_size) & Threefish.MASK)
+            blocks[:, words - 1] += numpy.arange(count, dtype=DTYPES[64]) + first
+            keystream = numpy.frombuffer(words_to_bytes(self._encrypt_vector(blocks), 64),
+                                         dtype='uint8')
+            yield (chunk ^ keystream[:len(chunk)]).tobytes()
+
+    def cipher(self, plaintext, IV=None):
+        """ Cipher the plaintext, with padding (see Threefish.cipher)
+
+            Args:
+                plaintext -- bytes -- the text to cipher
+                IV -- bytes -- the initialization vector (CBC mode), or None (ECB mode)
+
+            return the ciphered text as bytes
+        """
+        block_size = self.threefish.block_size
+        plaintext = add_padding(plaintext, block_size=block_size*8)
+        if not IV:
+            return self.encrypt_blocks(plaintext)
+        # CBC: each block is xored with the previous ciphered block, one
+        # block at a time (too small for the vectors: always the words of
+        # Threefish.encrypt_words)
+        plaintext = words_from_bytes(plaintext, 64)
+        words = block_size // Threefish.W_LEN
+        previous = words_from_bytes(IV[:block_size], 64)
+        result = []
+        for i in range(0, len(plaintext), words):
+            previous = self.threefish.encrypt_words(
+                [x ^ y for x, y in zip(plaintext[i:i + words], previous)])
+            result += previous
+        return words_to_bytes(result, 64)
+
+    def decipher(self, ciphertext, IV=None):
+        """ Decipher the text, and remove the padding (see Threefish.decipher)
+
+            Args:
+                ciphertext -- bytes -- the text to decipher
+                IV -- bytes -- the initialization vector (CBC mode), or None (ECB mode)
+
+            return the deciphered text
+        """
+        block_size = self.threefish.block_size
+        plaintext = self.decrypt_blocks(ciphertext)
+        if IV:
+            # CBC: xor each block with the previous ciphered block
+            previous = IV[:block_size] + ciphertext[:len(ciphertext) - block_size]
+            plaintext = (int.from_bytes(plaintext, 'big') ^ int.from_bytes(previous, 'big')) \
+                .to_bytes(len(plaintext), 'big')
+        return bytes(strip_padding(plaintext, block_size, ISO_10126,
+                                   legacy_length_bytes(block_size*8)))
@@ -4,7 +4,7 @@
 """
 
 import sys
-import src._utils as utils
+from src._bits import BitString
 
 class Vernam(object):
     """ Vernam cipher
@@ -23,14 +23,11 @@ class Vernam(object):
             sys.exit("The key is smaller than the text")
 
         # convert both plaintext and key in binary
-        binary_text = utils.utf8_to_binary(plaintext)
-        binary_key = utils.utf8_to_binary(key)
+        binary_text = BitString.from_text(plaintext)
+        binary_key = BitString.from_text(key)[:len(binary_text)]
 
         # ciphertext[i] = plaintext[i] xor key[i]
-        ciphertext = ''.join([str(int(binary_text[i])^int(binary_key[i])) \
-                              for i in range(len(binary_text))])
-
-        return utils.binary_to_utf8(ciphertext)
+        return (binary_text ^ binary_key).to_text()
 
     @staticmethod
     def cipher(plaintext, key):
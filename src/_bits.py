@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+""" This module contains the BitString class, a compact sequence of bits
+"""
+
+class BitString(object):
+    """ A sequence of bits, stored in an int (the first bit is the most
+        significant bit of the int) instead of a string of '0' and '1'
+
+        Attributes:
+            value -- int -- the bits
+            length -- int -- the number of bits (leading 0 included)
+    """
+
+    __slots__ = ('value', 'length')
+
+    def __init__(self, value=0, length=0):
+        if value < 0 or value.bit_length() > length:
+            raise ValueError("%d doesn't fit in %d bits" % (value, length))
+        self.value = value
+        self.length = length
+
+    @staticmethod
+    def from_string(bits):
+        """ Build a BitString from a string of '0' and '1'
+
+            Args:
+                bits -- string -- the bits
+
+            return a BitString
+        """
+        return BitString(int(bits, 2) if bits else 0, len(bits))
+
+    @staticmethod
+    def from_bytes(data):
+        """ Build a BitString from bytes (8 bits per byte)
+
+            Args:
+                data -- bytes-like
+
+            return a BitString
+        """
+        return BitString(int.from_bytes(data, byteorder='big'), 8 * len(data))
+
+    @staticmethod
+    def from_text(text):
+        """ Build a BitString from a text, 8 bits per character
+
+            Args:
+                text -- string -- characters with a code point lower than 256
+
+            return a BitString
+        """
+        try:
+            return BitString.from_bytes(text.encode('latin-1'))
+        except UnicodeEncodeError:
+            raise ValueError("The text contains characters above U+00FF")
+
+    def to_bytes(self):
+        """ return the bits as bytes (the length must be a multiple of 8)
+        """
+        if self.length % 8:
+            raise ValueError("The length must be a multiple of 8")
+        return self.value.to_bytes(self.length // 8, byteorder='big')
+
+    def to_text(self):
+        """ return the text of the bits, 8 bits per character (see from_text)
+        """
+        return self.to_bytes().decode('latin-1')
+
+    def __str__(self):
+        return format(self.value, '0%db' % self.length) if self.length else ''
+
+    def __repr__(self):
+        return "BitString('%s')" % self
+
+    def __int__(self):
+        return self.value
+
+    def __len__(self):
+        return self.length
+
+    def __eq__(self, other):
+        return isinstance(other, BitString) and \
+            (self.value, self.length) == (other.value, other.length)
+
+    def __hash__(self):
+        return hash((self.value, self.length))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step != 1:
+                return BitString.from_string(str(self)[index])
+            stop = max(start, stop)
+            return BitString((self.value >> (self.length - stop)) & ((1 << (stop - start)) - 1),
+                             stop - start)
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("BitString index out of range")
+        return (self.value >> (self.length - 1 - index)) & 1
+
+    def __iter__(self):
+        for i in range(self.length - 1, -1, -1):
+            yield (self.value >> i) & 1
+
+    def __xor__(self, other):
+        if self.length != other.length:
+            raise ValueError("The BitStrings must have the same length")
+        return BitString(self.value ^ other.value, self.length)
+
+    def __add__(self, other):
+        """ Concatenation
+        """
+        return BitString((self.value << other.length) | other.value, self.length + other.length)
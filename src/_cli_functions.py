@@ -7,7 +7,9 @@
 import curses
 from src.SHA1 import SHA1
 from src.CramerShoup import CramerShoup
+from src.CramerShoupCiphertext import CramerShoupCiphertext
 from src.Threefish import Threefish
+from src.GroupStore import MODP_PRIMES
 from src._utils import (read_file)
 from src._functions import (generate_random_unicode_string)
 from src._cli_utils import (SCREEN, wait_to_continu, print_option_header,
@@ -58,13 +60,20 @@ def cramer_shoup_generate_keys():
     print_info("Both public and private keys will be generated.\n")
     print_info("They will be put in the 'outputs' directory:\n")
     print_info("- 'cramer-shoup'        => the private key\n")
-    print_info("- 'cramer-shoup.pub'    => the public key\n")
+    print_info("- 'cramer-shoup.pub'    => the public key\n\n")
 
-    wait_to_continu()
+    # ask the group
+    print_info("The 'stored' group is generated once (it can take a while), saved in\n")
+    print_info("'outputs/cramer_shoup.groups' and reused for the next keys.\n")
+    group_name = ask_question(
+        question="Which group do you want to use ?",
+        answers=['stored'] + sorted(MODP_PRIMES),
+        default_answer='stored'
+    )
 
     SCREEN.addstr("generating keys...\n\n")
 
-    CramerShoup.key_generation()
+    CramerShoup.key_generation(None if group_name == 'stored' else group_name)
 
     print_result("keys have been generated !\n")
 
@@ -97,11 +106,15 @@ def cramer_shoup_decipher():
     wait_to_continu()
     # cipher
     SCREEN.addstr("\nReading the file...\n\n")
-    content = read_file("cramer_shoup.cipher", directory="outputs")
+    # read bytes: the ciphertext can be in the binary or in the text format
+    content = read_file("cramer_shoup.cipher", directory="outputs", read_bytes=True)
     SCREEN.addstr("Deciphering the text...\n\n")
-    deciphertext = CramerShoup.decipher(content)
-
-    output_result(deciphertext, "cramer_shoup.decipher")
+    if CramerShoupCiphertext.is_hybrid(content):
+        # hybrid mode: the data can be binary, write it as is
+        output_in_file(CramerShoup.decipher_hybrid(content), "cramer_shoup.decipher",
+                       write_bytes=True)
+    else:
+        output_result(CramerShoup.decipher(content), "cramer_shoup.decipher")
     # wait before redirect to main menu
     wait_to_continu(next_step=show_main_menu)
 
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+""" This module contains the file functions: memory-mapped reads, atomic
+    writes and copies
+"""
+
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+# size of the chunks of the copies without os.sendfile
+COPY_CHUNK_SIZE = 1 << 20
+
+def resolve_path(filename, directory=None):
+    """ Get the path of a file
+
+        Args:
+            filename -- string -- the file, an absolute path is kept as is
+            directory -- string or None -- the directory of a relative
+                filename (relative to the current directory if None)
+
+        return the absolute path
+    """
+    if directory:
+        filename = os.path.join(directory, filename)
+    return os.path.abspath(filename)
+
+@contextmanager
+def mapped(path):
+    """ Memory-map a file (read-only): the content is read by the system
+        when it's accessed, and isn't copied in the memory of the process
+
+        Args:
+            path -- string -- the file
+
+        Example:
+            with mapped('assets/lena.pgm') as data:
+                header = bytes(data[:15])
+
+        yield a memoryview of the content of the file (valid in the block only)
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # an empty file can't be mapped
+            yield memoryview(b'')
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            view = memoryview(m)
+            try:
+                yield view
+            finally:
+                view.release()
+
+def _read_umask():
+    """ Read the umask of the process without changing it (Linux:
+        /proc/self/status)
+
+        return an int, or None if it can't be read
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    return None
+
+def _import_umask():
+    """ The umask when the module is imported: os.umask can only read it by
+        setting it, which isn't safe once other threads create files
+    """
+    umask = _read_umask()
+    if umask is None:
+        umask = os.umask(0o077)
+        os.umask(umask)
+    return umask
+
+# the umask of the process, if it can't be read later (see _file_mode)
+UMASK = _import_umask()
+
+def _file_mode(path):
+    """ The permissions of a file written at path: the permissions of the
+        existing file, or 0o666 without the bits of the umask
+
+        Args:
+            path -- string -- the file
+
+        return an int
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = _read_umask()
+        return 0o666 & ~(UMASK if umask is None else umask)
+
+@contextmanager
+def atomic_open(path, binary=True):
+    """ Open a temporary file, renamed to path when the block ends without
+        error: the file is never seen partially written (and an existing
+        file is kept if there is an error)
+
+        Args:
+            path -- string -- the file to write
+            binary -- boolean -- open the file in binary mode
+
+        yield the file, opened for writing
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        # mkstemp creates the file for the owner only: give it the mode of
+        # the file it replaces, or the mode of a new file (open)
+        os.fchmod(fd, _file_mode(path))
+        with os.fdopen(fd, 'wb' if binary else 'w') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+def atomic_write(path, data):
+    """ Write the data in a file, atomically (see atomic_open)
+
+        Args:
+            path -- string -- the file to write
+            data -- string, bytes-like, or iterable of bytes-like -- the content
+                (an iterable is written chunk by chunk)
+    """
+    binary = not isinstance(data, str)
+    with atomic_open(path, binary) as f:
+        if isinstance(data, (str, bytes, bytearray, memoryview)):
+            f.write(data)
+        else:
+            for chunk in data:
+                f.write(chunk)
+
+def copy_file(source, destination):
+    """ Copy a file, atomically, with os.sendfile if available (the data
+        doesn't go through the process)
+
+        Args:
+            source -- string -- the file to copy
+            destination -- string -- the new file
+    """
+    with open(source, 'rb') as f_in, atomic_open(destination) as f_out:
+        size = os.fstat(f_in.fileno()).st_size
+        if hasattr(os, 'sendfile'):
+            offset = 0
+            try:
+                while offset < size:
+                    sent = os.sendfile(f_out.fileno(), f_in.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except OSError:
+                # not supported for these files: copy the rest with read/write
+                f_in.seek(offset)
+                f_out.seek(offset)
+        shutil.copyfileobj(f_in, f_out, COPY_CHUNK_SIZE)
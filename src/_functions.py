@@ -3,12 +3,20 @@
 """ This module contains many math and cipher functions
 """
 
-import sys
-import string
 import itertools
-from math import sqrt, floor
+from array import array
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
+from math import isqrt
 from random import randint, getrandbits, randrange
 
+# number of odd numbers sieved at once by iter_primes
+SEGMENT_SIZE = 1 << 18
+
+# table of primes consulted by is_prime, random_prime and prime_decomposition
+# (see use_prime_table)
+_PRIME_TABLE = None
+
 def rotl(n, rotations=1, w=32):
     """ binary rotation (left)
 
@@ -47,41 +55,93 @@ def bytearray_xor(b1, b2):
         result.append(x ^ y)
     return result
 
-def find_group_generators(n):
-    """ Find the generators of a cyclic group of order n
+def _group_order_factors(n):
+    """ Check that the multiplicative group modulo n is cyclic, and give
+        what is needed to test if an element generates it
 
-        Start by finding all coprimes of n.
-        Then, for each i in range[1, n], test if it generates all coprimes of n
+        The group is cyclic if n is 2, 4, p^k or 2p^k (p odd prime)
 
         Args:
-            n -- int -- cyclic group's order
+            n -- int
 
-        return the list of generators
+        return None if the group is not cyclic, else a tuple
+            (the order phi(n), the prime factors of phi(n), the prime factors of n)
+    """
+    if n < 2:
+        return None
+    factors = factorize(n)
+    odd_primes = [p for p in factors if p != 2]
+    if n not in (2, 4) and (len(odd_primes) != 1 or factors.get(2, 0) > 1):
+        return None
+    order = phi(n)
+    return order, _prime_factors(order), tuple(factors)
+
+
+def iter_group_generators(n):
+    """ Generate lazily the generators of the multiplicative group modulo n
+
+        g generates the group if g is coprime with n, and if
+        g^(phi(n)/q) != 1 (mod n) for each prime factor q of phi(n)
+
+        Args:
+            n -- int -- the modulo
+
+        yield the generators, in ascending order
     """
+    group = _group_order_factors(n)
+    if group is None:
+        return
+    order, order_primes, primes = group
+    exponents = [order // q for q in order_primes]
+    for g in range(1, n):
+        if all(g % p for p in primes) and all(pow(g, e, n) != 1 for e in exponents):
+            yield g
 
-    coprimes = []
 
-    # find coprimes of n
-    for k in range(1, n):
-        if are_coprime(k, n):
-            coprimes.append(k)
+def first_generator(n):
+    """ Find the lowest generator of the multiplicative group modulo n
 
+        Args:
+            n -- int -- the modulo
 
-    generators = []
+        return the generator, or None if the group is not cyclic
+    """
+    return next(iter_group_generators(n), None)
 
-    # find generators
-    for i in range(1, n):
-        temp = []
-        for j in range(1, n):
-            temp.append(i**j % n)
 
-        if len(set(temp)) == len(coprimes):
-            generators.append(i)
+def find_group_generators(n):
+    """ Find the generators of the multiplicative group modulo n
+
+        Start by finding the first generator g, then the others are the
+        g^k where k is coprime with the order of the group
+
+        Args:
+            n -- int -- the modulo
+
+        return the list of generators
+    """
+    g = first_generator(n)
+    if g is None:
+        return []
+    order, order_primes, _ = _group_order_factors(n)
+
+    # coprimes[k] is 1 if k is coprime with the order
+    coprimes = bytearray([1]) * (order + 1)
+    for q in order_primes:
+        coprimes[::q] = bytes(len(range(0, order + 1, q)))
+
+    is_generator = bytearray(n)
+    x = 1
+    for k in range(1, order + 1):
+        x = x * g % n
+        if coprimes[k]:
+            is_generator[x] = 1
+
+    return list(itertools.compress(range(n), is_generator))
 
-    return generators
 
 def gcd(a, b):
-    """ Calculate the gcd of a and b recursively, using euclidean_algorithm
+    """ Calculate the gcd of a and b, using euclidean_algorithm
 
 		Args:
 			a -- int
@@ -106,62 +166,49 @@ def lcm(a, b):
 
 def bezout(a, b):
     """ Calculate the Bézout's identity of 'a' and 'b'
-	"""
-    result, x, y = euclidean_algorithm(a, b, extended=True)
 
-	# if x and y are reversed, fix it
-    if (a*x + b*y) != result:
-        x, y = y, x
-
-	# print Bezout identity
-	# print("BEZOUT(%d, %d) : %d * %d + %d * %d = %d " % (a, b, x, a, y, b, result))
+        Args:
+            a -- int
+            b -- int
 
-    return result, x, y
+        return the gcd, x and y, where a*x + b*y = gcd
+	"""
+    return euclidean_algorithm(a, b, extended=True)
 
 
-def euclidean_algorithm(a, b, x=0, prev_x=1, y=1, prev_y=0, extended=False, step=1):
-    """ Run the euclidean algorithm to calculate the gcd of a and b
+def euclidean_algorithm(a, b, extended=False):
+    """ Run the euclidean algorithm (iteratively) to calculate the gcd of a and b
 		If extended is True, calculate x and y for the Bézout's identity
 
-		Step is usefull to know which factor is negative => if even, it's 'y' else it's 'x'
+        The invariants a*x + b*y = r are kept for both remainders at each
+        step, so x and y are right by construction, whatever the order
+        and the size of a and b.
 
-        a -- int
-        b -- int
-        x -- int -- usefull for Bezout identity
-        prev_x -- int -- previous value of x
-        y -- int -- usefull for Bezout identity
-        prev_y -- int -- previous value of y
-        extended -- boolean -- if true, keep track of x and y for Bezout identity
-        step -- int -- algorithm's current step
+        Args:
+            a -- int
+            b -- int
+            extended -- boolean -- if true, keep track of x and y for Bezout identity
 
-        return the gcd, x and y
+        return the gcd, or the gcd, x and y if extended
 	"""
-	# 'a' has to be greater than 'b'
-    if b > a:
-        a, b = b, a
-
-	# calculate the remainder of a/b
-    remainder = a % b
-
-	# if remainder is 0, stop here : gcd found
-    if remainder == 0:
-        if not extended:
-            return b
-        else:
-			# use the step parameter to calculate which factor is negative
-            x *= (-1)**step
-            y *= (-1)**(step+1)
-            return b, x, y
-
-	# we continue
-    if extended:
-		# if extended, update x and y and increment the step
-        step += 1
-        quotient = a // b
-        prev_x, prev_y, x, y = x, y, quotient*x + prev_x, quotient*y + prev_y
-        return euclidean_algorithm(b, remainder, x, prev_x, y, prev_y, extended=True, step=step)
-    else:
-        return euclidean_algorithm(b, remainder, step=step)
+    if not extended:
+        while b:
+            a, b = b, a % b
+        return abs(a)
+
+    prev_r, r = a, b
+    prev_x, x = 1, 0
+    prev_y, y = 0, 1
+    while r:
+        quotient = prev_r // r
+        prev_r, r = r, prev_r - quotient*r
+        prev_x, x = x, prev_x - quotient*x
+        prev_y, y = y, prev_y - quotient*y
+
+    # the gcd is positive
+    if prev_r < 0:
+        return -prev_r, -prev_x, -prev_y
+    return prev_r, prev_x, prev_y
 
 def are_coprime(a, b):
     """ Two integers are coprime if their gcd is 1
@@ -172,24 +219,44 @@ def are_coprime(a, b):
 
         return true if they are coprime
 	"""
-    return gcd(a, b) is 1
+    return gcd(a, b) == 1
 
 
-def is_prime(n):
+def is_prime(n, k=64):
     """ Check if n is prime
 
+        Start by dividing n by the small primes (SMALL_PRIMES), then run
+        Miller-Rabin with the bases known to give a deterministic answer
+        (DETERMINISTIC_BASES) if n is lower than 3.3 * 10^24, or with k
+        random bases if n is bigger
+
         Args:
             n -- int
+            k -- int -- the number of Miller-Rabin rounds for n >= 3.3 * 10^24
 
         return true if it's prime
 	"""
-    if n == 1:
+    if n < 2:
         return False
 
-    for i in range(2, int(sqrt(n))):
-        if n % i == 0:
-            return False
-    return True
+    if _PRIME_TABLE is not None and n <= _PRIME_TABLE.limit:
+        return n in _PRIME_TABLE
+
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    # no factor lower than sqrt(n)
+    if n < SMALL_PRIMES[-1]**2:
+        return True
+
+    for bound, bases in DETERMINISTIC_BASES:
+        if n < bound:
+            break
+    else:
+        bases = [randrange(2, n - 1) for _ in range(k)]
+
+    s, r = _miller_rabin_decomposition(n)
+    return not any(_miller_rabin_witness(n, a, s, r) for a in bases)
 
 
 def random_prime(start = 0, end = 500):
@@ -201,11 +268,10 @@ def random_prime(start = 0, end = 500):
 
         return a prime number randomly picked
     """
-    primes = sieve_of_eratosthenes(end)
-    i = 0
-    while i < len(primes) and primes[i] < start:
-        i += 1
-    primes = primes[i:]
+    if _PRIME_TABLE is not None and end <= _PRIME_TABLE.limit:
+        primes = _PRIME_TABLE.primes_between(start, end)
+    else:
+        primes = list(iter_primes(end, start))
 
     if len(primes) == 0:
         return 2
@@ -213,19 +279,160 @@ def random_prime(start = 0, end = 500):
     return primes[randint(0, len(primes)-1)]
 
 def prime_decomposition(n):
-    """ Find the prime numbers pn (recursively) so that
+    """ Find the prime numbers pn so that
 		n = p1^a1 * p2^a2 * ... * pn^an
 
         Args:
             n -- int -- the number of decompose
-            primes -- list -- the primes factors
+
+        yield the prime factors, from the lowest to the biggest
 	"""
-    for i in itertools.chain([2], itertools.count(3, 2)):
-        if n <= 1:
+    for prime, exponent in factorize(n).items():
+        for _ in range(exponent):
+            yield prime
+
+
+def _pollard_brent(n):
+    """ Find a factor of n with the Brent's variant of Pollard's rho algorithm
+        The gcd is calculated once for a batch of 128 steps: the differences
+        are multiplied together (mod n), and the batch is replayed step by
+        step only if the gcd of the batch is n
+
+        Args:
+            n -- int -- an odd composite number
+
+        return a factor of n (different from 1 and n)
+    """
+    batch_size = 128
+    while True:
+        # x -> x^2 + c (mod n), from a random point
+        y, c = randrange(1, n), randrange(1, n)
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y*y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(batch_size, r - k)):
+                    y = (y*y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += batch_size
+            r *= 2
+        if g == n:
+            # the batch contains all the factors: replay it step by step
+            g = 1
+            while g == 1:
+                ys = (ys*ys + c) % n
+                g = gcd(abs(x - ys), n)
+        # if g == n again, try another random function
+        if g != n:
+            return g
+
+
+def _integer_root(n, k):
+    """ Integer k-th root (Newton's method), isqrt for k = 2
+
+        Args:
+            n -- int -- positive integer
+            k -- int -- >= 2
+
+        return the biggest int r so that r^k <= n
+    """
+    if k == 2:
+        return isqrt(n)
+    # start above the root, the sequence decreases to the root
+    x = 1 << ((n.bit_length() + k - 1) // k)
+    while True:
+        y = ((k - 1) * x + n // x**(k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def _perfect_power(n):
+    """ Check if n is a perfect power: Pollard's rho needs about sqrt(p)
+        steps to split p^k, when a root is immediate
+
+        Args:
+            n -- int -- without prime factor lower than 1000 (see factorize)
+
+        return (root, k) with n = root^k and k prime, or None
+    """
+    # the factors of n are bigger than 2^9: k <= log2(n) / 9
+    for k in SMALL_PRIMES:
+        if 9 * k > n.bit_length():
+            break
+        root = _integer_root(n, k)
+        if root**k == n:
+            return root, k
+    return None
+
+
+def factorize(n):
+    """ Decompose n in prime factors:
+        - trial division by the small primes (SMALL_PRIMES), or by the primes
+          of the prime table if there is one (see use_prime_table)
+        - Pollard-Brent rho on the cofactor, until every factor is prime
+          (is_prime), after taking the root of the perfect powers
+
+        Args:
+            n -- int -- positive integer
+
+        return a dict {prime: exponent}, sorted by prime
+    """
+    if n < 1:
+        raise ValueError("Only positive integers can be decomposed")
+
+    # all the primes lower or equals to bound are tried
+    if _PRIME_TABLE is not None and _PRIME_TABLE.limit > SMALL_PRIMES[-1]:
+        bound = min(isqrt(n), _PRIME_TABLE.limit)
+        primes = _PRIME_TABLE.primes_between(2, bound)
+    else:
+        bound, primes = SMALL_PRIMES[-1], SMALL_PRIMES
+
+    factors = {}
+    for p in primes:
+        if p*p > n:
             break
-        while n % i == 0:
-            n //= i
-            yield i
+        while n % p == 0:
+            n //= p
+            factors[p] = factors.get(p, 0) + 1
+
+    to_factorize = [n] if n > 1 else []
+    while to_factorize:
+        n = to_factorize.pop()
+        # no prime factor lower or equals to bound: n is prime if n < bound^2
+        if n < bound**2 or is_prime(n):
+            factors[n] = factors.get(n, 0) + 1
+            continue
+        power = _perfect_power(n)
+        if power:
+            root, k = power
+            to_factorize += [root] * k
+        else:
+            d = _pollard_brent(n)
+            to_factorize += [d, n // d]
+
+    return dict(sorted(factors.items()))
+
+
+def factorize_many(numbers, workers=1):
+    """ Decompose many numbers in prime factors
+
+        Args:
+            numbers -- list of int
+            workers -- int -- the number of processes that factorize the numbers
+
+        return the list of the decompositions (see factorize), in the same order
+    """
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(factorize, numbers))
+    return [factorize(n) for n in numbers]
+
 
 def exponentiation_by_squaring_recursive(n, exp):
     """ Fast way to do exponentiation, recursively
@@ -267,6 +474,124 @@ def exponentiation_by_squaring(n, exp):
     return n * y
 
 
+def _window_size(bits):
+    """ Best window size for a sliding window exponentiation
+
+        Args:
+            bits -- int -- the number of bits of the exponent
+
+        return the window size
+    """
+    for window, max_bits in enumerate((7, 36, 140, 450, 1303, 3529), start=1):
+        if bits <= max_bits:
+            return window
+    return 7
+
+
+def modexp(n, exp, mod, window=None):
+    """ Modular exponentiation with a sliding window: the odd powers
+        n^1, n^3, ..., n^(2^window - 1) are precalculated, then the exponent
+        is read from left to right, one window (starting and ending by a 1)
+        at a time, so there is one multiplication per window instead of one
+        per '1' bit
+
+        Args:
+            n -- int
+            exp -- int -- the exponent (if negative, n must be invertible)
+            mod -- int
+            window -- int -- the maximum window size (default: depends on exp)
+
+        return n**exp % mod
+    """
+    if mod == 1:
+        return 0
+    if exp < 0:
+        n, exp = inverse(n, mod), -exp
+    n %= mod
+    if exp == 0:
+        return 1
+
+    bits = bin(exp)[2:]
+    window = window or _window_size(len(bits))
+    # precalculate the odd powers
+    n_square = n * n % mod
+    odd_powers = [n]
+    for _ in range((1 << (window - 1)) - 1):
+        odd_powers.append(odd_powers[-1] * n_square % mod)
+
+    result = 1
+    i = 0
+    while i < len(bits):
+        if bits[i] == '0':
+            result = result * result % mod
+            i += 1
+        else:
+            # longest window starting at i and ending with a '1'
+            j = min(i + window, len(bits))
+            while bits[j - 1] == '0':
+                j -= 1
+            for _ in range(j - i):
+                result = result * result % mod
+            result = result * odd_powers[int(bits[i:j], 2) >> 1] % mod
+            i = j
+
+    return result
+
+
+def multi_exp(bases, exponents, mod, window=None):
+    """ Simultaneous exponentiation (Straus / Shamir's trick):
+        b1^e1 * b2^e2 * ... * bk^ek mod 'mod', with a single chain of squarings
+
+        The products of the powers b1^d1 * ... * bk^dk (di < 2^window) are
+        precalculated; then the exponents are read together, window bits at
+        a time: 'window' squarings and one multiplication per step.
+
+        Args:
+            bases -- list of int
+            exponents -- list of int -- non-negative, same length as bases
+            mod -- int
+            window -- int -- the number of bits read per step
+                (default: 3 for 2 bases, 1 for more)
+
+        return the product of the bi^ei mod 'mod'
+    """
+    if not bases:
+        # the empty product
+        return 1 % mod
+    if mod == 1:
+        return 0
+    window = window or (3 if len(bases) <= 2 else 1)
+    digit_values = 1 << window
+
+    # table[d1 + d2 * 2^window + ...] = b1^d1 * b2^d2 * ...
+    table = [1]
+    for base in bases:
+        powers = [1]
+        for _ in range(digit_values - 1):
+            powers.append(powers[-1] * base % mod)
+        table = [t * power % mod for power in powers for t in table]
+
+    # the digits of each exponent, from the most significant
+    length = max(e.bit_length() for e in exponents)
+    length += -length % window
+    digits = []
+    for e in exponents:
+        bits = bin(e)[2:].zfill(length)
+        digits.append([int(bits[i:i+window], 2) for i in range(0, length, window)])
+
+    result = 1
+    for step_digits in zip(*digits):
+        for _ in range(window):
+            result = result * result % mod
+        index = 0
+        for i, digit in enumerate(step_digits):
+            index |= digit << (window * i)
+        if index:
+            result = result * table[index] % mod
+
+    return result
+
+
 def inverse(n, mod):
     """ Calculate the inverse of 'n' modulo 'mod' using bezout identity
 
@@ -274,10 +599,56 @@ def inverse(n, mod):
             n -- int
             mod -- int
 
-        return the inverse modulos mod of n
+        return the inverse modulos mod of n, in range [0, mod-1]
 	"""
-    _, inv, _ = bezout(n, mod)
-    return inv
+    result, inv, _ = bezout(n % mod, mod)
+    if result != 1:
+        raise ValueError("%d is not invertible modulo %d" % (n, mod))
+    return inv % mod
+
+
+def batch_inverse(values, mod):
+    """ Calculate the inverses of many values modulo 'mod' at once,
+        using Montgomery's trick: only one inverse is calculated (the inverse
+        of the product of all the values), the others are deduced from it
+        with 3 multiplications per value
+
+        Args:
+            values -- list of int
+            mod -- int
+
+        return the list of the inverses, in range [0, mod-1]
+            (None for the values that are not invertible modulo mod)
+    """
+    values = [v % mod for v in values]
+    # only keep the invertible values, if some of them are not
+    indexes = range(len(values))
+    product = 1
+    for v in values:
+        product = product * v % mod
+    if gcd(product, mod) != 1:
+        indexes = [i for i in indexes if gcd(values[i], mod) == 1]
+
+    inverses = [None] * len(values)
+    if not indexes:
+        return inverses
+
+    # prefix products: products[k] = v0 * v1 * ... * vk
+    products = []
+    product = 1
+    for i in indexes:
+        product = product * values[i] % mod
+        products.append(product)
+
+    inv = inverse(product, mod)
+    # walk back: inv is the inverse of products[k]
+    for k in range(len(indexes)-1, 0, -1):
+        i = indexes[k]
+        inverses[i] = inv * products[k-1] % mod
+        inv = inv * values[i] % mod
+    inverses[indexes[0]] = inv
+
+    return inverses
 
 
 def chinese_remainder_theorem(values, modulos):
@@ -303,30 +674,72 @@ def chinese_remainder_theorem(values, modulos):
         Mi = M // modulo
         x += values[i] * Mi * inverse(Mi, modulo)
 
-    return x
+    return x % M
+
+
+@lru_cache(maxsize=4096)
+def _prime_factors(n):
+    """ Distinct prime factors of n, memoised (the least recently used
+        decompositions are forgotten)
+
+        Args:
+            n -- int
+
+        return a tuple of the prime factors
+    """
+    return tuple(factorize(n))
 
 
 def phi(n):
     """ Euler's totient function. Count the number of integers that
 		are relative primes with n in range [1, n-1]
 
+        phi(n) = n * (1 - 1/p1) * ... * (1 - 1/pn), calculated with integers only
+
         Args:
             n -- int
 
         return the number of relative primes
 	"""
+    result = n
+    for prime in _prime_factors(n):
+        result = result // prime * (prime - 1)
+    return result
 
-	# if n is prime, all numbers < n are prime with it
-    if is_prime(n):
-        return n-1
 
-	# get the integers that are part of the prime decomposition of n
-    primes = list(set(prime_decomposition(n)))
+def phi_range(n):
+    """ Euler's totient function for all the integers in range [0, n],
+        with a linear sieve: each composite is reached once, from its
+        lowest prime factor p and i = composite / p
+            phi(i*p) = phi(i) * p        if p divides i
+            phi(i*p) = phi(i) * (p-1)    else
 
-    result = n
-    for prime in primes:
-        result *= (1 - (1 /prime))
-    return int(result)
+        Args:
+            n -- int -- lower than 2**32
+
+        return an array('I'), where the value at index i is phi(i)
+    """
+    if n >= 2**32:
+        raise ValueError("n must be lower than 2**32")
+    phis = array('I', bytes(4 * (n + 1)))
+    if n >= 1:
+        phis[1] = 1
+    primes = []
+    for i in range(2, n + 1):
+        phi_i = phis[i]
+        if phi_i == 0:
+            # i hasn't been reached: it's prime
+            phi_i = phis[i] = i - 1
+            primes.append(i)
+        for p in primes:
+            composite = i * p
+            if composite > n:
+                break
+            if i % p == 0:
+                phis[composite] = phi_i * p
+                break
+            phis[composite] = phi_i * (p - 1)
+    return phis
 
 
 def sieve_of_eratosthenes(n):
@@ -337,22 +750,101 @@ def sieve_of_eratosthenes(n):
 
         return list of primes
 	"""
-    primes = []
-    numbers = range(2, n+1)
+    return list(iter_primes(n))
+
+
+def _small_odd_primes(n):
+    """ Sieve of Eratosthenes on the odd numbers lower or equals to 'n'
+        (index i of the sieve <=> number 2*i + 1)
 
-	# continu while there are numbers
-    while len(numbers):
-		# the first is a prime
-        primes.append(numbers[0])
+        Args:
+            n -- int
+
+        return the list of the odd primes
+    """
+    size = (n + 1) // 2
+    sieve = bytearray([1]) * size
+    if size:
+        # 1 is not prime
+        sieve[0] = 0
+    i = 1
+    while (2*i + 1)**2 <= n:
+        if sieve[i]:
+            p = 2*i + 1
+            # cross out p*p, p*p + 2p, ...
+            sieve[p*p//2::p] = bytes(len(range(p*p//2, size, p)))
+        i += 1
+    return list(itertools.compress(range(1, n + 1, 2), sieve))
+
+
+# primes lower than 1000, used by is_prime before Miller-Rabin
+SMALL_PRIMES = (2,) + tuple(_small_odd_primes(1000))
 
-		# remove all the multiple of the first number
-        next_numbers = []
-        for i in range(1, len(numbers)):
-            if numbers[i] % numbers[0] > 0:
-                next_numbers.append(numbers[i])
-        numbers = next_numbers
+# odd primes used to sieve the candidates of generate_(safe_)prime_number
+SIEVE_PRIMES = tuple(_small_odd_primes(1 << 16))
+# number of candidates sieved at once
+PRIME_INTERVAL = 1 << 12
+SAFE_PRIME_INTERVAL = 1 << 16
 
-    return primes
+# (bound, bases): Miller-Rabin with these bases is deterministic for n < bound
+DETERMINISTIC_BASES = (
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (3215031751, (2, 3, 5, 7)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+)
+
+
+def iter_primes(end, start=2):
+    """ Generate the primes in range [start, end], with a segmented sieve of
+        Eratosthenes: the odd numbers are sieved by segments of SEGMENT_SIZE
+        numbers, with the primes lower than sqrt(end), so the memory used is
+        O(sqrt(end)) whatever the range
+
+        Args:
+            end -- int -- biggest value for the primes
+            start -- int -- lowest value for the primes
+
+        yield the primes, in ascending order
+    """
+    if start <= 2 <= end:
+        yield 2
+    if end < 3:
+        return
+
+    base_primes = _small_odd_primes(isqrt(end))
+    # first odd number of the first segment
+    low = max(3, start) | 1
+    while low <= end:
+        high = min(low + 2*SEGMENT_SIZE, end + 1)
+        size = (high - low + 1) // 2
+        segment = bytearray([1]) * size
+        for p in base_primes:
+            if p*p >= high:
+                break
+            # first odd multiple of p in the segment (p itself is not crossed out)
+            first = max(p*p, (low + p - 1) // p * p)
+            if first % 2 == 0:
+                first += p
+            index = (first - low) // 2
+            segment[index::p] = bytes(len(range(index, size, p)))
+        yield from itertools.compress(range(low, high, 2), segment)
+        low += 2*SEGMENT_SIZE
+
+
+def use_prime_table(table):
+    """ Make is_prime, random_prime and prime_decomposition consult a table
+        of primes (see src.PrimeTable), instead of calculating the primes
+
+        Args:
+            table -- PrimeTable or None -- None to stop using a table
+    """
+    global _PRIME_TABLE
+    _PRIME_TABLE = table
 
 
 def fermat_primality_test(n, k=1):
@@ -370,12 +862,48 @@ def fermat_primality_test(n, k=1):
     if n > 3:
         for _ in range(k):
             random = randint(2, n-2)
-            if exponentiation_by_squaring(random, n-1) % n != 1:
+            if modexp(random, n-1, n) != 1:
                 return False
 
     return True
 
 
+def _miller_rabin_decomposition(n):
+    """ Write n - 1 as s * 2^r, with s odd
+
+        Args:
+            n -- int -- odd number
+
+        return s and r
+    """
+    r = 0
+    s = n - 1
+    while s & 1 == 0:
+        r += 1
+        s //= 2
+    return s, r
+
+
+def _miller_rabin_witness(n, a, s, r):
+    """ One round of Miller-Rabin
+
+        Args:
+            n -- int -- the odd number to test for primality
+            a -- int -- the base of the round
+            s, r -- int -- n - 1 = s * 2^r, with s odd
+
+        return True if a proves that n is composite
+    """
+    x = pow(a, s, n)
+    if x == 1 or x == n - 1:
+        return False
+    for _ in range(r - 1):
+        x = pow(x, 2, n)
+        if x == n - 1:
+            return False
+    return True
+
+
 def miller_rabin_primality_test(n, k=2):
     """ Probabilistic test to determine if n is prime
 
@@ -391,22 +919,9 @@ def miller_rabin_primality_test(n, k=2):
     if n % 2 == 0:
         return False
 
-    r = 0
-    s = n - 1
-    while s & 1 == 0:
-        r += 1
-        s //= 2
-
+    s, r = _miller_rabin_decomposition(n)
     for _ in range(k):
-        a = randrange(2, n - 1)
-        x = pow(a, s, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
+        if _miller_rabin_witness(n, randrange(2, n - 1), s, r):
             return False
 
     return True
@@ -422,10 +937,9 @@ def monoalphabetic_substitution_cipher(message, plaintext_alphabet, ciphertext_a
 
         return the ciphertext
     """
-    message = message.upper()
-    plaintext_alphabet_dic = {k: v for v, k in enumerate(plaintext_alphabet)}
-	# return the encrypted message
-    return ''.join([ciphertext_alphabet[plaintext_alphabet_dic[c]] for c in message])
+    # imported here to avoid a circular import
+    from src.SubstitutionCipher import SubstitutionCipher
+    return SubstitutionCipher(plaintext_alphabet, ciphertext_alphabet).cipher(message)
 
 
 def affine_block_encryption(plaintext, a, b):
@@ -443,23 +957,9 @@ def affine_block_encryption(plaintext, a, b):
 
         return ciphertext
 	"""
-	# make sure the plaintext has an even length (because blocks of 2)
-    if len(plaintext) % 2 == 1:
-        sys.exit("It's required that the plaintext has an even length")
-
-    plaintext = plaintext.upper()
-    alphabet = string.ascii_uppercase
-    alphabet_dic = {k: v for v, k in enumerate(string.ascii_uppercase)}
-	# return the ciphertext
-    ciphertext = ""
-    for i in range(0, len(plaintext), 2):
-		# calculate the x in (ax + b)
-        x = (alphabet_dic[plaintext[i]]*26) + alphabet_dic[plaintext[i+1]]
-        E = (a * x + b) % 676
-        Ci = alphabet[E // 26]
-        Cj = alphabet[E % 26]
-        ciphertext += Ci + Cj
-    return ciphertext
+    # imported here to avoid a circular import
+    from src.AffineBlockCipher import AffineBlockCipher
+    return AffineBlockCipher(a, b).cipher(plaintext)
 
 
 def affine_block_decryption(ciphertext, a, b):
@@ -479,26 +979,9 @@ def affine_block_decryption(ciphertext, a, b):
 
         return plaintext
 	"""
-	# make sure the message has an even length (because blocks of 2)
-    if len(ciphertext) % 2 == 1:
-        sys.exit("It's required that the encrypted message has an even length")
-
-    ciphertext = ciphertext.upper()
-    alphabet = string.ascii_uppercase
-    alphabet_dic = {k: v for v, k in enumerate(string.ascii_uppercase)}
-	# return the encrypted message
-    message = ""
-    for i in range(0, len(ciphertext), 2):
-        y = (alphabet_dic[ciphertext[i]]*26) + alphabet_dic[ciphertext[i+1]]
-        D = inverse(a, 676) * (y - b)
-		# mod 26^2
-        D -= floor(D/676) * 676
-        Mi = alphabet[D // 26]
-        Mj = alphabet[D % 26]
-
-        message += Mi + Mj
-
-    return message
+    # imported here to avoid a circular import
+    from src.AffineBlockCipher import AffineBlockCipher
+    return AffineBlockCipher(a, b).decipher(ciphertext)
 
 def generate_prime_candidate(length=1025):
     """
@@ -509,55 +992,122 @@ def generate_prime_candidate(length=1025):
 
         return an integer
     """
-    # generate random bits
-    p = list(str(bin(getrandbits(length)))[2:])
-    # check the size
-    if len(p) < length:
-        p = ['0']*(length-len(p)) + p
-    if len(p) > length:
-        p = p[:length]
-    # Set the MSB to 1
-    p[0] = '1'
-    # Set the LSB to 1 (else, has 0 chance to be prime)
-    p[len(p) - 1] = '1'
-    # transform the list of string to int
-    return int(''.join(p), 2)
+    # set the MSB to 1 (size) and the LSB to 1 (else, has 0 chance to be prime)
+    return getrandbits(length) | (1 << (length - 1)) | 1
+
 
+def _search_prime_interval(arguments):
+    """ Search a prime (or a safe prime) among the odd numbers
+        start, start + 2, ..., start + 2*(size-1)
+
+        The interval is sieved with SIEVE_PRIMES first (for a safe prime
+        p = 2q + 1, the candidates are the q, and both q and p are sieved).
+        Then a single Miller-Rabin round in base 2 eliminates almost all the
+        remaining composites, before the 128 rounds of the full test.
+
+        Args:
+            arguments -- tuple -- (start, size, length, safe)
+                start -- int -- odd number, the first candidate
+                size -- int -- the number of candidates
+                length -- int -- the size of the candidates, in bits
+                safe -- boolean -- if True, search a safe prime 2q + 1
 
-def generate_prime_number(length=1025):
+        return the prime found, or None
+    """
+    start, size, length, safe = arguments
+    sieve = bytearray([1]) * size
+    for r in SIEVE_PRIMES:
+        if r >= start:
+            break
+        # start + 2k = 0 (mod r)  <=>  k = -start / 2 (mod r)
+        k = -start * ((r + 1) // 2) % r
+        sieve[k::r] = bytes(len(range(k, size, r)))
+        if safe:
+            # 2(start + 2k) + 1 = 0 (mod r)  <=>  k = -(2 start + 1) / 4 (mod r)
+            k = -(2*start + 1) * ((r + 1) // 2)**2 % r
+            sieve[k::r] = bytes(len(range(k, size, r)))
+
+    for k in itertools.compress(range(size), sieve):
+        n = start + 2*k
+        if n.bit_length() > length:
+            break
+        if _miller_rabin_witness(n, 2, *_miller_rabin_decomposition(n)):
+            continue
+        if not safe:
+            if miller_rabin_primality_test(n, 128):
+                return n
+            continue
+        p = 2*n + 1
+        if not _miller_rabin_witness(p, 2, *_miller_rabin_decomposition(p)) \
+                and miller_rabin_primality_test(n, 128) and miller_rabin_primality_test(p, 128):
+            return p
+    return None
+
+
+def _search_prime(length, safe, workers):
+    """ Search a prime in random intervals of candidates, in a process pool
+        if workers > 1 (each process search its own intervals, and the first
+        prime found is returned)
+
+        Args:
+            length -- int -- the size of the prime number, in bits
+            safe -- boolean -- if True, search a safe prime
+            workers -- int -- the number of processes
+
+        return the prime found
+    """
+    # size of the candidates (q for a safe prime) and number of candidates per interval
+    bits = length - 1 if safe else length
+    size = SAFE_PRIME_INTERVAL if safe else PRIME_INTERVAL
+
+    def next_interval():
+        return (generate_prime_candidate(bits), size, bits, safe)
+
+    if workers <= 1:
+        while True:
+            p = _search_prime_interval(next_interval())
+            if p:
+                return p
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = {executor.submit(_search_prime_interval, next_interval())
+                   for _ in range(workers)}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.result():
+                    return future.result()
+                pending.add(executor.submit(_search_prime_interval, next_interval()))
+    finally:
+        # don't wait for the intervals still being searched
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def generate_prime_number(length=1025, workers=1):
     """
         Generate a prime number
 
         Args:
             length -- int -- the size of the prime number to generate, in bits
+            workers -- int -- the number of processes searching the prime
 
         return a number which is very probably a prime number
     """
-    p = 4
-    # continue while the primality test fail
-    while not miller_rabin_primality_test(p, 128):
-        p = generate_prime_candidate(length)
-
-    return p
+    return _search_prime(length, False, workers)
 
 
-def generate_safe_prime_number(length=1025):
+def generate_safe_prime_number(length=1025, workers=1):
     """
         Generate a prime safe number (where p = 2q + 1, with q prime)
 
         Args:
             length -- int -- the size of the prime number to generate, in bits
+            workers -- int -- the number of processes searching the prime
 
         return a number which is very probably a prime safe prime number
     """
-    p = 4
-    # continue while the primality test fail
-    while not miller_rabin_primality_test(p, 128):
-        # generate q
-        q = generate_prime_candidate(length-1)
-        # calculate p = 2*q + 1
-        p = (q << 1) | 1
-    return p
+    return _search_prime(length, True, workers)
 
 
 def find_safe_prime_generator(p, q):
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+""" This module contains the padding functions of the block ciphers
+"""
+
+import os
+
+# padding schemes:
+#   ISO 10126: random bytes, the last bytes are the size of the padding
+#   PKCS#7: each byte of the padding is the size of the padding
+#   ANSI X.923: null bytes, the last bytes are the size of the padding
+ISO_10126 = 'iso10126'
+PKCS7 = 'pkcs7'
+ANSI_X923 = 'ansix923'
+SCHEMES = (ISO_10126, PKCS7, ANSI_X923)
+
+def legacy_length_bytes(block_size):
+    """ The number of bytes of the padding size in the legacy format of
+        add_padding: the bytes needed to store the block size, in bits
+
+        Args:
+            block_size -- int -- the size of the blocks, in bits
+
+        return an int
+    """
+    return (block_size.bit_length() + 7) // 8
+
+def padding_size(length, block_size, length_bytes=1):
+    """ Calculate the size of the padding
+
+        There is always some padding (a full block if the length is a
+        multiple of the block size), and at least length_bytes bytes to
+        store the size of the padding.
+
+        Args:
+            length -- int -- the length of the data, in bytes
+            block_size -- int -- the size of the blocks, in bytes
+            length_bytes -- int -- the number of bytes of the padding size
+
+        return the number of bytes to add
+    """
+    size = block_size - length % block_size
+    if size < length_bytes:
+        size += block_size
+    return size
+
+def pad(data, block_size, scheme=PKCS7, length_bytes=1):
+    """ Add the padding to the data
+
+        Args:
+            data -- bytes-like -- the data to pad, a bytearray is padded in place
+            block_size -- int -- the size of the blocks, in bytes
+            scheme -- string -- ISO_10126, PKCS7 or ANSI_X923
+            length_bytes -- int -- the number of bytes of the padding size
+                (PKCS7 only supports 1)
+
+        return a bytearray: the data padded
+    """
+    if scheme not in SCHEMES:
+        raise ValueError("Unknown padding scheme: %s" % scheme)
+    if scheme == PKCS7 and length_bytes != 1:
+        raise ValueError("The PKCS#7 padding size is on 1 byte")
+    if not isinstance(data, bytearray):
+        data = bytearray(data)
+    size = padding_size(len(data), block_size, length_bytes)
+    if size >= 1 << (8 * length_bytes):
+        raise ValueError("The padding size doesn't fit in %d byte(s)" % length_bytes)
+
+    if scheme == PKCS7:
+        data += bytes((size,)) * size
+    else:
+        # the filler and the size, in one allocation each
+        data += os.urandom(size - length_bytes) if scheme == ISO_10126 \
+            else bytes(size - length_bytes)
+        data += size.to_bytes(length_bytes, byteorder="big")
+    return data
+
+def strip_padding(data, block_size, scheme=PKCS7, length_bytes=1):
+    """ Check and remove the padding of the data (without copy)
+
+        Args:
+            data -- bytes-like -- the padded data
+            block_size -- int -- the size of the blocks, in bytes
+            scheme -- string -- ISO_10126, PKCS7 or ANSI_X923
+            length_bytes -- int -- the number of bytes of the padding size
+
+        return a memoryview of the data, without the padding
+    """
+    if scheme not in SCHEMES:
+        raise ValueError("Unknown padding scheme: %s" % scheme)
+    data = memoryview(data)
+    if not data or len(data) % block_size:
+        raise ValueError("The length of the data is not a multiple of the block size")
+    size = int.from_bytes(data[-length_bytes:], byteorder="big")
+    if not length_bytes <= size <= min(len(data), block_size + length_bytes - 1):
+        raise ValueError("Invalid padding")
+    end = len(data) - size
+    if scheme == PKCS7 and data[end:] != bytes((size,)) * size:
+        raise ValueError("Invalid padding")
+    if scheme == ANSI_X923 and data[end:len(data) - length_bytes] != bytes(size - length_bytes):
+        raise ValueError("Invalid padding")
+    return data[:end]
@@ -4,9 +4,9 @@
 """
 
 import sys
-import os
-import math
-import random
+from src._bits import BitString
+from src._files import resolve_path, atomic_write
+from src._padding import pad, ISO_10126, legacy_length_bytes
 
 def bytearray_to_int(byte_array):
     return int.from_bytes(byte_array, byteorder='big', signed=False)
@@ -14,56 +14,51 @@ def bytearray_to_int(byte_array):
 def read_file(filename, directory="assets", read_bytes=False):
     """ Read the content of the given asset
 
+        For a large file, see src._files.mapped (no copy in memory).
+
         Args:
-            filename -- string -- the file to read
-            directory -- string -- the directory name, at the project's root
+            filename -- string -- the file to read (an absolute path is kept as is)
+            directory -- string or None -- the directory name, at the project's root
+                (if None, filename is relative to the current directory)
             read_bytes -- boolean -- if True, read bytes
 
         return the content of the file
     """
-    f = open(os.path.abspath(directory + "/" + filename), "rb" if read_bytes else "r")
-    return f.read()
+    with open(resolve_path(filename, directory), "rb" if read_bytes else "r") as f:
+        return f.read()
 
 def add_padding(stream, block_size=1024):
     """
-        Add some padding to the stream, if needed
+        Add some padding to the stream
 
         The padding respect the "ISO 10126" norm (random bytes, and the last
-        bytes are the number of random bytes added for padding)
+        bytes are the number of random bytes added for padding), the size is
+        stored on the bytes needed to store the block size (see src._padding)
 
         Args:
-            stream -- bytes -- the stream to pad
-            block_size -- int -- the size of the blocks
+            stream -- bytes-like -- the stream to pad (not modified, see
+                src._padding.pad to pad a bytearray in place)
+            block_size -- int -- the size of the blocks, in bits
 
-        return a bytearray (the stream padded if needed)
+        return a new bytearray (the stream padded)
     """
-    stream = bytearray(stream)
-    # calculate the number of bytes needed to store the block size
-    msb_index = len(str(bin(block_size)[2:]))
-    padding_size_bytes = math.ceil(msb_index / 8)
-    # calculate the padding size
-    padding_size = (block_size // 8) - (len(stream) % (block_size//8))
-    # add padding (random bytes)
-    for _ in range(0, padding_size - padding_size_bytes):
-        stream.append(random.randint(0, 255))
-    # add padding (padding size bytes)
-    binary_padding_size = str(bin(padding_size)[2:]).zfill(padding_size_bytes * 8)
-
-    for i in range(padding_size_bytes):
-        stream.append(int(binary_padding_size[i*8:(i+1)*8], 2))
-
-    return bytearray(stream)
-
-def write_file(filename, data, write_bytes=False):
-    """ Write content in a file ('outputs' directory)
+    return pad(bytearray(stream), block_size // 8, ISO_10126, legacy_length_bytes(block_size))
+
+def write_file(filename, data, write_bytes=False, directory="outputs"):
+    """ Write content in a file ('outputs' directory), atomically: the
+        file is written in a temporary file, then renamed
 
         Args:
-            filename -- string -- the output file name
-            data -- string -- the content to write in the file
+            filename -- string -- the output file name (an absolute path is kept as is)
+            data -- string or bytes -- the content to write in the file
+                (or an iterable of bytes, written chunk by chunk)
+            write_bytes -- boolean -- if True, write bytes
+            directory -- string or None -- the directory name, at the project's root
+                (if None, filename is relative to the current directory)
     """
-    f = open(os.path.abspath("outputs/" + filename), "wb" if write_bytes else "w")
-    f.write(data)
-    f.close()
+    if not write_bytes and not isinstance(data, str):
+        raise TypeError("write_file expects a string (or write_bytes=True)")
+    atomic_write(resolve_path(filename, directory), data)
 
 def list_to_string(l):
     """ Join all elements of the given list
@@ -76,14 +71,15 @@ def list_to_string(l):
     return ','.join([str(v) for v in l])
 
 def utf8_to_binary(text):
-    """ Convert unicode (utf-8) text to binary
+    """ Convert unicode (utf-8) text to binary, 8 bits per character
+        (see src._bits.BitString for a compact representation)
 
         Args:
-            text -- string -- the text to convert
+            text -- string -- the text to convert (code points lower than 256)
 
         return the binary value of text
     """
-    return ''.join("{0:08b}".format(ord(c)) for c in text)
+    return str(BitString.from_text(text))
 
 def binary_to_utf8(binary_text):
     """ Convert binary text to uncode text (utf-8)
@@ -93,13 +89,13 @@ def binary_to_utf8(binary_text):
 
         return the utf-8 text
     """
-    block_size = 8
-    # start by cutting the text in blocks of 8 bits
-    # then, convert each block from binary to decimal and from decimal to char
-    # join the results
-    return ''.join([chr(int(c, 2)) for c in \
-                list(binary_text[i:i+block_size] for i in \
-                    range(0, len(binary_text), block_size))])
+    bits = BitString.from_string(binary_text)
+    # the blocks of 8 bits, and the last incomplete block (if any)
+    end = len(bits) - len(bits) % 8
+    text = bits[:end].to_text()
+    if end < len(bits):
+        text += chr(int(bits[end:]))
+    return text
 
 def binary_sum(a, b):
     """ Sum the binary numbers passed in parameters as strings
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+""" This module contains the primitives on 32 and 64 bits words used by the
+    ciphers and hash functions: rotations, and operations on arrays of words
+    (NumPy vectors if NumPy is installed)
+"""
+
+import sys
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MASK32 = 0xffffffff
+MASK64 = 0xffffffffffffffff
+MASKS = {32: MASK32, 64: MASK64}
+# typecodes of the arrays of unsigned words
+TYPECODES = {32: 'I', 64: 'Q'}
+DTYPES = {32: 'uint32', 64: 'uint64'}
+
+def rotl32(n, rotations):
+    """ binary rotation (left) of a 32 bits word
+
+        Args:
+            n -- int -- the word, lower than 2**32
+            rotations -- int -- in range [0:32]
+
+        return n rotated
+    """
+    return ((n << rotations) & MASK32) | (n >> (32 - rotations))
+
+def rotr32(n, rotations):
+    """ binary rotation (right) of a 32 bits word (see rotl32)
+    """
+    return (n >> rotations) | ((n << (32 - rotations)) & MASK32)
+
+def rotl64(n, rotations):
+    """ binary rotation (left) of a 64 bits word
+
+        Args:
+            n -- int -- the word, lower than 2**64
+            rotations -- int -- in range [0:64]
+
+        return n rotated
+    """
+    return ((n << rotations) & MASK64) | (n >> (64 - rotations))
+
+def rotr64(n, rotations):
+    """ binary rotation (right) of a 64 bits word (see rotl64)
+    """
+    return (n >> rotations) | ((n << (64 - rotations)) & MASK64)
+
+def make_rotl(rotations, w=32):
+    """ Build the rotation (left) by a fixed number of bits, with the shifts
+        and the mask calculated once
+
+        Args:
+            rotations -- int -- the number of rotations
+            w -- int -- the size of the words, in bits
+
+        return a function: word (lower than 2**w) -> word rotated
+    """
+    rotations %= w
+    right = w - rotations
+    mask = (1 << w) - 1
+    def rotl(n):
+        return ((n << rotations) & mask) | (n >> right)
+    return rotl
+
+def make_rotr(rotations, w=32):
+    """ Build the rotation (right) by a fixed number of bits (see make_rotl)
+    """
+    return make_rotl(w - rotations % w, w)
+
+def is_vector(words):
+    """ return True if words is a NumPy array
+    """
+    return numpy is not None and isinstance(words, numpy.ndarray)
+
+def word_array(values, w=32, vector=None):
+    """ Build an array of words
+
+        Args:
+            values -- iterable of int -- the words
+            w -- int -- 32 or 64
+            vector -- boolean or None -- if True, a NumPy array (if None:
+                a NumPy array only if NumPy is installed)
+
+        return an array('I') / array('Q'), or a NumPy uint32 / uint64 array
+    """
+    if vector is None:
+        vector = numpy is not None
+    if vector:
+        if numpy is None:
+            raise ImportError("NumPy is not installed")
+        return numpy.array(list(values), dtype=DTYPES[w])
+    return array(TYPECODES[w], values)
+
+def words_from_bytes(data, w=32, vector=False):
+    """ Cut bytes in big-endian words
+
+        Args:
+            data -- bytes-like -- its length is a multiple of w/8
+            w -- int -- 32 or 64
+            vector -- boolean -- if True, return a NumPy array
+
+        return an array('I') / array('Q') (or a NumPy uint32 / uint64 array) of the words
+    """
+    if vector:
+        return numpy.frombuffer(data, dtype='>u%d' % (w // 8)).astype(DTYPES[w])
+    words = array(TYPECODES[w], bytes(data))
+    if sys.byteorder == 'little':
+        words.byteswap()
+    return words
+
+def words_to_bytes(words, w=32):
+    """ Join words in big-endian bytes (the reverse of words_from_bytes)
+
+        Args:
+            words -- array of words, or iterable of int
+            w -- int -- 32 or 64
+
+        return bytes
+    """
+    if is_vector(words):
+        return words.astype('>u%d' % (w // 8)).tobytes()
+    words = array(TYPECODES[w], words)
+    if sys.byteorder == 'little':
+        words.byteswap()
+    return words.tobytes()
+
+def add_words(a, b, w=32):
+    """ Add the words of 2 arrays, modulo 2**w
+
+        Args:
+            a, b -- arrays of words (see word_array), of the same length
+            w -- int -- the size of the words, in bits
+
+        return a new array
+    """
+    if is_vector(a):
+        # the unsigned integers of NumPy wrap around
+        return a + b
+    mask = MASKS[w]
+    return array(TYPECODES[w], [(x + y) & mask for x, y in zip(a, b)])
+
+def sub_words(a, b, w=32):
+    """ Subtract the words of 2 arrays, modulo 2**w (see add_words)
+    """
+    if is_vector(a):
+        return a - b
+    mask = MASKS[w]
+    return array(TYPECODES[w], [(x - y) & mask for x, y in zip(a, b)])
+
+def xor_words(a, b, w=32):
+    """ Xor the words of 2 arrays (see add_words)
+    """
+    if is_vector(a):
+        return a ^ b
+    return array(TYPECODES[w], [x ^ y for x, y in zip(a, b)])
+
+def rotl_words(a, rotations, w=32):
+    """ Rotate (left) all the words of an array
+
+        Args:
+            a -- array of words (see word_array)
+            rotations -- int -- the number of rotations
+            w -- int -- the size of the words, in bits
+
+        return a new array
+    """
+    rotations %= w
+    if is_vector(a):
+        if not rotations:
+            return a.copy()
+        scalar = a.dtype.type
+        return (a << scalar(rotations)) | (a >> scalar(w - rotations))
+    return array(TYPECODES[w], map(make_rotl(rotations, w), a))
+
+def rotr_words(a, rotations, w=32):
+    """ Rotate (right) all the words of an array (see rotl_words)
+    """
+    return rotl_words(a, w - rotations % w, w)
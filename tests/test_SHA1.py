@@ -1,6 +1,7 @@
 import unittest
 
 from src.SHA1 import SHA1
+from src._words import numpy
 
 class TestSHA1(unittest.TestCase):
 
@@ -28,5 +29,24 @@ class TestSHA1(unittest.TestCase):
         h = "7c0a529d2e9e40f54944674b0de7e806fba33262"
         self.assertEqual(sha_1.hash(text), h)
 
+    def _messages(self):
+        # ragged lengths, around the block boundaries (64 bytes)
+        messages = [bytes(range(n)) for n in (0, 1, 55, 56, 63, 64, 65, 200)]
+        return messages + ["Hello world !", bytearray(b'x' * 128), bytes(range(100))]
+
+    def test_hash_many(self):
+        messages = self._messages()
+        expected = [SHA1().hash(bytes(m) if isinstance(m, bytearray) else m) for m in messages]
+        self.assertEqual(SHA1.hash_many(messages, vector=False), expected)
+        self.assertEqual(SHA1.hash_many([]), [])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_hash_many_vector(self):
+        messages = self._messages() * 3
+        expected = [SHA1().hash(bytes(m) if isinstance(m, bytearray) else m) for m in messages]
+        self.assertEqual(SHA1.hash_many(messages, vector=True), expected)
+        self.assertEqual(SHA1.hash_many(["Hello world !"], vector=True),
+                         ["7c0a529d2e9e40f54944674b0de7e806fba33262"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from src.AffineBlockCipher import AffineBlockCipher
+
+class TestAffineBlockCipher(unittest.TestCase):
+
+    def test_cipher(self):
+        cipher = AffineBlockCipher(7, 100)
+        self.assertEqual(cipher.cipher("CETTEUVESTGENIALEE"), "SYLZLGVYEZUYTAGVGY")
+
+    def test_decipher(self):
+        cipher = AffineBlockCipher(7, 100)
+        self.assertEqual(cipher.decipher("SYLZLGVYEZUYTAGVGY"), "CETTEUVESTGENIALEE")
+
+    def test_round_trip(self):
+        # the decipher table is built with the inverse of a
+        text = ''.join(chr(65 + i // 26) + chr(65 + i % 26) for i in range(676))
+        for a, b in ((1, 0), (7, 100), (675, 675), (3, -1)):
+            cipher = AffineBlockCipher(a, b)
+            self.assertEqual(cipher.a * cipher.inverse_a % 676, 1)
+            self.assertEqual(cipher.decipher(cipher.cipher(text)), text)
+
+    def test_odd_length(self):
+        with self.assertRaises(ValueError):
+            AffineBlockCipher(7, 100).cipher("ABC")
+
+    def test_not_invertible(self):
+        with self.assertRaises(ValueError):
+            AffineBlockCipher(13, 100)
+
+if __name__ == '__main__':
+    unittest.main()
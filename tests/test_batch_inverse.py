@@ -0,0 +1,22 @@
+import unittest
+
+from src._functions import batch_inverse, inverse
+
+class TestBatchInverse(unittest.TestCase):
+
+    def test_simple_case(self):
+        self.assertEqual(batch_inverse([13, 23, 7], 120), [37, 47, 103])
+
+    def test_same_as_inverse(self):
+        mod = 2**127 - 1
+        values = [3**i for i in range(1, 50)]
+        self.assertEqual(batch_inverse(values, mod), [inverse(v, mod) for v in values])
+
+    def test_not_invertible(self):
+        self.assertEqual(batch_inverse([3, 4, 5, 0, 7], 10), [7, None, None, None, 3])
+
+    def test_empty(self):
+        self.assertEqual(batch_inverse([], 7), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,5 +22,14 @@ class TestBezout(unittest.TestCase):
         gcd, x, y = bezout(a, b)
         self.assertEqual(x*a + y*b, 1)
 
+    def test_consecutive_fibonacci_numbers(self):
+        # worst case of the euclidean algorithm: one step per number
+        a, b = 0, 1
+        for _ in range(5000):
+            a, b = b, a + b
+        gcd, x, y = bezout(b, a)
+        self.assertEqual(gcd, 1)
+        self.assertEqual(x*b + y*a, 1)
+
 if __name__ == '__main__':
     unittest.main()
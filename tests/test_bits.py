@@ -0,0 +1,44 @@
+import unittest
+from src._bits import BitString
+
+class TestBitString(unittest.TestCase):
+
+    def test_conversions(self):
+        bits = BitString.from_string('0001001011')
+        self.assertEqual((bits.value, len(bits)), (0b1001011, 10))
+        self.assertEqual(str(bits), '0001001011')
+        self.assertEqual(BitString.from_bytes(b'\x00\xff').value, 255)
+        self.assertEqual(str(BitString.from_bytes(b'\x00\xff')), '0' * 8 + '1' * 8)
+        self.assertEqual(BitString.from_text('aé').to_bytes(), b'a\xe9')
+        self.assertEqual(BitString.from_text('aé').to_text(), 'aé')
+        self.assertEqual(str(BitString()), '')
+        with self.assertRaises(ValueError):
+            BitString.from_text('€')
+        with self.assertRaises(ValueError):
+            bits.to_bytes()
+        with self.assertRaises(ValueError):
+            BitString(8, 3)
+
+    def test_indexing(self):
+        bits = BitString.from_string('1100101')
+        self.assertEqual([bits[i] for i in range(7)], [1, 1, 0, 0, 1, 0, 1])
+        self.assertEqual(list(bits), [1, 1, 0, 0, 1, 0, 1])
+        self.assertEqual(bits[-1], 1)
+        self.assertEqual(str(bits[1:5]), '1001')
+        self.assertEqual(str(bits[5:]), '01')
+        self.assertEqual(str(bits[5:2]), '')
+        self.assertEqual(str(bits[::2]), '1011')
+        with self.assertRaises(IndexError):
+            bits[7]
+
+    def test_operations(self):
+        a = BitString.from_string('1010')
+        b = BitString.from_string('0110')
+        self.assertEqual(str(a ^ b), '1100')
+        self.assertEqual(str(a + b), '10100110')
+        self.assertEqual(BitString.from_string('00') + a, BitString.from_string('001010'))
+        with self.assertRaises(ValueError):
+            a ^ BitString.from_string('1')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import io
+import unittest
+from src.CramerShoupCiphertext import CramerShoupCiphertext, group_id, HEADER, HYBRID
+from src.GroupStore import named_group
+
+class TestCramerShoupCiphertext(unittest.TestCase):
+
+    def setUp(self):
+        self.p = named_group('modp1536')[0]
+        self.blocks = [1, 0, self.p - 1] + [3**i % self.p for i in range(300)]
+        self.ciphertext = CramerShoupCiphertext.for_group(self.p, 12345, self.p - 2,
+                                                          self.blocks, 2**1000)
+
+    def _check(self, ciphertext):
+        self.assertEqual(ciphertext.group_id, group_id(self.p))
+        self.assertEqual(ciphertext.size, 192)
+        self.assertEqual((ciphertext.b1, ciphertext.b2, ciphertext.v),
+                         (12345, self.p - 2, 2**1000))
+        self.assertEqual(list(ciphertext.blocks), self.blocks)
+
+    def test_bytes(self):
+        data = self.ciphertext.to_bytes()
+        self._check(CramerShoupCiphertext.from_bytes(data))
+        self._check(CramerShoupCiphertext.from_bytes(bytearray(data)))
+        self.assertTrue(CramerShoupCiphertext.is_binary(data))
+
+    def test_stream(self):
+        f = io.BytesIO()
+        self.ciphertext.write(f)
+        self.assertEqual(f.getvalue(), self.ciphertext.to_bytes())
+        f.seek(0)
+        self._check(CramerShoupCiphertext.read(f))
+
+    def test_legacy(self):
+        legacy = self.ciphertext.to_legacy()
+        self.assertEqual(len(legacy[2]), 2 * 192 * len(self.blocks))
+        self.assertFalse(CramerShoupCiphertext.is_binary(','.join(legacy)))
+        self._check(CramerShoupCiphertext.from_legacy(','.join(legacy), self.p))
+        # the blocks take half the size of the text format
+        self.assertEqual(len(self.ciphertext.to_bytes()),
+                         HEADER.size + 3*192 + 8 + len(legacy[2]) // 2)
+
+    def test_hybrid(self):
+        self.ciphertext.payload = b'payload'
+        self.assertEqual(self.ciphertext.mode, HYBRID)
+        ciphertext = CramerShoupCiphertext.from_bytes(self.ciphertext.to_bytes())
+        self._check(ciphertext)
+        self.assertEqual(ciphertext.mode, HYBRID)
+        self.assertEqual(bytes(ciphertext.payload), b'payload')
+        # streamed: the payload is left in the file
+        f = io.BytesIO()
+        self.ciphertext.write(f)
+        f.seek(0)
+        self._check(CramerShoupCiphertext.read(f))
+        self.assertEqual(f.read(), b'payload')
+
+    def test_invalid(self):
+        data = self.ciphertext.to_bytes()
+        with self.assertRaises(ValueError):
+            CramerShoupCiphertext.from_bytes(data[:-1])
+        with self.assertRaises(ValueError):
+            CramerShoupCiphertext.from_bytes(b'XXXX' + data[4:])
+        with self.assertRaises(ValueError):
+            CramerShoupCiphertext.from_bytes(data[:10])
+        with self.assertRaises(ValueError):
+            list(CramerShoupCiphertext.read(io.BytesIO(data[:-1])).blocks)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from src.CramerShoup import CramerShoup
+from src.CramerShoupCiphertext import CramerShoupCiphertext
+from src.CramerShoupKeys import CramerShoupPublicKey, CramerShoupPrivateKey
+from src.GroupStore import named_group
+
+class TestCramerShoupHybrid(unittest.TestCase):
+
+    def setUp(self):
+        p, _, g1, g2 = named_group('modp1536')
+        x1, x2, y1, y2, w = 321, 654, 987, 1110, 1312
+        self.public_key = CramerShoupPublicKey(p, g1, g2, pow(g1, x1, p) * pow(g2, x2, p) % p,
+                                               pow(g1, y1, p) * pow(g2, y2, p) % p, pow(g1, w, p))
+        self.private_key = CramerShoupPrivateKey(p, x1, x2, y1, y2, w)
+
+    def test_round_trip(self):
+        # decipher returns a string, as for the blocks
+        for text in ('', 'text', 'unicode \u00e9\u20ac', 'long text ' * 400):
+            ciphertext = CramerShoup.cipher_hybrid(text.encode(), self.public_key)
+            self.assertEqual(CramerShoup.decipher(ciphertext, private_key=self.private_key), text)
+            self.assertEqual(CramerShoup.decipher_hybrid(ciphertext, self.private_key),
+                             text.encode())
+
+    def test_binary(self):
+        # not UTF-8: decipher_hybrid returns the bytes
+        for message in (b'\xff\xfe binary', bytes(range(256)) * 40):
+            ciphertext = CramerShoup.cipher_hybrid(message, self.public_key)
+            self.assertEqual(CramerShoup.decipher_hybrid(ciphertext, self.private_key), message)
+            self.assertEqual(CramerShoup.decipher_hybrid(memoryview(ciphertext),
+                                                         self.private_key), message)
+            with self.assertRaises(UnicodeDecodeError):
+                CramerShoup.decipher(ciphertext, private_key=self.private_key)
+
+    def test_not_hybrid(self):
+        ciphertext = CramerShoup.cipher(b'blocks', True, self.public_key)
+        self.assertTrue(CramerShoupCiphertext.is_binary(ciphertext))
+        self.assertFalse(CramerShoupCiphertext.is_hybrid(ciphertext))
+        self.assertTrue(CramerShoupCiphertext.is_hybrid(
+            CramerShoup.cipher_hybrid(b'data', self.public_key)))
+        with self.assertRaises(SystemExit):
+            CramerShoup.decipher_hybrid(ciphertext, self.private_key)
+
+    def test_tampered(self):
+        ciphertext = bytearray(CramerShoup.cipher_hybrid(b'some data', self.public_key))
+        ciphertext[-1] ^= 1
+        with self.assertRaises(SystemExit):
+            CramerShoup.decipher(bytes(ciphertext), private_key=self.private_key)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from src.CramerShoupKeys import (CramerShoupPublicKey, CramerShoupPrivateKey, clear_cache)
+from src.GroupStore import named_group
+
+class TestCramerShoupKeys(unittest.TestCase):
+
+    def setUp(self):
+        p, _, g1, g2 = named_group('modp1536')
+        self.public_key = CramerShoupPublicKey(p, g1, g2, 12345, p - 3, 2**1000)
+        self.private_key = CramerShoupPrivateKey(p, 1, 2, 3, 4, p - 2)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'key')
+        clear_cache()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_bytes(self):
+        data = self.public_key.to_bytes()
+        self.assertEqual(len(data), 8 + 6*192)
+        self.assertEqual(CramerShoupPublicKey.from_bytes(data).values(), self.public_key.values())
+        key = CramerShoupPrivateKey.from_bytes(self.private_key.to_bytes())
+        self.assertEqual((key.p, key.values()), (self.private_key.p, self.private_key.values()))
+        with self.assertRaises(ValueError):
+            CramerShoupPrivateKey.from_bytes(data)
+        with self.assertRaises(ValueError):
+            CramerShoupPublicKey.from_bytes(data[:-1])
+
+    def test_text_format(self):
+        text = ','.join(str(v) for v in self.public_key.values())
+        self.assertEqual(CramerShoupPublicKey.from_bytes(text).values(), self.public_key.values())
+        text = ','.join(str(v) for v in self.private_key.values())
+        key = CramerShoupPrivateKey.from_bytes(text.encode(), self.private_key.p)
+        self.assertEqual(key.values(), self.private_key.values())
+        with self.assertRaises(ValueError):
+            CramerShoupPrivateKey.from_bytes(text)
+
+    def test_cache(self):
+        self.public_key.save(self.path)
+        key = CramerShoupPublicKey.load(self.path)
+        self.assertEqual(key.values(), self.public_key.values())
+        self.assertIs(CramerShoupPublicKey.load(self.path), key)
+        # the file changes: the key is loaded again
+        with open(self.path, 'w') as f:
+            f.write('23,5,7,1,2,3')
+        os.utime(self.path, ns=(0, 0))
+        self.assertEqual(CramerShoupPublicKey.load(self.path).values(), [23, 5, 7, 1, 2, 3])
+
+    def test_cache_same_mtime(self):
+        # a key saved again within the same tick of a coarse clock
+        self.public_key.save(self.path)
+        os.utime(self.path, ns=(0, 0))
+        CramerShoupPublicKey.load(self.path)
+        p, g1, g2, X, Y, W = self.public_key.values()
+        CramerShoupPublicKey(p, g1, g2, X + 1, Y, W).save(self.path)
+        os.utime(self.path, ns=(0, 0))
+        self.assertEqual(CramerShoupPublicKey.load(self.path).X, X + 1)
+
+    def test_private_key_text_file(self):
+        # the prime of a private key in the text format is in the public key file
+        self.public_key.save(self.path + '.pub')
+        with open(self.path, 'w') as f:
+            f.write(','.join(str(v) for v in self.private_key.values()))
+        key = CramerShoupPrivateKey.load(self.path)
+        self.assertEqual((key.p, key.values()), (self.private_key.p, self.private_key.values()))
+
+    def test_fixed_bases(self):
+        bases = self.public_key.fixed_bases()
+        self.assertIs(self.public_key.fixed_bases(), bases)
+        p = self.public_key.p
+        for fixed_base, base in zip(bases, (self.public_key.g1, self.public_key.g2,
+                                            self.public_key.W, self.public_key.X,
+                                            self.public_key.Y)):
+            self.assertEqual(fixed_base.pow(p - 5), pow(base, p - 5, p))
+
+if __name__ == '__main__':
+    unittest.main()
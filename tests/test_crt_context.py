@@ -0,0 +1,33 @@
+import unittest
+
+from src.CRTContext import CRTContext
+from src._functions import chinese_remainder_theorem
+
+class TestCRTContext(unittest.TestCase):
+
+    def test_solve(self):
+        context = CRTContext([3, 5, 7])
+        self.assertEqual(context.solve([2, 3, 2]), 23)
+
+    def test_solve_is_reduced(self):
+        context = CRTContext([11, 7])
+        self.assertEqual(context.solve([2 + 11*40, 5 + 7*10]), 68)
+
+    def test_solve_many(self):
+        context = CRTContext([11, 7])
+        rows = [[a, b] for a in range(11) for b in range(7)]
+        self.assertEqual(context.solve_many(rows),
+                         [chinese_remainder_theorem(row, [11, 7]) for row in rows])
+
+    def test_garner(self):
+        modulos = [2**61 - 1, 2**89 - 1, 2**107 - 1]
+        values = [123456789, 987654321, 2**100]
+        context = CRTContext(modulos)
+        self.assertEqual(context.garner(values), context.solve(values))
+
+    def test_not_coprime(self):
+        with self.assertRaises(ValueError):
+            CRTContext([4, 6])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import string
+from unittest import mock
+
+from src.Cryptanalysis import Cryptanalysis
+from src.Caesar import Caesar
+from src.Affine import Affine
+from src.SubstitutionCipher import SubstitutionCipher
+
+TEXT = ("The main classical cipher types are transposition ciphers, which rearrange "
+        "the order of letters in a message, and substitution ciphers, which "
+        "systematically replace letters or groups of letters with other letters or "
+        "groups of letters. Simple versions of either have never offered much "
+        "confidentiality from enterprising opponents. An early substitution cipher "
+        "was the Caesar cipher, in which each letter in the plaintext was replaced "
+        "by a letter some fixed number of positions further down the alphabet. "
+        "Suetonius reports that Julius Caesar used it with a shift of three to "
+        "communicate with his generals.")
+
+class TestCryptanalysis(unittest.TestCase):
+
+    def test_ngram_counts(self):
+        counts = Cryptanalysis.ngram_counts("ABAB", 2)
+        self.assertEqual(counts, {"AB": 2, "BA": 1})
+
+    def test_break_caesar(self):
+        self.assertEqual(Cryptanalysis.break_caesar(Caesar(213).cipher(TEXT)), 213)
+
+    def test_break_caesar_parallel(self):
+        self.assertEqual(Cryptanalysis.break_caesar(Caesar(42).cipher(TEXT), workers=2), 42)
+
+    def test_empty(self):
+        self.assertEqual(Cryptanalysis.chi_squared({}, 0), 0)
+        self.assertEqual(Cryptanalysis.break_caesar(""), 0)
+        self.assertEqual(Cryptanalysis.break_affine(""), (1, 0))
+
+    def test_more_workers_than_keys(self):
+        # the workers are clamped to the number of keys (no empty chunk),
+        # the chunks are scored in this process
+        def sequential_map(function, arguments, workers):
+            self.assertEqual(len(arguments), workers)
+            self.assertTrue(all(chunk[2] and chunk[3] for chunk in arguments))
+            return list(map(function, arguments))
+        with mock.patch.object(Cryptanalysis, '_map', side_effect=sequential_map) as pool:
+            self.assertEqual(Cryptanalysis.break_caesar(Caesar(42).cipher(TEXT), workers=300), 42)
+            self.assertEqual(pool.call_args[0][2], 256)
+            self.assertEqual(Cryptanalysis.break_affine(Affine(7, 3).cipher(TEXT), workers=200),
+                             (7, 3))
+            self.assertEqual(pool.call_args[0][2], 128)
+
+    def test_break_affine(self):
+        self.assertEqual(Cryptanalysis.break_affine(Affine(7, 3).cipher(TEXT)), (7, 3))
+
+    def test_break_substitution(self):
+        key = "OBLVUCGJRPTZKYIWXSHNADFEMQ"
+        plaintext = ''.join(c for c in TEXT.upper() if c in string.ascii_uppercase)
+        ciphertext = SubstitutionCipher(string.ascii_uppercase, key).cipher(plaintext)
+        found = Cryptanalysis.break_substitution(ciphertext, TEXT)
+        self.assertEqual(SubstitutionCipher(string.ascii_uppercase, found).decipher(ciphertext),
+                         plaintext)
+
+if __name__ == '__main__':
+    unittest.main()
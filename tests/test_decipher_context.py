@@ -0,0 +1,53 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.CramerShoup import CramerShoup, DecipherContext, BLOCK_SIZE
+from src.CramerShoupKeys import CramerShoupPublicKey, CramerShoupPrivateKey
+from src.GroupStore import named_group
+
+class TestDecipherContext(unittest.TestCase):
+
+    def setUp(self):
+        self.p, _, g, _ = named_group('modp1536')
+        self.w, b = 1234567891011, 98765432109876
+        self.b1 = pow(g, b, self.p)
+        self.mask = pow(g, self.w * b, self.p)
+
+    def _cipher(self, blocks):
+        return [self.mask * block % self.p for block in blocks]
+
+    def test_decipher_blocks(self):
+        blocks = [int.from_bytes(bytes([i]) * BLOCK_SIZE, byteorder="big") for i in range(1, 10)]
+        context = DecipherContext(self.p, self.b1, self.w)
+        expected = b''.join(block.to_bytes(BLOCK_SIZE, byteorder="big") for block in blocks)
+        self.assertEqual(context.decipher_blocks(self._cipher(blocks)), expected)
+
+    def test_leading_zero_bytes(self):
+        # blocks starting with null bytes keep their size
+        context = DecipherContext(self.p, self.b1, self.w)
+        text = context.decipher_blocks(self._cipher([0, 1, 256]))
+        self.assertEqual(len(text), 3 * BLOCK_SIZE)
+        self.assertEqual(text[BLOCK_SIZE-1], 0)
+        self.assertEqual(text[2*BLOCK_SIZE-1], 1)
+        self.assertEqual(text[-2:], b'\x01\x00')
+
+    def test_executor(self):
+        blocks = list(range(1000, 1100))
+        context = DecipherContext(self.p, self.b1, self.w)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(context.decipher_blocks(self._cipher(blocks), executor, chunk_size=7),
+                             context.decipher_blocks(self._cipher(blocks)))
+
+    def test_encapsulate(self):
+        p, _, g1, g2 = named_group('modp1536')
+        x1, x2, y1, y2, w = 11, 22, 33, 44, 55
+        public_key = CramerShoupPublicKey(p, g1, g2, pow(g1, x1, p) * pow(g2, x2, p) % p,
+                                          pow(g1, y1, p) * pow(g2, y2, p) % p, pow(g1, w, p))
+        blocks = [int.from_bytes(b'key and digest', byteorder="big"), 0]
+        ciphertext = CramerShoup._encapsulate(public_key, blocks)
+        text = CramerShoup._decapsulate(ciphertext,
+                                        CramerShoupPrivateKey(p, x1, x2, y1, y2, w))
+        self.assertEqual(text, b''.join(block.to_bytes(BLOCK_SIZE, byteorder="big")
+                                        for block in blocks))
+
+if __name__ == '__main__':
+    unittest.main()
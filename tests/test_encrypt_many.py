@@ -0,0 +1,52 @@
+import unittest
+from src.CramerShoup import CramerShoup
+from src.CramerShoupKeys import CramerShoupPublicKey, CramerShoupPrivateKey
+from src.GroupStore import named_group
+
+class TestEncryptMany(unittest.TestCase):
+
+    def setUp(self):
+        p, _, g1, g2 = named_group('modp1536')
+        x1, x2, y1, y2, w = 123, 456, 789, 1011, 1213
+        self.public_key = CramerShoupPublicKey(p, g1, g2, pow(g1, x1, p) * pow(g2, x2, p) % p,
+                                               pow(g1, y1, p) * pow(g2, y2, p) % p, pow(g1, w, p))
+        self.private_key = CramerShoupPrivateKey(p, x1, x2, y1, y2, w)
+        self.messages = [('message %d' % i).encode() for i in range(10)]
+
+    def _check(self, ciphertexts, binary=False):
+        self.assertEqual(len(ciphertexts), len(self.messages))
+        for ciphertext, message in zip(ciphertexts, self.messages):
+            if not binary:
+                ciphertext = ','.join(ciphertext)
+            self.assertEqual(CramerShoup.decipher(ciphertext, private_key=self.private_key),
+                             message.decode())
+
+    def test_encrypt_many(self):
+        self._check(CramerShoup.encrypt_many(self.messages, public_key=self.public_key))
+
+    def test_workers(self):
+        self._check(CramerShoup.encrypt_many(self.messages, workers=2, binary=True,
+                                             public_key=self.public_key), binary=True)
+
+    def test_precompute(self):
+        self.public_key.precompute(4)
+        self.public_key.precompute_in_background(4, workers=2).join()
+        self.assertEqual(self.public_key.precomputed, 8)
+        randomness = self.public_key.randomness()
+        b, p = randomness[0], self.public_key.p
+        self.assertEqual(randomness[1:], (pow(self.public_key.g1, b, p), pow(self.public_key.g2, b, p),
+                                          pow(self.public_key.W, b, p), pow(self.public_key.X, b, p),
+                                          pow(self.public_key.Y, b, p)))
+        # each precalculated value is used once
+        self._check(CramerShoup.encrypt_many(self.messages, public_key=self.public_key))
+        self.assertEqual(self.public_key.precomputed, 0)
+
+    def test_precompute_workers(self):
+        # the precalculated values are sent to the workers
+        self.public_key.precompute(12)
+        self._check(CramerShoup.encrypt_many(self.messages, workers=2, binary=True,
+                                             public_key=self.public_key), binary=True)
+        self.assertEqual(self.public_key.precomputed, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from src._functions import factorize, factorize_many, _integer_root
+
+class TestFactorize(unittest.TestCase):
+
+    def test_simple_case(self):
+        self.assertEqual(factorize(9438), {2: 1, 3: 1, 11: 2, 13: 1})
+
+    def test_one_and_prime(self):
+        self.assertEqual(factorize(1), {})
+        self.assertEqual(factorize(1299709), {1299709: 1})
+
+    def test_64_bits_semiprime(self):
+        self.assertEqual(factorize(3842923663 * 3870957257), {3842923663: 1, 3870957257: 1})
+
+    def test_128_bits_composite(self):
+        n = 2**4 * 3**5 * 894215921**2 * 2593816829 * 889027
+        self.assertEqual(factorize(n), {2: 4, 3: 5, 889027: 1, 894215921: 2, 2593816829: 1})
+
+    def test_prime_powers(self):
+        # rho would need about sqrt(p) steps for p^2
+        p = 2**61 - 1
+        self.assertEqual(factorize(p**2), {p: 2})
+        self.assertEqual(factorize(2 * p**3 * 1009**4), {2: 1, 1009: 4, p: 3})
+        self.assertEqual(factorize((2**89 - 1)**4), {2**89 - 1: 4})
+
+    def test_integer_root(self):
+        for n in (1, 7, 8, 9, 2**64, 3**40 - 1, 3**40):
+            for k in (2, 3, 5):
+                root = _integer_root(n, k)
+                self.assertTrue(root**k <= n < (root + 1)**k)
+
+    def test_factorize_many(self):
+        numbers = [1000003 * 1000033, 2**10, 999999000001]
+        self.assertEqual(factorize_many(numbers, workers=2), [factorize(n) for n in numbers])
+
+if __name__ == '__main__':
+    unittest.main()
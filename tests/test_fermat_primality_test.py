@@ -19,10 +19,11 @@ class TestFermatPrimalityTest(unittest.TestCase):
     def test_normal_prime(self):
         self.assertTrue(fermat_primality_test(99929))
 
-    """
     def test_big_prime(self):
         self.assertTrue(fermat_primality_test(1203793))
-    """
+
+    def test_huge_prime(self):
+        self.assertTrue(fermat_primality_test(2**1279 - 1, 3))
 
     def test_normal_composite(self):
         self.assertFalse(fermat_primality_test(398745, 2))
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import src._files as _files
+from src._files import resolve_path, mapped, atomic_open, atomic_write, copy_file
+from src._utils import read_file, write_file
+
+class TestFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'file')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_resolve_path(self):
+        self.assertEqual(resolve_path('a.txt', 'assets'), os.path.abspath('assets/a.txt'))
+        self.assertEqual(resolve_path(self.path, 'assets'), self.path)
+        self.assertEqual(resolve_path('a.txt'), os.path.abspath('a.txt'))
+
+    def test_mapped(self):
+        atomic_write(self.path, bytes(range(256)) * 100)
+        with mapped(self.path) as data:
+            self.assertIsInstance(data, memoryview)
+            self.assertEqual(len(data), 25600)
+            self.assertEqual(bytes(data[255:258]), b'\xff\x00\x01')
+        atomic_write(self.path, b'')
+        with mapped(self.path) as data:
+            self.assertEqual(len(data), 0)
+
+    def test_atomic_write(self):
+        atomic_write(self.path, 'text')
+        atomic_write(self.path, (bytes([i]) * 10 for i in range(3)))
+        self.assertEqual(read_file(self.path, None, read_bytes=True),
+                         b'\x00' * 10 + b'\x01' * 10 + b'\x02' * 10)
+        # an error: the file is not modified, and the temporary file is removed
+        with self.assertRaises(RuntimeError):
+            with atomic_open(self.path) as f:
+                f.write(b'partial')
+                raise RuntimeError()
+        self.assertEqual(len(read_file(self.path, None, read_bytes=True)), 30)
+        self.assertEqual(os.listdir(self.directory.name), ['file'])
+
+    def test_permissions(self):
+        umask = os.umask(0o027)
+        try:
+            # a new file: the default mode, without the bits of the umask
+            atomic_write(self.path, b'new')
+            self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+            # an existing file keeps its mode
+            os.chmod(self.path, 0o604)
+            atomic_write(self.path, b'overwritten')
+            self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o604)
+            copy_file(self.path, self.path + '.copy')
+            self.assertEqual(os.stat(self.path + '.copy').st_mode & 0o777, 0o640)
+        finally:
+            os.umask(umask)
+
+    def test_umask_not_changed(self):
+        # the umask is read, never set (it's global to the threads)
+        with mock.patch('os.umask', side_effect=AssertionError("os.umask called")):
+            atomic_write(self.path, b'new')
+            with mock.patch('src._files._read_umask', return_value=None):
+                atomic_write(self.path + '.2', b'new')
+        self.assertEqual(os.stat(self.path + '.2').st_mode & 0o777, 0o666 & ~_files.UMASK)
+
+    def test_copy_file(self):
+        atomic_write(self.path, os.urandom(100000))
+        copy_file(self.path, self.path + '.copy')
+        self.assertEqual(read_file(self.path + '.copy', None, read_bytes=True),
+                         read_file(self.path, None, read_bytes=True))
+
+    def test_read_write_file(self):
+        write_file(self.path, 'content', directory='outputs')
+        self.assertEqual(read_file('file', self.directory.name), 'content')
+        with self.assertRaises(TypeError):
+            write_file(self.path, b'bytes')
+
+if __name__ == '__main__':
+    unittest.main()
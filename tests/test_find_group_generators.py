@@ -0,0 +1,30 @@
+import unittest
+
+from src._functions import find_group_generators, iter_group_generators, first_generator
+
+class TestFindGroupGenerators(unittest.TestCase):
+
+    def test_prime(self):
+        self.assertEqual(find_group_generators(7), [3, 5])
+
+    def test_prime_power(self):
+        self.assertEqual(find_group_generators(9), [2, 5])
+
+    def test_small_cases(self):
+        self.assertEqual(find_group_generators(1), [])
+        self.assertEqual(find_group_generators(2), [1])
+        self.assertEqual(find_group_generators(4), [3])
+
+    def test_not_cyclic(self):
+        self.assertEqual(find_group_generators(15), [])
+        self.assertIsNone(first_generator(8))
+
+    def test_same_as_lazy_mode(self):
+        for n in (23, 50, 243, 1009):
+            self.assertEqual(find_group_generators(n), list(iter_group_generators(n)))
+
+    def test_first_generator(self):
+        self.assertEqual(first_generator(1000003), 2)
+
+if __name__ == '__main__':
+    unittest.main()
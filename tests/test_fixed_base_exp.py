@@ -0,0 +1,25 @@
+import unittest
+
+from src.FixedBaseExp import FixedBaseExp
+
+class TestFixedBaseExp(unittest.TestCase):
+
+    def test_same_as_pow(self):
+        p = 2**521 - 1
+        for window in (8, 5):
+            g = FixedBaseExp(3, p, window=window)
+            for exp in (0, 1, 255, 256, 2**520 + 12345, p - 1):
+                self.assertEqual(g.pow(exp), pow(3, exp, p))
+
+    def test_exponent_out_of_table(self):
+        g = FixedBaseExp(5, 1009, exponent_bits=8)
+        self.assertEqual(g.pow(10**6), pow(5, 10**6, 1009))
+
+    def test_reduced_by_order(self):
+        p = 1019
+        g = FixedBaseExp(2, p, order=p-1)
+        self.assertEqual(g.pow(3 * (p-1) + 7), pow(2, 7, p))
+        self.assertEqual(g.pow(-1), pow(2, p-2, p))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from src._functions import (generate_prime_candidate, generate_prime_number,
+                            generate_safe_prime_number, is_prime)
+
+class TestGeneratePrimeNumber(unittest.TestCase):
+
+    def test_candidate(self):
+        n = generate_prime_candidate(64)
+        self.assertEqual(n.bit_length(), 64)
+        self.assertEqual(n % 2, 1)
+
+    def test_prime(self):
+        p = generate_prime_number(128)
+        self.assertEqual(p.bit_length(), 128)
+        self.assertTrue(is_prime(p))
+
+    def test_safe_prime(self):
+        p = generate_safe_prime_number(128)
+        self.assertEqual(p.bit_length(), 128)
+        self.assertTrue(is_prime(p))
+        self.assertTrue(is_prime((p - 1) // 2))
+
+    def test_safe_prime_with_workers(self):
+        p = generate_safe_prime_number(96, workers=2)
+        self.assertEqual(p.bit_length(), 96)
+        self.assertTrue(is_prime(p))
+        self.assertTrue(is_prime((p - 1) // 2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from src.GroupStore import GroupStore, generate_group, named_group, is_valid_group
+
+class TestGroupStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'groups')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_named_groups(self):
+        self.assertTrue(is_valid_group(named_group('modp1536')))
+
+    def test_invalid_group(self):
+        p, q, g1, _ = named_group('modp1536')
+        self.assertFalse(is_valid_group((p, q, g1, g1)))
+        self.assertFalse(is_valid_group((p, q, g1, 4)))
+
+    def test_persisted_groups(self):
+        store = GroupStore(self.path)
+        store.generate(2, length=128)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(GroupStore(self.path).groups, store.groups)
+        self.assertIn(GroupStore(self.path).get(), store.groups)
+
+    def test_background_generation(self):
+        store = GroupStore(self.path)
+        store.generate_in_background(1, length=128).join()
+        self.assertEqual(len(store), 1)
+
+    def test_fixed_bases(self):
+        group = generate_group(128)
+        p, _, g1, g2 = group
+        g1_exp, g2_exp = GroupStore(self.path).fixed_bases(group)
+        self.assertEqual(g1_exp.pow(12345), pow(g1, 12345, p))
+        self.assertEqual(g2_exp.pow(p + 5), pow(g2, p + 5, p))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,10 +5,19 @@ from src._functions import inverse
 class TestInverse(unittest.TestCase):
 
     def test_simple_case(self):
-        self.assertEqual(inverse(13, 7), -1)
+        self.assertEqual(inverse(13, 7), 6)
 
     def test_normal_case(self):
         self.assertEqual(inverse(23, 120), 47)
 
+    def test_big_numbers(self):
+        n = 2**4096 - 1
+        mod = 2**4253 - 1
+        self.assertEqual(inverse(n, mod) * n % mod, 1)
+
+    def test_not_invertible(self):
+        with self.assertRaises(ValueError):
+            inverse(4, 6)
+
 if __name__ == '__main__':
     unittest.main()
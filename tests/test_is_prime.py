@@ -31,5 +31,21 @@ class TestIsPrime(unittest.TestCase):
     def test_not_prime_harder_2(self):
         self.assertFalse(is_prime(999999000002))
 
+    def test_square_of_prime(self):
+        self.assertFalse(is_prime(9))
+        self.assertFalse(is_prime(25))
+        self.assertFalse(is_prime(1009**2))
+
+    def test_strong_pseudoprime(self):
+        # strong pseudoprime to the bases 2, 3, 5, 7, 11, 13, 17, 19, 23
+        self.assertFalse(is_prime(3825123056546413051))
+
+    def test_64_bits_prime(self):
+        self.assertTrue(is_prime(2**61 - 1))
+
+    def test_huge_prime(self):
+        self.assertTrue(is_prime(2**521 - 1))
+        self.assertFalse(is_prime(2**523 - 1))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+from src._functions import iter_primes, sieve_of_eratosthenes, SEGMENT_SIZE
+
+class TestIterPrimes(unittest.TestCase):
+
+    def test_simple_case(self):
+        self.assertEqual(list(iter_primes(30)), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+
+    def test_with_start(self):
+        self.assertEqual(list(iter_primes(130, 100)), [101, 103, 107, 109, 113, 127])
+
+    def test_empty_range(self):
+        self.assertEqual(list(iter_primes(1)), [])
+        self.assertEqual(list(iter_primes(113, 114)), [])
+
+    def test_many_segments(self):
+        end = 5 * SEGMENT_SIZE
+        primes = sieve_of_eratosthenes(end)
+        self.assertEqual(len(primes), 100786)
+        self.assertEqual(primes[-1], 1310719)
+
+if __name__ == '__main__':
+    unittest.main()
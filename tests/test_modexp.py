@@ -0,0 +1,23 @@
+import unittest
+
+from src._functions import modexp
+
+class TestModexp(unittest.TestCase):
+
+    def test_simple_case(self):
+        self.assertEqual(modexp(4, 13, 497), 445)
+
+    def test_same_as_pow(self):
+        mod = 2**1279 - 1
+        for exp in (0, 1, 2, 3, 2**64 + 1, 3**800):
+            for window in (None, 1, 4):
+                self.assertEqual(modexp(7, exp, mod, window), pow(7, exp, mod))
+
+    def test_negative_exponent(self):
+        self.assertEqual(modexp(23, -1, 120), 47)
+
+    def test_modulo_one(self):
+        self.assertEqual(modexp(5, 3, 1), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from src._functions import multi_exp
+
+class TestMultiExp(unittest.TestCase):
+
+    def test_two_bases(self):
+        p = 2**127 - 1
+        self.assertEqual(multi_exp([3, 5], [2**100 + 7, 12345], p),
+                         pow(3, 2**100 + 7, p) * pow(5, 12345, p) % p)
+
+    def test_many_bases(self):
+        p = 1000003
+        bases = [2, 3, 5, 7, 11]
+        exponents = [10, 0, 999, 2**40, 1]
+        expected = 1
+        for base, exp in zip(bases, exponents):
+            expected = expected * pow(base, exp, p) % p
+        for window in (None, 1, 2):
+            self.assertEqual(multi_exp(bases, exponents, p, window), expected)
+
+    def test_zero_exponents(self):
+        self.assertEqual(multi_exp([3, 5], [0, 0], 7), 1)
+
+    def test_empty(self):
+        self.assertEqual(multi_exp([], [], 7), 1)
+        self.assertEqual(multi_exp([], [], 1), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from src._padding import (pad, strip_padding, padding_size, legacy_length_bytes,
+                          ISO_10126, PKCS7, ANSI_X923)
+from src._utils import add_padding
+from src.Threefish import Threefish
+
+class TestPadding(unittest.TestCase):
+
+    def test_padding_size(self):
+        self.assertEqual(padding_size(0, 16), 16)
+        self.assertEqual(padding_size(15, 16), 1)
+        self.assertEqual(padding_size(16, 16), 16)
+        # not enough room for the size: one more block
+        self.assertEqual(padding_size(127, 128, 2), 129)
+
+    def test_schemes(self):
+        for scheme in (ISO_10126, PKCS7, ANSI_X923):
+            for length in range(0, 40):
+                data = bytes(range(length))
+                padded = pad(data, 16, scheme)
+                self.assertEqual(len(padded) % 16, 0)
+                self.assertEqual(bytes(strip_padding(padded, 16, scheme)), data)
+        self.assertEqual(pad(b'abc', 8, PKCS7), bytearray(b'abc\x05\x05\x05\x05\x05'))
+        self.assertEqual(pad(b'abc', 8, ANSI_X923), bytearray(b'abc\x00\x00\x00\x00\x05'))
+
+    def test_in_place(self):
+        data = bytearray(b'data')
+        self.assertIs(pad(data, 8), data)
+        stripped = strip_padding(data, 8)
+        self.assertIsInstance(stripped, memoryview)
+        self.assertEqual(stripped, b'data')
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            strip_padding(b'abc\x05\x05\x05\x05\x06', 8, PKCS7)
+        with self.assertRaises(ValueError):
+            strip_padding(b'abc\x00\x01\x00\x00\x05', 8, ANSI_X923)
+        with self.assertRaises(ValueError):
+            strip_padding(b'abcdefg\x00', 8, ISO_10126)
+        with self.assertRaises(ValueError):
+            strip_padding(b'abcdefg\x09', 8, ISO_10126)
+        with self.assertRaises(ValueError):
+            strip_padding(b'abc\x01', 8)
+        with self.assertRaises(ValueError):
+            pad(b'', 256, PKCS7)
+        with self.assertRaises(ValueError):
+            pad(b'', 8, PKCS7, length_bytes=2)
+
+    def test_legacy(self):
+        self.assertEqual(legacy_length_bytes(1024), 2)
+        for length in (0, 1, 126, 127, 128, 300):
+            padded = add_padding(bytes(length))
+            self.assertEqual(len(padded) % 128, 0)
+            self.assertEqual(int.from_bytes(padded[-2:], 'big'), len(padded) - length)
+            self.assertEqual(strip_padding(padded, 128, ISO_10126, 2), bytes(length))
+
+    def test_legacy_copy(self):
+        # add_padding and the ciphers don't modify their argument
+        data = bytearray(b'data')
+        padded = add_padding(data, block_size=256)
+        self.assertIsNot(padded, data)
+        self.assertEqual((len(padded), data), (32, b'data'))
+        threefish = Threefish(64, bytes(80))
+        threefish.key_schedule()
+        ciphertext = threefish.cipher(data)
+        self.assertEqual(data, b'data')
+        self.assertEqual(threefish.decipher(ciphertext), b'data')
+        self.assertIsInstance(threefish.decipher(ciphertext), bytes)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from src._functions import phi
+from src._functions import phi, phi_range
 
 class TestPhi(unittest.TestCase):
 
@@ -19,10 +19,19 @@ class TestPhi(unittest.TestCase):
     def test_simple_case_three(self):
         self.assertEqual(phi(81), 54)
 
-    """
     def test_hard_case(self):
         self.assertEqual(phi(9007199254740881), 9007199254740880)
-    """
+
+    def test_exact_big_number(self):
+        n = (2**61 - 1) * (2**31 - 1)**2
+        self.assertEqual(phi(n), (2**61 - 2) * (2**31 - 2) * (2**31 - 1))
+
+    def test_range(self):
+        self.assertEqual(list(phi_range(12)), [0, 1, 1, 2, 2, 4, 2, 6, 4, 6, 4, 10, 4])
+
+    def test_range_same_as_phi(self):
+        phis = phi_range(3000)
+        self.assertEqual(list(phis), [0] + [phi(i) for i in range(1, 3001)])
 
 if __name__ == '__main__':
     unittest.main()
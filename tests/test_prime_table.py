@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import src._functions as functions
+from src.PrimeTable import PrimeTable
+
+class TestPrimeTable(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'primes.bin')
+
+    def tearDown(self):
+        functions.use_prime_table(None)
+        self.directory.cleanup()
+
+    def test_build_and_load(self):
+        PrimeTable.build(self.path, 1000).close()
+        with PrimeTable(self.path) as table:
+            self.assertEqual(table.limit, 1000)
+            self.assertEqual(len(table), 168)
+            self.assertEqual(table[-1], 997)
+            self.assertIn(991, table)
+            self.assertNotIn(993, table)
+            self.assertEqual(list(table.primes_between(100, 130)), [101, 103, 107, 109, 113, 127])
+
+    def test_load_or_build(self):
+        PrimeTable.build(self.path, 100).close()
+        with PrimeTable.load_or_build(self.path, 1000) as table:
+            self.assertEqual(table.limit, 1000)
+
+    def test_rebuild_while_mapped(self):
+        # the mapped table isn't truncated: the file is replaced
+        with PrimeTable.build(self.path, 100) as old:
+            with PrimeTable.load_or_build(self.path, 1000) as table:
+                self.assertEqual(table.limit, 1000)
+                self.assertEqual(old.limit, 100)
+                self.assertEqual(len(old), 25)
+                self.assertEqual(old[-1], 97)
+
+    def test_functions_use_the_table(self):
+        table = PrimeTable.build(self.path, 1000)
+        functions.use_prime_table(table)
+        self.assertTrue(functions.is_prime(997))
+        self.assertFalse(functions.is_prime(961))
+        self.assertIn(functions.random_prime(900, 1000), table.primes_between(900, 1000))
+        self.assertEqual(list(functions.prime_decomposition(9438)), [2, 3, 11, 11, 13])
+        self.assertEqual(list(functions.prime_decomposition(2 * 1009**2)), [2, 1009, 1009])
+        functions.use_prime_table(None)
+        table.close()
+
+    def test_factorize_uses_the_table(self):
+        table = PrimeTable.build(self.path, 5000)
+        functions.use_prime_table(table)
+        with mock.patch.object(table, 'primes_between', wraps=table.primes_between) as lookup:
+            # factors above the small primes, found by trial division with the table
+            self.assertEqual(functions.factorize(2 * 1009**2 * 4999), {2: 1, 1009: 2, 4999: 1})
+            lookup.assert_called_once_with(2, 5000)
+            lookup.reset_mock()
+            self.assertEqual(list(functions.prime_decomposition(1013 * 1019)), [1013, 1019])
+            lookup.assert_called_once_with(2, 1015)
+        functions.use_prime_table(None)
+        table.close()
+
+if __name__ == '__main__':
+    unittest.main()
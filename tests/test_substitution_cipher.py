@@ -0,0 +1,26 @@
+import unittest
+import string
+
+from src.SubstitutionCipher import SubstitutionCipher
+
+class TestSubstitutionCipher(unittest.TestCase):
+
+    def test_cipher(self):
+        cipher = SubstitutionCipher(string.ascii_uppercase, "OBLVUCGJRPTZKYIWXSHNADFEMQ")
+        self.assertEqual(cipher.cipher("troyes"), "NSIMUH")
+
+    def test_decipher(self):
+        cipher = SubstitutionCipher(string.ascii_uppercase, "OBLVUCGJRPTZKYIWXSHNADFEMQ")
+        self.assertEqual(cipher.decipher("NSIMUH"), "TROYES")
+
+    def test_unknown_letter(self):
+        cipher = SubstitutionCipher(string.ascii_uppercase, "OBLVUCGJRPTZKYIWXSHNADFEMQ")
+        with self.assertRaises(ValueError):
+            cipher.cipher("TROYES 10")
+
+    def test_invalid_alphabet(self):
+        with self.assertRaises(ValueError):
+            SubstitutionCipher(string.ascii_uppercase, "AABCDEFGHIJKLMNOPQRSTUVWXY")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,5 +14,12 @@ class TestTextToBinary(unittest.TestCase):
         text = "J'ai été à la pèche."
         self.assertEqual(binary_to_utf8(utf8_to_binary(text)), text)
 
+    def test_to_binary_above_255(self):
+        with self.assertRaises(ValueError):
+            utf8_to_binary('\u0100')
+
+    def test_incomplete_byte(self):
+        self.assertEqual(binary_to_utf8('0110100001'), 'h\x01')
+
 if __name__ == '__main__':
     unittest.main()
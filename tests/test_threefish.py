@@ -0,0 +1,25 @@
+import unittest
+from src.Threefish import Threefish
+
+class TestThreefish(unittest.TestCase):
+
+    def test_cipher_decipher(self):
+        for block_size in (32, 64, 128):
+            threefish = Threefish(block_size, bytes(range(block_size + 16))[::-1])
+            threefish.key_schedule()
+            iv = bytes(range(block_size))
+            for length in (0, 1, block_size - 1, block_size, 3 * block_size + 5):
+                plaintext = (bytes(range(256)) * 2)[:length]
+                ciphertext = threefish.cipher(plaintext)
+                self.assertEqual(len(ciphertext) % block_size, 0)
+                self.assertEqual(threefish.decipher(ciphertext), plaintext)
+                self.assertEqual(threefish.decipher(threefish.cipher(plaintext, iv), iv), plaintext)
+
+    def test_wrong_padding(self):
+        threefish = Threefish(32, bytes(48))
+        threefish.key_schedule()
+        with self.assertRaises(ValueError):
+            threefish.decipher(bytes(31))
+
+if __name__ == '__main__':
+    unittest.main()
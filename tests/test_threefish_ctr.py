@@ -0,0 +1,56 @@
+import unittest
+from src.Threefish import Threefish
+
+class TestThreefishCTR(unittest.TestCase):
+
+    def _threefish(self, block_size=64):
+        threefish = Threefish(block_size, bytes(range(block_size + 16)))
+        threefish.key_schedule()
+        return threefish
+
+    def test_encrypt_block(self):
+        for block_size in (32, 64, 128):
+            threefish = self._threefish(block_size)
+            # 2 bytes of padding: only the padding size, the block is the same
+            plaintext = bytes(range(1, block_size - 1))
+            block = threefish.encrypt_block(plaintext + b'\x00\x02')
+            self.assertEqual(len(block), block_size)
+            self.assertEqual(threefish.decipher(block), plaintext)
+
+    def test_key_schedule(self):
+        # the key schedule doesn't depend on the previous instances
+        self.assertEqual(self._threefish().rounds_keys_words,
+                         self._threefish().rounds_keys_words)
+        self.assertEqual(Threefish.C, bytearray.fromhex("1bd11bdaa9fc1a22"))
+
+    def test_ctr(self):
+        threefish = self._threefish()
+        data = bytes(range(256)) * 5 + b'end'
+        ciphertext = threefish.ctr(data)
+        self.assertEqual(len(ciphertext), len(data))
+        self.assertNotEqual(ciphertext, data)
+        self.assertEqual(threefish.ctr(ciphertext), data)
+        self.assertEqual(threefish.ctr(b''), b'')
+
+    def test_ctr_stream(self):
+        threefish = self._threefish()
+        data = bytes(1000)
+        nonce = bytes(range(64))
+        chunks = threefish.ctr(data[:128], nonce) + threefish.ctr(data[128:], nonce, counter=2)
+        self.assertEqual(chunks, threefish.ctr(data, nonce))
+        self.assertNotEqual(threefish.ctr(data, nonce), threefish.ctr(data))
+
+    def test_ctr_chunks(self):
+        # more blocks than a chunk of keystream
+        threefish = self._threefish(32)
+        data = bytes(range(256)) * 160
+        chunks = list(threefish.ctr_chunks(data, counter=7))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(len(chunks[0]), Threefish.CTR_CHUNK_BLOCKS * 32)
+        self.assertEqual(chunks[1], threefish.ctr(data[len(chunks[0]):],
+                                                  counter=7 + Threefish.CTR_CHUNK_BLOCKS))
+        self.assertEqual(threefish.ctr(b''.join(chunks), counter=7), data)
+        self.assertEqual(list(threefish.ctr_chunks(b'')), [])
+
+if __name__ == '__main__':
+    unittest.main()
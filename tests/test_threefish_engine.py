@@ -0,0 +1,105 @@
+import unittest
+from src.Threefish import Threefish
+from src.ThreefishEngine import ThreefishEngine
+from src._words import numpy
+
+BLOCK_SIZES = (32, 64, 128)
+
+class TestThreefishEngine(unittest.TestCase):
+
+    def _threefish(self, block_size=64):
+        threefish = Threefish(block_size, bytes(range(block_size + 16))[::-1])
+        threefish.key_schedule()
+        return threefish
+
+    def _engines(self, threefish):
+        engines = [ThreefishEngine(threefish, vector=False)]
+        if numpy is not None:
+            engines.append(ThreefishEngine(threefish, vector=True))
+        return engines
+
+    def test_decrypt_words(self):
+        for block_size in BLOCK_SIZES:
+            threefish = self._threefish(block_size)
+            words = list(range(1, block_size // 8 + 1))
+            self.assertEqual(threefish.decrypt_words(threefish.encrypt_words(words)), words)
+
+    def test_blocks(self):
+        for block_size in BLOCK_SIZES:
+            threefish = self._threefish(block_size)
+            data = (bytes(range(256)) * 4)[:block_size * 7]
+            expected = b''.join(threefish.encrypt_block(data[i:i + block_size])
+                                for i in range(0, len(data), block_size))
+            for engine in self._engines(threefish):
+                self.assertEqual(engine.encrypt_blocks(data), expected)
+                self.assertEqual(engine.decrypt_blocks(expected), data)
+                self.assertEqual(engine.encrypt_blocks(b''), b'')
+                self.assertRaises(ValueError, engine.encrypt_blocks, data[1:])
+
+    def test_ctr(self):
+        for block_size in BLOCK_SIZES:
+            threefish = self._threefish(block_size)
+            data = bytes(range(256)) * 3 + b'end'
+            nonce = bytes(range(block_size))
+            for engine in self._engines(threefish):
+                self.assertEqual(engine.ctr(data), threefish.ctr(data))
+                self.assertEqual(engine.ctr(data, nonce, 3), threefish.ctr(data, nonce, 3))
+                self.assertEqual(engine.ctr(memoryview(data)), threefish.ctr(data))
+                self.assertEqual(engine.ctr(b''), b'')
+
+    def test_counter_overflow(self):
+        threefish = self._threefish()
+        nonce = b'\xff' * 64
+        for engine in self._engines(threefish):
+            self.assertEqual(engine.ctr(bytes(300), nonce, 2), threefish.ctr(bytes(300), nonce, 2))
+            # counters out of [0, 2^64) are reduced modulo 2^64
+            for counter in (-1, 2**64 - 2, 2**64 + 1, 2**70):
+                self.assertEqual(engine.ctr(bytes(300), counter=counter),
+                                 threefish.ctr(bytes(300), counter=counter))
+
+    def test_cipher(self):
+        for block_size in BLOCK_SIZES:
+            threefish = self._threefish(block_size)
+            IV = bytes(range(block_size, 2 * block_size))
+            for plaintext in (b'', b'text', bytes(range(200))):
+                for engine in self._engines(threefish):
+                    for iv in (None, IV):
+                        ciphertext = engine.cipher(plaintext, iv)
+                        self.assertEqual(threefish.decipher(ciphertext, iv), plaintext)
+                        self.assertEqual(engine.decipher(ciphertext, iv), plaintext)
+                        self.assertIsInstance(engine.decipher(ciphertext, iv), bytes)
+                        self.assertEqual(engine.decipher(threefish.cipher(plaintext, iv), iv),
+                                         plaintext)
+
+    def test_cipher_copy(self):
+        # the plaintext isn't padded in place
+        plaintext = bytearray(b'text')
+        for engine in self._engines(self._threefish()):
+            engine.cipher(plaintext, bytes(64))
+            engine.cipher(plaintext)
+            self.assertEqual(plaintext, b'text')
+
+    def test_key_schedule(self):
+        threefish = Threefish(64, bytes(80))
+        engine = ThreefishEngine(threefish, vector=False)
+        self.assertIsNotNone(threefish.rounds_keys_words)
+        self.assertEqual(engine.ctr(bytes(10)), self._threefish_ctr(bytes(80), bytes(10)))
+
+    def _threefish_ctr(self, key, data):
+        threefish = Threefish(64, key)
+        threefish.key_schedule()
+        return threefish.ctr(data)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_large(self):
+        # more blocks than a chunk of the engine
+        threefish = self._threefish(32)
+        engine = ThreefishEngine(threefish)
+        data = bytes(range(256)) * 2100
+        ciphertext = engine.ctr(data, counter=5)
+        self.assertEqual(ciphertext[-1024:],
+                         threefish.ctr(data[-1024:], counter=5 + (len(data) - 1024) // 32))
+        self.assertEqual(engine.ctr(ciphertext, counter=5), data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from array import array
+from src._functions import rotl, rotr
+from src._words import (rotl32, rotr32, rotl64, rotr64, make_rotl, make_rotr, word_array,
+                        words_from_bytes, words_to_bytes, add_words, sub_words, xor_words,
+                        rotl_words, rotr_words, numpy)
+
+VALUES = [0, 1, 0x80000000, 0xdeadbeef, 0xffffffff, 0x12345678]
+
+class TestWords(unittest.TestCase):
+
+    def test_rotations(self):
+        for n in VALUES:
+            for r in (0, 1, 5, 30, 31):
+                self.assertEqual(rotl32(n, r), rotl(n, r, 32))
+                self.assertEqual(rotr32(n, r), rotr(n, r, 32))
+                self.assertEqual(make_rotl(r)(n), rotl(n, r, 32))
+                self.assertEqual(make_rotr(r)(n), rotr(n, r, 32))
+            n = n << 32 | n ^ 0x5555
+            for r in (1, 49, 63):
+                self.assertEqual(rotl64(n, r), rotl(n, r, 64))
+                self.assertEqual(rotr64(n, r), rotr(n, r, 64))
+                self.assertEqual(make_rotl(r, 64)(n), rotl(n, r, 64))
+
+    def test_bytes(self):
+        data = bytes(range(32))
+        self.assertEqual(list(words_from_bytes(data[:8])), [0x00010203, 0x04050607])
+        self.assertEqual(words_from_bytes(data, 64)[0], 0x0001020304050607)
+        self.assertEqual(words_to_bytes(words_from_bytes(data)), data)
+        self.assertEqual(words_to_bytes(words_from_bytes(data, 64), 64), data)
+
+    def _check_operations(self, vector):
+        a = word_array(VALUES, vector=vector)
+        b = word_array(reversed(VALUES), vector=vector)
+        self.assertEqual(list(add_words(a, b)), [(x + y) & 0xffffffff
+                                                 for x, y in zip(VALUES, reversed(VALUES))])
+        self.assertEqual(list(sub_words(a, b)), [(x - y) & 0xffffffff
+                                                 for x, y in zip(VALUES, reversed(VALUES))])
+        self.assertEqual(list(xor_words(a, b)), [x ^ y for x, y in zip(VALUES, reversed(VALUES))])
+        self.assertEqual(list(rotl_words(a, 7)), [rotl(x, 7, 32) for x in VALUES])
+        self.assertEqual(list(rotr_words(a, 7)), [rotr(x, 7, 32) for x in VALUES])
+        a64 = word_array([x << 32 | x for x in VALUES], 64, vector)
+        self.assertEqual(list(rotl_words(a64, 49, 64)), [rotl(x << 32 | x, 49, 64) for x in VALUES])
+        self.assertEqual(list(add_words(a64, a64, 64)),
+                         [((x << 32 | x) * 2) & 0xffffffffffffffff for x in VALUES])
+
+    def test_arrays(self):
+        self.assertIsInstance(word_array(VALUES, vector=False), array)
+        self._check_operations(False)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_vectors(self):
+        self._check_operations(True)
+        self.assertEqual(words_to_bytes(word_array([1, 2], 64, True), 64),
+                         bytes(7) + b'\x01' + bytes(7) + b'\x02')
+
+if __name__ == '__main__':
+    unittest.main()